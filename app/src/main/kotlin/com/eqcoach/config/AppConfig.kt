@@ -4,6 +4,8 @@ object AppConfig {
     // Server
     const val SERVER_URL = "http://192.168.1.195:8000"
     const val ANALYZE_ENDPOINT = "/analyze"
+    const val ANALYZE_BINARY_ENDPOINT = "/analyze/binary"
+    const val USE_BINARY_PROTOCOL = true
     const val TIMEOUT_SECONDS = 8L
 
     // Capture (used by EPIC-2)
@@ -23,6 +23,7 @@ class AnalyzeClient(
     timeoutSeconds: Long = AppConfig.TIMEOUT_SECONDS,
 ) {
     private val analyzeUrl = "${baseUrl.trimEnd('/')}${AppConfig.ANALYZE_ENDPOINT}"
+    private val analyzeBinaryUrl = "${baseUrl.trimEnd('/')}${AppConfig.ANALYZE_BINARY_ENDPOINT}"
 
     private val client = OkHttpClient.Builder()
         .connectTimeout(timeoutSeconds, TimeUnit.SECONDS)
@@ -53,6 +54,32 @@ class AnalyzeClient(
             .post(body)
             .build()
 
+        return execute(request)
+    }
+
+    /**
+     * Same as [analyze], but sends the frame and raw PCM16 samples as one
+     * binary body to /analyze/binary instead of multipart with a WAV file.
+     */
+    suspend fun analyzeBinary(
+        frame: ByteArray,
+        pcm: ByteArray,
+        sampleRate: Int,
+        channels: Int,
+        pcmOffset: Int = 0,
+    ): AnalyzeResponse {
+        val body = BinaryRequestEncoder.encode(frame, pcm, sampleRate, channels, pcmOffset)
+            .toRequestBody(BinaryRequestEncoder.CONTENT_TYPE.toMediaType())
+
+        val request = Request.Builder()
+            .url(analyzeBinaryUrl)
+            .post(body)
+            .build()
+
+        return execute(request)
+    }
+
+    private suspend fun execute(request: Request): AnalyzeResponse {
         val call = client.newCall(request)
         inflightCall = call
 
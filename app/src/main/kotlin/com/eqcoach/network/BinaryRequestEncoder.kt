@@ -0,0 +1,62 @@
+package com.eqcoach.network
+
+import java.nio.ByteBuffer
+import java.nio.ByteOrder
+
+/**
+ * Encodes a frame and raw PCM16 audio into the body of POST /analyze/binary.
+ *
+ * Layout (all integers little-endian, 20-byte header):
+ *   Bytes 0-3   : "EQA1"
+ *   Byte  4     : version (1)
+ *   Byte  5     : channels
+ *   Bytes 6-7   : reserved (0)
+ *   Bytes 8-11  : sample rate
+ *   Bytes 12-15 : frame length
+ *   Bytes 16-19 : audio length
+ *   Bytes 20+   : JPEG bytes, then interleaved PCM16 samples
+ */
+object BinaryRequestEncoder {
+
+    const val CONTENT_TYPE = "application/x-eq-analyze"
+    const val HEADER_SIZE = 20
+    private const val VERSION: Byte = 1
+
+    /**
+     * Builds the request body.
+     *
+     * @param frame      JPEG bytes.
+     * @param pcm        Buffer holding little-endian PCM16 samples.
+     * @param sampleRate Sample rate in Hz.
+     * @param channels   Number of interleaved channels.
+     * @param pcmOffset  Where the samples start in [pcm] (e.g. 44 to skip a WAV header).
+     */
+    fun encode(
+        frame: ByteArray,
+        pcm: ByteArray,
+        sampleRate: Int,
+        channels: Int,
+        pcmOffset: Int = 0,
+    ): ByteArray {
+        require(pcmOffset in 0..pcm.size) { "pcmOffset out of range" }
+        val audioSize = pcm.size - pcmOffset
+
+        val buffer = ByteBuffer.allocate(HEADER_SIZE + frame.size + audioSize).apply {
+            order(ByteOrder.LITTLE_ENDIAN)
+            put('E'.code.toByte())
+            put('Q'.code.toByte())
+            put('A'.code.toByte())
+            put('1'.code.toByte())
+            put(VERSION)
+            put(channels.toByte())
+            putShort(0)
+            putInt(sampleRate)
+            putInt(frame.size)
+            putInt(audioSize)
+            put(frame)
+            put(pcm, pcmOffset, audioSize)
+        }
+
+        return buffer.array()
+    }
+}
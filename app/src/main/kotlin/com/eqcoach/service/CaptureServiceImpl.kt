@@ -4,6 +4,7 @@ import android.content.Context
 import android.util.Log
 import com.eqcoach.capture.AudioCapture
 import com.eqcoach.capture.CameraCapture
+import com.eqcoach.config.AppConfig
 import com.eqcoach.model.Verdict
 import com.eqcoach.network.AnalyzeClient
 import com.eqcoach.network.AnalyzeResponse
@@ -102,7 +103,16 @@ class CaptureServiceImpl(private val context: Context) : CaptureService {
 
         if (frame == null || audio == null) return null
 
-        val result = analyzeClient.analyze(frame, audio)
+        val result = if (AppConfig.USE_BINARY_PROTOCOL && audio.size >= WAV_HEADER_SIZE) {
+            analyzeClient.analyzeBinary(
+                frame, audio,
+                sampleRate = AppConfig.AUDIO_SAMPLE_RATE,
+                channels = AppConfig.AUDIO_CHANNELS,
+                pcmOffset = WAV_HEADER_SIZE,
+            )
+        } else {
+            analyzeClient.analyze(frame, audio)
+        }
         currentVerdict = result.verdict
         return result
     }
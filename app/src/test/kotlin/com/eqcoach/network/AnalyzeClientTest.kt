@@ -86,6 +86,21 @@ class AnalyzeClientTest {
         assertEquals("/analyze", request.path)
     }
 
+    @Test
+    fun `analyzeBinary posts one binary body to analyze binary endpoint`() = runTest {
+        server.enqueue(MockResponse().setBody("""{"verdict":"GREEN"}"""))
+        val pcm = ByteArray(44 + 8) { it.toByte() }
+        client.analyzeBinary(fakeJpeg, pcm, sampleRate = 16000, channels = 1, pcmOffset = 44)
+
+        val request = server.takeRequest()
+        assertEquals("/analyze/binary", request.path)
+        assertEquals(BinaryRequestEncoder.CONTENT_TYPE, request.getHeader("Content-Type"))
+        assertEquals(
+            BinaryRequestEncoder.HEADER_SIZE + fakeJpeg.size + 8,
+            request.body.size.toInt(),
+        )
+    }
+
     @Test
     fun `server 500 throws ServerException`() = runTest {
         server.enqueue(MockResponse().setResponseCode(500))
@@ -0,0 +1,47 @@
+package com.eqcoach.network
+
+import org.junit.Assert.assertArrayEquals
+import org.junit.Assert.assertEquals
+import org.junit.Test
+import java.nio.ByteBuffer
+import java.nio.ByteOrder
+
+class BinaryRequestEncoderTest {
+
+    private val frame = byteArrayOf(0xFF.toByte(), 0xD8.toByte(), 0x01, 0x02)
+
+    @Test
+    fun `header carries magic, version, channels and lengths`() {
+        val pcm = ByteArray(8)
+        val body = BinaryRequestEncoder.encode(frame, pcm, sampleRate = 48000, channels = 2)
+        val buf = ByteBuffer.wrap(body).order(ByteOrder.LITTLE_ENDIAN)
+
+        assertEquals(20 + frame.size + pcm.size, body.size)
+        assertArrayEquals("EQA1".toByteArray(), body.copyOfRange(0, 4))
+        assertEquals(1.toByte(), body[4])
+        assertEquals(2.toByte(), body[5])
+        buf.position(6)
+        assertEquals(0.toShort(), buf.short)  // reserved
+        assertEquals(48000, buf.int)          // sample rate
+        assertEquals(frame.size, buf.int)     // frame length
+        assertEquals(pcm.size, buf.int)       // audio length
+    }
+
+    @Test
+    fun `frame then pcm follow the header`() {
+        val pcm = byteArrayOf(1, 2, 3, 4)
+        val body = BinaryRequestEncoder.encode(frame, pcm, 16000, 1)
+
+        assertArrayEquals(frame, body.copyOfRange(20, 20 + frame.size))
+        assertArrayEquals(pcm, body.copyOfRange(20 + frame.size, body.size))
+    }
+
+    @Test
+    fun `pcmOffset skips a WAV header`() {
+        val wav = ByteArray(44) + byteArrayOf(9, 8, 7, 6)
+        val body = BinaryRequestEncoder.encode(frame, wav, 16000, 1, pcmOffset = 44)
+
+        assertEquals(4, ByteBuffer.wrap(body, 16, 4).order(ByteOrder.LITTLE_ENDIAN).int)
+        assertArrayEquals(byteArrayOf(9, 8, 7, 6), body.copyOfRange(20 + frame.size, body.size))
+    }
+}
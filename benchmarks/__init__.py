@@ -0,0 +1,6 @@
+"""Micro-benchmarks for the EQ ML pipeline.
+
+Run from the repository root, e.g.::
+
+    PYTHONPATH=src python -m benchmarks.audio_decode
+"""
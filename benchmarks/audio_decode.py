@@ -0,0 +1,108 @@
+"""Per-clip audio preprocessing cost: soundfile + librosa vs eq_models.audio.
+
+Uses the fixtures from ``tests/generate_fixtures.py`` (generated on demand)
+as-is at 16 kHz mono, re-encoded as 48 kHz stereo and 44.1 kHz mono to
+exercise downmixing and resampling, and compressed as 16 kHz FLAC and Ogg
+Opus for the smaller uploads (when libsndfile supports them).
+
+    PYTHONPATH=src python -m benchmarks.audio_decode [--repeat N]
+
+Exits non-zero when the fast path is slower than the baseline on any WAV
+clip — 16 kHz, 48 kHz stereo or 44.1 kHz.  Compressed clips are reported
+only: both paths spend their time in the same libsndfile decoder.
+"""
+
+import argparse
+import io
+import statistics
+import sys
+import time
+
+import numpy as np
+import soundfile as sf
+
+from eq_models.audio import compressed_formats, decode_audio, resample
+from tests.generate_fixtures import TEST_AUDIO_DIR, generate_audio
+
+_TARGET_SR = 16000
+_MIN_SPEEDUP = 1.0
+_GATED_CLIPS = ("16k mono", "48k stereo", "44.1k mono")
+
+
+def _baseline_decode(audio_bytes: bytes) -> np.ndarray:
+    """The pre-eq_models.audio path: soundfile read, mean downmix, librosa resample."""
+    import librosa
+
+    audio_data, sample_rate = sf.read(io.BytesIO(audio_bytes), dtype="float32")
+    if audio_data.ndim > 1:
+        audio_data = np.mean(audio_data, axis=1)
+    if sample_rate != _TARGET_SR:
+        audio_data = librosa.resample(audio_data, orig_sr=sample_rate, target_sr=_TARGET_SR)
+    return np.ascontiguousarray(audio_data, dtype=np.float32)
+
+
+def _fast_decode(audio_bytes: bytes) -> np.ndarray:
+    return decode_audio(audio_bytes, _TARGET_SR)
+
+
+def _encode(
+    audio: np.ndarray, sample_rate: int, channels: int, fmt: str = "WAV", subtype: str = "PCM_16"
+) -> bytes:
+    audio = resample(audio, _TARGET_SR, sample_rate)
+    if channels > 1:
+        audio = np.repeat(audio[:, None], channels, axis=1)
+    buf = io.BytesIO()
+    sf.write(buf, audio, sample_rate, format=fmt, subtype=subtype)
+    return buf.getvalue()
+
+
+def _clips() -> list[tuple[str, bytes]]:
+    if not TEST_AUDIO_DIR.exists():
+        generate_audio()
+    clips = []
+    for path in sorted(TEST_AUDIO_DIR.glob("*.wav")):
+        raw = path.read_bytes()
+        audio, _ = sf.read(io.BytesIO(raw), dtype="float32")
+        clips.append((f"{path.stem} 16k mono", raw))
+        clips.append((f"{path.stem} 48k stereo", _encode(audio, 48000, 2)))
+        clips.append((f"{path.stem} 44.1k mono", _encode(audio, 44100, 1)))
+        if "flac" in compressed_formats():
+            clips.append((f"{path.stem} 16k flac", _encode(audio, _TARGET_SR, 1, "FLAC")))
+        if "opus" in compressed_formats():
+            clips.append((f"{path.stem} 16k opus", _encode(audio, _TARGET_SR, 1, "OGG", "OPUS")))
+    return clips
+
+
+def _median_ms(fn, audio_bytes: bytes, repeat: int) -> float:
+    fn(audio_bytes)  # warm caches and lazy imports
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(audio_bytes)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per clip")
+    args = parser.parse_args()
+
+    print(f"{'clip':<28}{'KB':>8}{'baseline ms':>13}{'fast ms':>10}{'speedup':>9}")
+    failed = []
+    for name, audio_bytes in _clips():
+        before = _median_ms(_baseline_decode, audio_bytes, args.repeat)
+        after = _median_ms(_fast_decode, audio_bytes, args.repeat)
+        print(f"{name:<28}{len(audio_bytes) / 1024:>8.1f}{before:>13.3f}{after:>10.3f}"
+              f"{before / after:>8.1f}x")
+        if name.endswith(_GATED_CLIPS) and before / after < _MIN_SPEEDUP:
+            failed.append(name)
+
+    if failed:
+        print(f"FAIL: fast path slower than baseline on {', '.join(failed)}")
+        sys.exit(1)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
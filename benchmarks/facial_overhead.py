@@ -0,0 +1,70 @@
+"""Per-frame facial cost outside the emotion CNN: DeepFace.analyze vs lean path.
+
+Times the full ``DeepFace.analyze`` call and the lean ``analyze_face`` path
+on the image fixtures from ``tests/generate_fixtures.py``, then subtracts
+the CNN's own forward pass (timed separately on a 48x48 input) to report
+the overhead each path adds around it.  Needs DeepFace and its weights.
+
+    PYTHONPATH=src python -m benchmarks.facial_overhead [--repeat N]
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from eq_models.facial import (
+    _classify_faces,
+    _decode_frame,
+    _get_deepface,
+    analyze_face,
+    warmup_face,
+)
+from tests.generate_fixtures import TEST_IMAGES_DIR, generate_images
+
+
+def _median_ms(fn, repeat: int) -> float:
+    fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per image")
+    args = parser.parse_args()
+
+    if not TEST_IMAGES_DIR.exists():
+        generate_images()
+    warmup_face()
+    DeepFace = _get_deepface()
+
+    cnn = _median_ms(lambda: _classify_faces(np.zeros((1, 48, 48), dtype=np.float32)), args.repeat)
+    print(f"emotion CNN forward pass: {cnn:.2f} ms\n")
+    print(f"{'image':<20}{'analyze ms':>12}{'lean ms':>10}{'overhead before':>17}{'after':>8}")
+    for path in sorted(TEST_IMAGES_DIR.glob("*.jpg")):
+        image_bytes = path.read_bytes()
+
+        def deepface_analyze():
+            DeepFace.analyze(
+                img_path=_decode_frame(image_bytes),
+                actions=["emotion"],
+                enforce_detection=False,
+                detector_backend="opencv",
+            )
+
+        before = _median_ms(deepface_analyze, args.repeat)
+        after = _median_ms(lambda: analyze_face(image_bytes), args.repeat)
+        print(
+            f"{path.stem:<20}{before:>12.2f}{after:>10.2f}"
+            f"{max(0.0, before - cnn):>17.2f}{max(0.0, after - cnn):>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
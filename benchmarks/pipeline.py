@@ -0,0 +1,206 @@
+"""End-to-end /analyze benchmark: per-stage timings plus an open-loop load test.
+
+Micro-benchmarks ``analyze_face``, ``analyze_speech`` and
+``compute_verdict`` on the fixtures from ``tests/generate_fixtures.py``,
+then drives the in-process FastAPI app (startup warm-up included) with
+frame + audio POSTs at a fixed arrival rate — requests are sent on
+schedule whether or not earlier ones have finished, so queueing shows up
+in the tail.  Reports p50 / p95 / p99 latency, achieved requests/sec,
+errors and peak RSS.
+
+``--mode stub`` swaps the models for ``models.stubs`` and measures server
+overhead alone; ``--mode real`` runs the configured models (weights
+needed).  ``--json`` saves the report and ``--baseline`` prints the change
+against a saved one, so performance work can be checked against a fixed
+baseline.
+
+    PYTHONPATH=src:inference-server python -m benchmarks.pipeline \\
+        [--mode stub|real] [--rate RPS] [--duration S] [--repeat N] \\
+        [--json PATH] [--baseline PATH]
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import statistics
+import time
+from contextlib import ExitStack
+from itertools import cycle
+from unittest.mock import patch
+
+from tests.generate_fixtures import TEST_AUDIO_DIR, TEST_IMAGES_DIR, generate_audio, generate_images
+
+
+def _no_warmup() -> None:
+    """Stand-in warm-up for stub mode (module level so worker processes can import it)."""
+
+
+def _stub_patches() -> list:
+    """Replace every model entry point the server uses with ``models.stubs``."""
+    import models.stubs as stubs
+
+    return [
+        patch("routes.analyze.analyze_face", stubs.analyze_face),
+        patch("routes.analyze.analyze_speech", stubs.analyze_speech),
+        patch("routes.analyze.compute_verdict", stubs.compute_verdict),
+        patch("routes.analyze.settled_verdict", stubs.settled_verdict),
+        patch("inference.batching.analyze_faces", stubs.analyze_faces),
+        patch("inference.batching.analyze_speech_batch", stubs.analyze_speech_batch),
+        patch("inference.workers.warmup_face", _no_warmup),
+        patch("inference.workers.warmup_speech", _no_warmup),
+    ]
+
+
+def _fixtures() -> tuple[list[bytes], list[bytes]]:
+    if not TEST_IMAGES_DIR.exists():
+        generate_images()
+    if not TEST_AUDIO_DIR.exists():
+        generate_audio()
+    frames = [p.read_bytes() for p in sorted(TEST_IMAGES_DIR.glob("*.jpg"))]
+    clips = [p.read_bytes() for p in sorted(TEST_AUDIO_DIR.glob("*.wav"))]
+    return frames, clips
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    """p50 / p95 / p99 of ``samples`` (seconds) in milliseconds."""
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return {"p50_ms": value, "p95_ms": value, "p99_ms": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50_ms": cuts[49] * 1000, "p95_ms": cuts[94] * 1000, "p99_ms": cuts[98] * 1000}
+
+
+def _time_stage(fn, inputs: list[tuple], repeat: int) -> dict[str, float]:
+    for args in inputs:
+        fn(*args)  # warm caches and lazy imports
+    times = []
+    for _ in range(repeat):
+        for args in inputs:
+            start = time.perf_counter()
+            fn(*args)
+            times.append(time.perf_counter() - start)
+    return _percentiles(times)
+
+
+def run_stages(frames: list[bytes], clips: list[bytes], repeat: int) -> dict[str, dict]:
+    """Per-stage latency of the three model entry points as the route sees them."""
+    import routes.analyze as route
+
+    facial = [route.analyze_face(frame) for frame in frames]
+    speech = [route.analyze_speech(clip) for clip in clips]
+    return {
+        "analyze_face": _time_stage(route.analyze_face, [(f,) for f in frames], repeat),
+        "analyze_speech": _time_stage(route.analyze_speech, [(c,) for c in clips], repeat),
+        "compute_verdict": _time_stage(
+            route.compute_verdict, [(f, s) for f in facial for s in speech], repeat
+        ),
+    }
+
+
+async def run_load(frames: list[bytes], clips: list[bytes], rate: float, duration: float) -> dict:
+    """POST frame + audio pairs to the in-process app at ``rate`` requests/sec."""
+    import httpx
+
+    from main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            latencies: list[float] = []
+            errors = 0
+
+            async def one(frame: bytes, clip: bytes) -> None:
+                nonlocal errors
+                start = time.perf_counter()
+                resp = await client.post(
+                    "/analyze",
+                    files={
+                        "frame": ("frame.jpg", frame, "image/jpeg"),
+                        "audio": ("audio.wav", clip, "audio/wav"),
+                    },
+                )
+                latencies.append(time.perf_counter() - start)
+                if resp.status_code != 200:
+                    errors += 1
+
+            pairs = cycle([(f, c) for f in frames for c in clips])
+            total = max(1, int(rate * duration))
+            tasks = []
+            began = time.perf_counter()
+            for i in range(total):
+                delay = began + i / rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(one(*next(pairs))))
+            await asyncio.gather(*tasks)
+            elapsed = time.perf_counter() - began
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "offered_rps": rate,
+        "achieved_rps": total / elapsed,
+        **_percentiles(latencies),
+    }
+
+
+def _print_report(report: dict, baseline: dict | None) -> None:
+    width = 17 if baseline else 10
+
+    def fmt(value: float, old: float | None) -> str:
+        if baseline is None:
+            return f"{value:>10.3f}"
+        change = f"({(value - old) / old:+.0%})" if old else ""
+        return f"{value:>10.3f}{change:>7}"
+
+    print(f"mode: {report['mode']}")
+    print(f"\n{'stage':<18}" + "".join(f"{h:>{width}}" for h in ("p50 ms", "p95 ms", "p99 ms")))
+    for stage, stats in report["stages"].items():
+        old = (baseline or {}).get("stages", {}).get(stage, {})
+        print(f"{stage:<18}" + "".join(fmt(stats[k], old.get(k)) for k in ("p50_ms", "p95_ms", "p99_ms")))
+
+    load = report["load"]
+    old = (baseline or {}).get("load", {})
+    print(f"\n/analyze at {load['offered_rps']:g} req/s offered — {load['requests']} requests, {load['errors']} errors")
+    for key in ("achieved_rps", "p50_ms", "p95_ms", "p99_ms"):
+        print(f"  {key:<14}{fmt(load[key], old.get(key))}")
+    print(f"  {'peak_rss_mb':<14}{fmt(report['peak_rss_mb'], (baseline or {}).get('peak_rss_mb'))}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("stub", "real"), default="stub")
+    parser.add_argument("--rate", type=float, default=20.0, help="offered /analyze requests per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--repeat", type=int, default=20, help="timed passes per stage")
+    parser.add_argument("--json", help="write the report here")
+    parser.add_argument("--baseline", help="earlier --json report to compare against")
+    args = parser.parse_args()
+
+    frames, clips = _fixtures()
+    with ExitStack() as stack:
+        if args.mode == "stub":
+            for p in _stub_patches():
+                stack.enter_context(p)
+        stages = run_stages(frames, clips, args.repeat)
+        load = asyncio.run(run_load(frames, clips, args.rate, args.duration))
+
+    report = {
+        "mode": args.mode,
+        "stages": stages,
+        "load": load,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    _print_report(report, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
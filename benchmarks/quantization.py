@@ -0,0 +1,171 @@
+"""INT8 vs FP32 ONNX models: latency, peak memory and verdict agreement.
+
+Quantizes the exported models (``python -m eq_models.export`` first) where
+the INT8 files are missing, then runs each variant of each model in a
+fresh process over a labelled fixture set — ``<label>_*.jpg`` frames and
+``<label>_*.wav`` clips, by default the ``tests/generate_fixtures.py`` set,
+where labels outside a model's emotion set (``calm``, ``no``, ``silence``)
+count as neutral.  Reports median / p95 latency, peak RSS, label accuracy,
+agreement with FP32 on the dominant emotion and the concerning flag, and
+agreement of the fused verdict over every frame x clip pair.
+
+    PYTHONPATH=src python -m benchmarks.quantization [--modes dynamic static]
+        [--models facial speech] [--images DIR] [--audio DIR] [--repeat N] [--requantize]
+"""
+
+import argparse
+import multiprocessing
+import resource
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from eq_models.backends import quantized_path
+from eq_models.config import config
+from eq_models.export import quantize_facial, quantize_speech
+from eq_models.fusion import compute_verdict
+from tests.generate_fixtures import TEST_AUDIO_DIR, TEST_IMAGES_DIR, generate_audio, generate_images
+
+_FP32 = "none"
+
+
+def _fp32_path(model: str) -> Path:
+    if model == "facial":
+        return Path(config["facial"]["onnx_model_path"])
+    return Path(config["speech"]["model_path"]) / "model.onnx"
+
+
+def _label(path: Path, labels: list[str]) -> str:
+    prefix = path.stem.split("_")[0]
+    return prefix if prefix in labels else "neutral"
+
+
+def _run_variant(model: str, quantization: str, paths: list[Path], repeat: int) -> dict:
+    """Load one model variant in this (fresh) process and run the fixtures through it."""
+    from eq_models import facial, speech
+    from eq_models.backends import OnnxEmotionModel, OnnxSenseVoice
+
+    if model == "facial":
+        facial._emotion_model = OnnxEmotionModel(
+            facial._ONNX_MODEL_PATH, facial._ONNX_THREADS, facial._ONNX_OPTIMIZATION, quantization
+        )
+        facial.warmup_face()
+        analyze = facial.analyze_face
+    else:
+        speech._model = OnnxSenseVoice(
+            speech._MODEL_PATH, speech._ONNX_THREADS, speech._ONNX_OPTIMIZATION,
+            quantization=quantization,
+        )
+        speech.warmup_speech()
+        analyze = speech.analyze_speech
+
+    payloads = [path.read_bytes() for path in paths]
+    results = [analyze(payload) for payload in payloads]
+    times = []
+    for _ in range(repeat):
+        for payload in payloads:
+            start = time.perf_counter()
+            analyze(payload)
+            times.append(time.perf_counter() - start)
+    p95 = statistics.quantiles(times, n=20)[-1] if len(times) > 1 else times[0]
+    return {
+        "results": results,
+        "median_ms": statistics.median(times) * 1000,
+        "p95_ms": p95 * 1000,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def _in_fresh_process(*args) -> dict:
+    """Run ``_run_variant`` in a spawned process so peak RSS covers one variant only."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(_run_variant, *args).result()
+
+
+def _agreement(a: list, b: list) -> float:
+    return sum(x == y for x, y in zip(a, b)) / len(a) if a else 1.0
+
+
+def _report(model: str, paths: list[Path], labels: list[str], runs: dict[str, dict]) -> None:
+    truth = [_label(path, labels) for path in paths]
+    base = runs[_FP32]["results"]
+    print(f"\n{model} ({len(paths)} fixtures)")
+    print(
+        f"{'variant':<14}{'size MB':>9}{'median ms':>11}{'p95 ms':>9}{'peak RSS MB':>13}"
+        f"{'accuracy':>10}{'dominant':>10}{'concerning':>12}"
+    )
+    for variant, run in runs.items():
+        results = run["results"]
+        size = quantized_path(_fp32_path(model), variant).stat().st_size / 2**20
+        accuracy = _agreement([r.dominant for r in results], truth)
+        dominant = _agreement([r.dominant for r in results], [r.dominant for r in base])
+        concerning = _agreement([r.is_concerning for r in results], [r.is_concerning for r in base])
+        name = "fp32" if variant == _FP32 else f"int8-{variant}"
+        print(
+            f"{name:<14}{size:>9.1f}{run['median_ms']:>11.2f}{run['p95_ms']:>9.2f}"
+            f"{run['peak_rss_mb']:>13.0f}{accuracy:>10.0%}{dominant:>10.0%}{concerning:>12.0%}"
+        )
+
+
+def _verdicts(facial_results: list, speech_results: list) -> list:
+    return [compute_verdict(f, s) for f in facial_results for s in speech_results]
+
+
+def main() -> None:
+    from eq_models.facial import _EMOTION_LABELS as FACIAL_LABELS, _neutral_result as neutral_face
+    from eq_models.speech import _EMOTION_LABELS as SPEECH_LABELS, _neutral_result as neutral_speech
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", nargs="+", choices=("dynamic", "static"), default=["dynamic", "static"])
+    parser.add_argument("--models", nargs="+", choices=("facial", "speech"), default=["facial", "speech"])
+    parser.add_argument("--images", type=Path, default=TEST_IMAGES_DIR, help="labelled .jpg frames")
+    parser.add_argument("--audio", type=Path, default=TEST_AUDIO_DIR, help="labelled .wav clips")
+    parser.add_argument("--repeat", type=int, default=10, help="timed passes over the fixtures")
+    parser.add_argument("--requantize", action="store_true", help="rebuild existing INT8 files")
+    args = parser.parse_args()
+
+    if not TEST_IMAGES_DIR.exists():
+        generate_images()
+    if not TEST_AUDIO_DIR.exists():
+        generate_audio()
+
+    setups = {
+        "facial": (sorted(args.images.glob("*.jpg")), FACIAL_LABELS, quantize_facial,
+                   config["facial"]["onnx_model_path"], args.images),
+        "speech": (sorted(args.audio.glob("*.wav")), SPEECH_LABELS, quantize_speech,
+                   config["speech"]["model_path"], args.audio),
+    }
+    results: dict[str, dict[str, list]] = {
+        "facial": {_FP32: [neutral_face()]},
+        "speech": {_FP32: [neutral_speech()]},
+    }
+    for model in args.models:
+        paths, labels, quantize, source, calibration = setups[model]
+        if not _fp32_path(model).exists():
+            print(f"\n{model}: no FP32 ONNX model at {_fp32_path(model)} — run python -m eq_models.export {model}")
+            continue
+        for mode in args.modes:
+            if args.requantize or not quantized_path(_fp32_path(model), mode).exists():
+                quantize(mode, source, calibration)
+        runs = {variant: _in_fresh_process(model, variant, paths, args.repeat)
+                for variant in [_FP32, *args.modes]}
+        _report(model, paths, labels, runs)
+        results[model] = {variant: run["results"] for variant, run in runs.items()}
+
+    base = _verdicts(results["facial"][_FP32], results["speech"][_FP32])
+    print(f"\nfused verdict agreement with fp32 ({len(base)} frame x clip pairs)")
+    for mode in args.modes:
+        facial_int8 = results["facial"].get(mode, results["facial"][_FP32])
+        speech_int8 = results["speech"].get(mode, results["speech"][_FP32])
+        rows = {
+            "facial int8": _verdicts(facial_int8, results["speech"][_FP32]),
+            "speech int8": _verdicts(results["facial"][_FP32], speech_int8),
+            "both int8": _verdicts(facial_int8, speech_int8),
+        }
+        for name, verdicts in rows.items():
+            print(f"  {mode:<9}{name:<14}{_agreement(verdicts, base):>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
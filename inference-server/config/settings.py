@@ -13,13 +13,42 @@ CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.yaml"
 class FacialConfig(BaseModel):
     concerning_threshold: float = 0.40
     backend: str = "tensorflow"
+    onnx_model_path: str = "./models/emotion-cnn.onnx"
+    onnx_threads: int = 0
+    onnx_optimization: str = "all"
+    onnx_quantization: str = "none"
+    decode_max_side: int = 640
+    timeout_seconds: float = 3.0
+    batch_max_size: int = 1
+    batch_max_wait_ms: float = 10.0
+    track_redetect_every: int = 10
+    track_min_score: float = 0.6
+    track_search_margin: float = 0.25
+    gate_threshold: float = 0.02
+    gate_thumbnail_size: int = 16
+    gate_max_reuse: int = 5
 
 
 class SpeechConfig(BaseModel):
     concerning_threshold: float = 0.45
     model_path: str = "./models/sensevoice-small"
+    backend: str = "funasr"
+    inference_mode: str = "transcribe"
+    onnx_threads: int = 0
+    onnx_optimization: str = "all"
+    onnx_quantization: str = "none"
     sample_rate: int = 16000
     channels: int = 1
+    timeout_seconds: float = 3.0
+    batch_max_size: int = 1
+    batch_max_wait_ms: float = 20.0
+    vad_enabled: bool = True
+    vad_frame_ms: float = 30.0
+    vad_energy_threshold: float = 0.01
+    vad_max_zcr: float = 0.4
+    vad_min_silence_ms: float = 300.0
+    vad_padding_ms: float = 100.0
+    vad_min_speech_seconds: float = 0.3
 
 
 class FusionConfig(BaseModel):
@@ -27,6 +56,42 @@ class FusionConfig(BaseModel):
     speech_weight: float = 0.40
     green_threshold: float = 0.25
     red_threshold: float = 0.50
+    early_exit: bool = True
+
+
+class StreamConfig(BaseModel):
+    sample_rate: int = 16000
+    window_seconds: float = 4.0
+    hop_seconds: float = 1.0
+
+
+class WorkersConfig(BaseModel):
+    num_workers: int = 4
+    warmup: bool = True
+    backend: str = "thread"
+    threads_per_process: int = 1
+
+
+class AdmissionConfig(BaseModel):
+    enabled: bool = True
+    max_concurrent: int = 0
+    max_queue: int = 8
+    max_queue_wait_ms: float = 500.0
+    retry_after_seconds: float = 1.0
+
+
+class SessionsConfig(BaseModel):
+    enabled: bool = True
+    max_sessions: int = 10000
+    idle_seconds: float = 300.0
+    ewma_alpha: float = 0.3
+
+
+class ProfilingConfig(BaseModel):
+    enabled: bool = False
+    output_dir: str = "./profiles"
+    sample_interval_ms: float = 10.0
+    request_fraction: float = 0.1
 
 
 class Settings(BaseModel):
@@ -35,6 +100,11 @@ class Settings(BaseModel):
     facial: FacialConfig = FacialConfig()
     speech: SpeechConfig = SpeechConfig()
     fusion: FusionConfig = FusionConfig()
+    workers: WorkersConfig = WorkersConfig()
+    admission: AdmissionConfig = AdmissionConfig()
+    sessions: SessionsConfig = SessionsConfig()
+    stream: StreamConfig = StreamConfig()
+    profiling: ProfilingConfig = ProfilingConfig()
 
 
 @lru_cache()
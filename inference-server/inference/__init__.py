@@ -0,0 +1,22 @@
+from inference.admission import AdmissionController, AdmissionRejected, get_admission_controller
+from inference.batching import MicroBatcher, get_facial_batcher, get_speech_batcher
+from inference.orchestrator import InferenceOutcome, InferenceStageError, run_inference
+from inference.sessions import SessionState, SessionStore, get_session_store
+from inference.workers import ModelWorkerPool, get_worker_pool
+
+__all__ = [
+    "AdmissionController",
+    "AdmissionRejected",
+    "InferenceOutcome",
+    "InferenceStageError",
+    "MicroBatcher",
+    "ModelWorkerPool",
+    "SessionState",
+    "SessionStore",
+    "get_admission_controller",
+    "get_facial_batcher",
+    "get_session_store",
+    "get_speech_batcher",
+    "get_worker_pool",
+    "run_inference",
+]
@@ -0,0 +1,155 @@
+"""Admission control for POST /analyze.
+
+At most ``max_concurrent`` requests run inference at once.  Up to
+``max_queue`` more wait for a slot, each for at most ``max_queue_wait_ms``;
+anything beyond that is shed immediately instead of piling onto the worker
+pool.  For a real-time indicator a late verdict is worth less than none, so
+a request that would wait too long is rejected with 503 and ``Retry-After``
+and the client simply sends its next frame.
+
+Requests may carry a session id.  When a session already has a request
+waiting and a newer one arrives, the older one is dropped (``superseded``)
+and the newer one takes its place in the queue, so one chatty client cannot
+fill the queue with frames that will be stale by the time they run.
+
+The controller lives on the event loop and needs no locks: every method
+runs on the loop thread.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from itertools import count
+from typing import AsyncIterator
+
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_REJECT_DETAILS = {
+    "queue_full": "Server is saturated; retry shortly",
+    "queue_timeout": "Timed out waiting for an inference slot; retry shortly",
+    "superseded": "Dropped in favour of a newer frame from the same session",
+}
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, reason: str, retry_after: float) -> None:
+        super().__init__(f"request rejected: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def detail(self) -> str:
+        """Client-facing error message for this rejection."""
+        return _REJECT_DETAILS.get(self.reason, "Server is saturated")
+
+
+class AdmissionController:
+    """Bounded concurrency plus a bounded, deadline-limited wait queue."""
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int,
+        max_queue_wait_ms: float,
+        retry_after_seconds: float = 1.0,
+    ) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.max_queue_wait = max(0.0, max_queue_wait_ms) / 1000.0
+        self.retry_after = retry_after_seconds
+        self.active = 0
+        self.rejected: dict[str, int] = {reason: 0 for reason in _REJECT_DETAILS}
+        # key -> (session_id, future); keys are unique per waiter, FIFO order.
+        self._waiters: OrderedDict[int, tuple[str | None, asyncio.Future]] = OrderedDict()
+        self._by_session: dict[str, int] = {}
+        self._keys = count()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def admit(self, session_id: str | None = None) -> AsyncIterator[None]:
+        """Hold an inference slot for the enclosed block, or raise AdmissionRejected."""
+        await self._acquire(session_id)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, session_id: str | None) -> None:
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            return
+
+        previous = self._by_session.get(session_id) if session_id is not None else None
+        if previous is not None:
+            self._reject_waiter(previous, "superseded")
+        elif len(self._waiters) >= self.max_queue:
+            self._reject("queue_full")
+
+        key = next(self._keys)
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[key] = (session_id, future)
+        if session_id is not None:
+            self._by_session[session_id] = key
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.max_queue_wait)
+        except asyncio.TimeoutError:
+            self._forget(key)
+            if not future.done():
+                self._reject("queue_timeout")
+            future.result()  # granted or superseded right at the deadline
+        except asyncio.CancelledError:
+            self._forget(key)
+            if future.done() and future.exception() is None:
+                self._release()  # granted, but the caller went away
+            raise
+
+    def _release(self) -> None:
+        """Hand the slot to the oldest waiter, or free it."""
+        while self._waiters:
+            future = self._forget(next(iter(self._waiters)))
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    def _reject(self, reason: str) -> None:
+        self.rejected[reason] += 1
+        logger.warning("Shedding /analyze request: %s (active=%d, waiting=%d)",
+                       reason, self.active, self.waiting)
+        raise AdmissionRejected(reason, self.retry_after)
+
+    def _reject_waiter(self, key: int, reason: str) -> None:
+        self.rejected[reason] += 1
+        self._forget(key).set_exception(AdmissionRejected(reason, 0.0))
+
+    def _forget(self, key: int) -> asyncio.Future | None:
+        """Remove waiter ``key`` from the queue and return its future."""
+        entry = self._waiters.pop(key, None)
+        if entry is None:
+            return None
+        session_id, future = entry
+        if session_id is not None and self._by_session.get(session_id) == key:
+            del self._by_session[session_id]
+        return future
+
+
+@lru_cache()
+def get_admission_controller() -> AdmissionController:
+    """Return the process-wide admission controller, configured from config.yaml."""
+    settings = get_settings()
+    admission = settings.admission
+    return AdmissionController(
+        max_concurrent=admission.max_concurrent or settings.workers.num_workers,
+        max_queue=admission.max_queue,
+        max_queue_wait_ms=admission.max_queue_wait_ms,
+        retry_after_seconds=admission.retry_after_seconds,
+    )
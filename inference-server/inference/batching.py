@@ -0,0 +1,116 @@
+"""Request-coalescing micro-batcher.
+
+Concurrent /analyze requests each submit one item; items arriving within
+``max_wait_ms`` of the first pending item (or until ``max_batch_size`` is
+reached) are handed to a batch function in a single executor call, and the
+per-item results are scattered back to the waiting requests.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+from functools import lru_cache
+from typing import Callable, Generic, TypeVar
+
+from config.settings import get_settings
+from inference.workers import get_worker_pool
+from models import analyze_faces, analyze_speech_batch
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Coalesce single-item submissions into batched calls of ``batch_fn``."""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[T]], list[R]],
+        *,
+        max_batch_size: int,
+        max_wait_ms: float,
+        executor: Executor | None = None,
+        name: str = "batch",
+    ) -> None:
+        self._batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._executor = executor
+        self.name = name
+        self._pending: list[tuple[T, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self.batches_run = 0
+        self.items_run = 0
+
+    async def submit(self, item: T) -> R:
+        """Queue ``item`` for the next batch and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # Drop items whose requests already gave up (timeout/cancel).
+        live = [(item, fut) for item, fut in self._pending if not fut.done()]
+        batch, self._pending = live[: self.max_batch_size], live[self.max_batch_size :]
+        if self._pending:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: list[tuple[T, asyncio.Future]]) -> None:
+        loop = asyncio.get_running_loop()
+        items = [item for item, _ in batch]
+        try:
+            results = await loop.run_in_executor(self._executor, self._batch_fn, items)
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"{self.name} batch returned {len(results)} results for {len(items)} items"
+                )
+        except Exception as exc:
+            logger.exception("%s batch of %d failed", self.name, len(items))
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+
+        self.batches_run += 1
+        self.items_run += len(items)
+        logger.debug("%s batch ran %d items", self.name, len(items))
+        for (_, fut), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
+
+
+def _build_batcher(batch_fn: Callable, section, name: str) -> MicroBatcher | None:
+    if section.batch_max_size <= 1:
+        return None
+    return MicroBatcher(
+        batch_fn,
+        max_batch_size=section.batch_max_size,
+        max_wait_ms=section.batch_max_wait_ms,
+        executor=get_worker_pool().executor,
+        name=name,
+    )
+
+
+@lru_cache()
+def get_facial_batcher() -> MicroBatcher | None:
+    """Return the shared facial batcher, or None when batching is disabled."""
+    return _build_batcher(analyze_faces, get_settings().facial, "facial")
+
+
+@lru_cache()
+def get_speech_batcher() -> MicroBatcher | None:
+    """Return the shared speech batcher, or None when batching is disabled."""
+    return _build_batcher(analyze_speech_batch, get_settings().speech, "speech")
@@ -0,0 +1,123 @@
+"""Prometheus metrics for the inference pipeline, served at GET /metrics.
+
+Per-stage latency goes into one histogram labelled by ``stage``.  The
+server times the stages it owns (multipart or binary body read, fusion,
+response serialization) directly; eq_models reports its own stages (image
+decode, face detection, emotion CNN, audio decode, resample, SenseVoice
+generate) through ``eq_models.timing`` once ``install_stage_observer`` has run.  With
+the ``process`` worker backend those model stages run in the worker
+processes and are not collected here.
+
+Alongside the stages: end-to-end /analyze latency, in-flight requests,
+requests shed by admission control, modalities skipped by early-exit
+fusion, client sessions held and evicted, and the admission and
+worker-pool queue depths, sampled at scrape time.
+"""
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    ProcessCollector,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily
+
+from eq_models.timing import set_stage_observer
+from inference.admission import get_admission_controller
+from inference.sessions import get_session_store
+from inference.workers import get_worker_pool
+
+REGISTRY = CollectorRegistry()
+ProcessCollector(registry=REGISTRY)
+
+_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+STAGE_SECONDS = Histogram(
+    "eq_stage_duration_seconds",
+    "Latency of one pipeline stage.",
+    ["stage"],
+    buckets=_BUCKETS,
+    registry=REGISTRY,
+)
+ANALYZE_SECONDS = Histogram(
+    "eq_analyze_duration_seconds",
+    "End-to-end latency of POST /analyze.",
+    buckets=_BUCKETS,
+    registry=REGISTRY,
+)
+IN_FLIGHT = Gauge(
+    "eq_analyze_in_flight_requests",
+    "POST /analyze requests currently being handled.",
+    registry=REGISTRY,
+)
+QUEUE_DEPTH = Gauge(
+    "eq_executor_queue_depth",
+    "Inference tasks submitted to the worker pool but not yet started.",
+    registry=REGISTRY,
+)
+QUEUE_DEPTH.set_function(lambda: get_worker_pool().queue_depth)
+ADMISSION_WAITING = Gauge(
+    "eq_admission_waiting_requests",
+    "POST /analyze requests waiting for an inference slot.",
+    registry=REGISTRY,
+)
+ADMISSION_WAITING.set_function(lambda: get_admission_controller().waiting)
+REJECTED = Counter(
+    "eq_analyze_rejected",
+    "POST /analyze requests shed by admission control.",
+    ["reason"],
+    registry=REGISTRY,
+)
+EARLY_EXITS = Counter(
+    "eq_fusion_early_exits",
+    "Modality inferences skipped because the other modality settled the verdict.",
+    ["skipped"],
+    registry=REGISTRY,
+)
+SESSIONS = Gauge(
+    "eq_sessions_active",
+    "Client sessions with rolling state in memory.",
+    registry=REGISTRY,
+)
+SESSIONS.set_function(lambda: len(get_session_store()))
+
+
+class _SessionEvictions:
+    """``eq_session_evictions_total``, read from the session store at scrape time."""
+
+    def collect(self):
+        family = CounterMetricFamily(
+            "eq_session_evictions",
+            "Client sessions evicted since startup, by reason (idle, capacity).",
+            labels=["reason"],
+        )
+        for reason, count in get_session_store().evicted.items():
+            family.add_metric([reason], count)
+        yield family
+
+
+SESSION_EVICTIONS = _SessionEvictions()
+REGISTRY.register(SESSION_EVICTIONS)
+
+
+def time_stage(stage: str):
+    """Context manager recording the enclosed block under ``stage``."""
+    return STAGE_SECONDS.labels(stage=stage).time()
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """``eq_models.timing`` observer feeding the stage histogram."""
+    STAGE_SECONDS.labels(stage=stage).observe(seconds)
+
+
+def install_stage_observer() -> None:
+    """Route eq_models stage timings in this process into the stage histogram."""
+    set_stage_observer(observe_stage)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Current metrics in Prometheus text format, with their content type."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,236 @@
+"""Concurrent inference orchestrator for POST /analyze.
+
+Facial and speech analysis are dispatched to the executor at the same time,
+so request latency is max(face, speech) instead of face + speech.  Each
+modality has its own timeout; a modality that times out contributes a
+neutral result rather than stalling the whole verdict.  Fusion is a cheap
+pure function and runs inline on the event loop.
+
+With early exit (``settled_verdict`` passed in), whichever modality
+finishes first is checked against the fusion rules.  If no result from the
+other modality could change the verdict, the other one is cancelled: an
+item still queued on the executor or in a micro-batch never runs, and the
+response does not wait for one already running.  Verdicts are unchanged;
+the skipped modality shows up as neutral in the debug block, flagged
+``*_skipped``.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from inference.metrics import EARLY_EXITS, time_stage
+from models import fused_score
+from models.schemas import FacialEmotionResult, SpeechEmotionResult, Verdict
+
+logger = logging.getLogger(__name__)
+
+
+_STAGE_DETAILS = {
+    "facial": "Facial emotion analysis failed",
+    "speech": "Speech emotion analysis failed",
+    "fusion": "Score fusion failed",
+}
+
+
+class InferenceStageError(Exception):
+    """Raised when one stage of the pipeline (facial, speech, fusion) fails."""
+
+    def __init__(self, stage: str) -> None:
+        super().__init__(f"{stage} stage failed")
+        self.stage = stage
+
+    @property
+    def detail(self) -> str:
+        """Client-facing error message for this stage."""
+        return _STAGE_DETAILS.get(self.stage, "Analysis failed")
+
+
+@dataclass
+class InferenceOutcome:
+    facial: Any
+    speech: Any
+    verdict: Verdict
+    facial_timed_out: bool = False
+    speech_timed_out: bool = False
+    facial_skipped: bool = False
+    speech_skipped: bool = False
+
+    @property
+    def fused_score(self) -> float:
+        """The score ``compute_verdict`` thresholds, with the same weights."""
+        return fused_score(self.facial, self.speech)
+
+    def debug_info(self) -> dict[str, object]:
+        """The ``debug`` block returned alongside the verdict."""
+        return {
+            "facial_emotions": {k: round(v, 3) for k, v in self.facial.emotions.items()},
+            "facial_dominant": self.facial.dominant,
+            "speech_emotions": {k: round(v, 3) for k, v in self.speech.emotions.items()},
+            "speech_dominant": self.speech.dominant,
+            "speech_inferred_seconds": round(self.speech.inferred_seconds, 3),
+            "fused_score": round(self.fused_score, 3),
+            "facial_timed_out": self.facial_timed_out,
+            "speech_timed_out": self.speech_timed_out,
+            "facial_skipped": self.facial_skipped,
+            "speech_skipped": self.speech_skipped,
+        }
+
+
+def _neutral_facial() -> FacialEmotionResult:
+    return FacialEmotionResult(emotions={"neutral": 1.0}, dominant="neutral", is_concerning=False)
+
+
+def _neutral_speech() -> SpeechEmotionResult:
+    return SpeechEmotionResult(emotions={"neutral": 1.0}, dominant="neutral", is_concerning=False)
+
+
+async def _run_modality(
+    stage: str,
+    fn: Callable[[Any], Any] | Callable[[Any], Awaitable[Any]],
+    payload: Any,
+    timeout: float | None,
+    fallback: Callable[[], Any],
+    executor: Executor | None,
+) -> tuple[Any, bool]:
+    """Run one modality and return (result, timed_out).
+
+    Plain functions run in ``executor``; coroutine functions (e.g. a
+    MicroBatcher's ``submit``) are awaited directly.
+    """
+    if asyncio.iscoroutinefunction(fn):
+        future = fn(payload)
+    else:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(executor, fn, payload)
+    try:
+        if timeout:
+            return await asyncio.wait_for(future, timeout), False
+        return await future, False
+    except asyncio.TimeoutError:
+        logger.warning("%s analysis exceeded %.2fs — using neutral result", stage, timeout)
+        return fallback(), True
+    except Exception as exc:
+        raise InferenceStageError(stage) from exc
+
+
+async def run_inference(
+    image_bytes: bytes,
+    audio: Any,
+    *,
+    analyze_face: Callable[[bytes], Any] | Callable[[bytes], Awaitable[Any]],
+    analyze_speech: Callable[[Any], Any] | Callable[[Any], Awaitable[Any]],
+    compute_verdict: Callable[[Any, Any], Verdict],
+    settled_verdict: Callable[[Any, Any], Verdict | None] | None = None,
+    facial_timeout: float | None = None,
+    speech_timeout: float | None = None,
+    executor: Executor | None = None,
+) -> InferenceOutcome:
+    """Analyze both modalities concurrently and fuse them into a verdict.
+
+    The analysis callables are passed in (rather than imported here) so the
+    route decides which implementations run — real models, batchers, stubs,
+    or test doubles.  ``audio`` is whatever ``analyze_speech`` accepts: WAV
+    bytes for /analyze, a sample buffer for streaming sessions.  Passing
+    ``settled_verdict`` (``facial, speech -> Verdict | None``, one argument
+    None) enables early exit.
+
+    Raises:
+        InferenceStageError: if a modality or fusion raises.  When both
+            modalities fail, the facial failure is reported.
+    """
+    facial_task = asyncio.ensure_future(
+        _run_modality("facial", analyze_face, image_bytes, facial_timeout, _neutral_facial, executor)
+    )
+    speech_task = asyncio.ensure_future(
+        _run_modality("speech", analyze_speech, audio, speech_timeout, _neutral_speech, executor)
+    )
+
+    try:
+        if settled_verdict is not None:
+            outcome = await _try_early_exit(facial_task, speech_task, settled_verdict)
+            if outcome is not None:
+                return outcome
+        facial_res, speech_res = await asyncio.gather(
+            facial_task, speech_task, return_exceptions=True
+        )
+    except asyncio.CancelledError:
+        facial_task.cancel()
+        speech_task.cancel()
+        raise
+    for res in (facial_res, speech_res):
+        if isinstance(res, BaseException):
+            raise res
+
+    facial, facial_timed_out = facial_res
+    speech, speech_timed_out = speech_res
+
+    try:
+        with time_stage("fusion"):
+            verdict = compute_verdict(facial, speech)
+    except Exception as exc:
+        raise InferenceStageError("fusion") from exc
+
+    return InferenceOutcome(
+        facial=facial,
+        speech=speech,
+        verdict=verdict,
+        facial_timed_out=facial_timed_out,
+        speech_timed_out=speech_timed_out,
+    )
+
+
+async def _try_early_exit(
+    facial_task: asyncio.Future,
+    speech_task: asyncio.Future,
+    settled_verdict: Callable[[Any, Any], Verdict | None],
+) -> InferenceOutcome | None:
+    """Wait for the first modality; if it settles the verdict, cancel the other.
+
+    Returns None (both tasks left running) when the verdict is still open,
+    both finished together, or the first one failed.
+    """
+    done, _ = await asyncio.wait((facial_task, speech_task), return_when=asyncio.FIRST_COMPLETED)
+    if len(done) == 2:
+        return None
+    first = done.pop()
+    if first.exception() is not None:
+        return None
+    result, timed_out = first.result()
+
+    facial_first = first is facial_task
+    try:
+        if facial_first:
+            verdict = settled_verdict(result, None)
+        else:
+            verdict = settled_verdict(None, result)
+    except Exception as exc:
+        raise InferenceStageError("fusion") from exc
+    if verdict is None:
+        return None
+
+    other = speech_task if facial_first else facial_task
+    other.cancel()
+    # A result (or failure) that lands before the cancel is moot either way.
+    await asyncio.gather(other, return_exceptions=True)
+    skipped = "speech" if facial_first else "facial"
+    EARLY_EXITS.labels(skipped=skipped).inc()
+    logger.debug("Verdict %s settled early; skipped %s analysis", verdict.value, skipped)
+
+    if facial_first:
+        return InferenceOutcome(
+            facial=result,
+            speech=_neutral_speech(),
+            verdict=verdict,
+            facial_timed_out=timed_out,
+            speech_skipped=True,
+        )
+    return InferenceOutcome(
+        facial=_neutral_facial(),
+        speech=result,
+        verdict=verdict,
+        speech_timed_out=timed_out,
+        facial_skipped=True,
+    )
@@ -0,0 +1,208 @@
+"""Opt-in runtime profiling of the inference server.
+
+Two modes, toggled at runtime through ``/admin/profile`` or ``SIGUSR1``
+(see ``routes/admin.py``) without restarting the server:
+
+* ``sampling`` — a background thread snapshots every thread's stack each
+  ``interval_ms`` and counts identical stacks.  The dump is a collapsed-stack
+  ``.folded`` file (one ``root;...;leaf count`` line per stack) that
+  flamegraph.pl, speedscope or inferno render directly.
+* ``requests`` — a ``fraction`` of /analyze calls run their model callables
+  under ``cProfile``; stats from all sampled calls are merged and dumped as a
+  ``.pstats`` file (snakeviz, gprof2dot, flameprof).  Only one call is
+  profiled at a time, since CPython allows a single active profiler on some
+  versions; concurrent sampled calls run unprofiled.  Needs the ``thread``
+  worker backend, and calls routed through a micro-batcher are not covered.
+
+While idle the only cost on the request path is one attribute check in
+``sample_request``.
+"""
+
+import asyncio
+import cProfile
+import logging
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from functools import lru_cache, wraps
+from pathlib import Path
+from typing import Any, Callable
+
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+MODES = ("sampling", "requests")
+
+
+def _collapse(frame, thread_name: str) -> str:
+    """One stack as ``thread;outermost;...;innermost``."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.append(thread_name)
+    return ";".join(reversed(names))
+
+
+class _StackSampler(threading.Thread):
+    """Counts collapsed stacks of every other thread until stopped or ``deadline``."""
+
+    def __init__(self, interval: float, deadline: float | None, on_done: Callable[[], None]) -> None:
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.deadline = deadline
+        self.counts: Counter[str] = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+        self._on_done = on_done
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != me:
+                    self.counts[_collapse(frame, names.get(ident, str(ident)))] += 1
+            self.samples += 1
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                self._on_done()
+                return
+
+
+class Profiler:
+    """Process-wide profiling state; at most one mode runs at a time."""
+
+    def __init__(self, output_dir: str | Path, allow_requests: bool = True) -> None:
+        self.output_dir = Path(output_dir)
+        self.allow_requests = allow_requests
+        self.mode: str | None = None
+        self.fraction = 0.0
+        self.calls_profiled = 0
+        self.last_dump: Path | None = None
+        self._sampler: _StackSampler | None = None
+        self._stats: pstats.Stats | None = None
+        self._profile_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "fraction": self.fraction,
+            "samples": self._sampler.samples if self._sampler else 0,
+            "calls_profiled": self.calls_profiled,
+            "last_dump": str(self.last_dump) if self.last_dump else None,
+        }
+
+    def start_sampling(self, interval_ms: float, duration_s: float | None = None) -> None:
+        """Start the stack sampler; it dumps and stops itself after ``duration_s``."""
+        with self._state_lock:
+            self._check_idle()
+            deadline = time.monotonic() + duration_s if duration_s else None
+            self._sampler = _StackSampler(max(interval_ms, 1.0) / 1000.0, deadline, self.stop)
+            self.mode = "sampling"
+            self._sampler.start()
+        logger.info("Sampling profiler started (every %.1f ms)", interval_ms)
+
+    def start_requests(self, fraction: float) -> None:
+        """Profile ``fraction`` of /analyze calls with cProfile."""
+        if not self.allow_requests:
+            raise ValueError("Per-request profiling needs workers.backend: thread")
+        if not 0.0 < fraction <= 1.0:
+            raise ValueError("fraction must be in (0, 1]")
+        with self._state_lock:
+            self._check_idle()
+            self._stats = None
+            self.calls_profiled = 0
+            self.mode = "requests"
+            self.fraction = fraction
+        logger.info("Per-request profiling started for %.0f%% of /analyze calls", fraction * 100)
+
+    def stop(self) -> Path | None:
+        """Stop the active mode and write its dump; return the file, if any."""
+        with self._state_lock:
+            mode, self.mode, self.fraction = self.mode, None, 0.0
+            sampler, self._sampler = self._sampler, None
+        if mode == "sampling":
+            sampler.stop()
+            # Wait for the last sample before reading counts, unless this is
+            # the sampler itself stopping at its deadline.  Joining outside
+            # the state lock lets a sampler racing into stop() finish.
+            if sampler is not threading.current_thread():
+                sampler.join()
+            path = self._dump_path("folded")
+            with open(path, "w") as f:
+                for stack, count in sampler.counts.most_common():
+                    f.write(f"{stack} {count}\n")
+        elif mode == "requests":
+            with self._profile_lock:
+                stats, self._stats = self._stats, None
+            if stats is None:
+                return None
+            path = self._dump_path("pstats")
+            stats.dump_stats(path)
+        else:
+            return None
+        self.last_dump = path
+        logger.info("Profile written to %s", path)
+        return path
+
+    def sample_request(self) -> bool:
+        """Whether this /analyze call should be profiled."""
+        return self.fraction > 0.0 and random.random() < self.fraction
+
+    def profiled(self, fn: Callable) -> Callable:
+        """Wrap a plain model callable so it runs under cProfile.
+
+        Coroutine functions (a batcher's ``submit``) are returned unchanged.
+        """
+        if asyncio.iscoroutinefunction(fn):
+            return fn
+
+        @wraps(fn)
+        def run(*args, **kwargs):
+            if not self._profile_lock.acquire(blocking=False):
+                return fn(*args, **kwargs)
+            try:
+                profile = cProfile.Profile()
+                profile.enable()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    profile.disable()
+                    if self._stats is None:
+                        self._stats = pstats.Stats(profile)
+                    else:
+                        self._stats.add(profile)
+                    self.calls_profiled += 1
+            finally:
+                self._profile_lock.release()
+
+        return run
+
+    def _check_idle(self) -> None:
+        if self.mode is not None:
+            raise RuntimeError(f"{self.mode} profiling is already running")
+
+    def _dump_path(self, suffix: str) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return self.output_dir / f"profile-{stamp}-{os.getpid()}.{suffix}"
+
+
+@lru_cache()
+def get_profiler() -> Profiler:
+    """Return the process-wide profiler, configured from config.yaml."""
+    settings = get_settings()
+    return Profiler(
+        settings.profiling.output_dir,
+        allow_requests=settings.workers.backend == "thread",
+    )
@@ -0,0 +1,73 @@
+"""Compact binary request body for POST /analyze/binary.
+
+One body, no multipart framing, no temp files.  All integers little-endian:
+
+    offset  size  field
+    0       4     magic ``b"EQA1"``
+    4       1     version (1)
+    5       1     channels (PCM channel count, >= 1)
+    6       2     reserved (0)
+    8       4     sample_rate (Hz)
+    12      4     frame_len (JPEG bytes)
+    16      4     audio_len (PCM bytes, a multiple of 2 * channels)
+    20      ...   JPEG bytes, then interleaved PCM16 samples
+
+The frame comes back as a ``memoryview`` slice and the audio as an int16
+``numpy`` view of the same buffer, so parsing copies nothing.
+"""
+
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+MAGIC = b"EQA1"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHIII")
+CONTENT_TYPE = "application/x-eq-analyze"
+
+
+class ProtocolError(ValueError):
+    """Raised for a malformed binary request body."""
+
+
+@dataclass
+class BinaryRequest:
+    frame: memoryview
+    samples: np.ndarray  # (frames, channels) int16, a view into the body
+    sample_rate: int
+
+
+def encode_request(frame: bytes, pcm16: bytes, sample_rate: int, channels: int = 1) -> bytes:
+    """Build a request body; used by tests and benchmarks."""
+    header = HEADER.pack(MAGIC, VERSION, channels, 0, sample_rate, len(frame), len(pcm16))
+    return header + frame + pcm16
+
+
+def parse_request(body: bytes) -> BinaryRequest:
+    """Split a request body into frame and samples without copying either."""
+    if len(body) < HEADER.size:
+        raise ProtocolError("Body shorter than the binary header")
+    magic, version, channels, _, sample_rate, frame_len, audio_len = HEADER.unpack_from(body)
+    if magic != MAGIC:
+        raise ProtocolError("Bad magic; expected EQA1")
+    if version != VERSION:
+        raise ProtocolError(f"Unsupported protocol version {version}")
+    if channels == 0 or sample_rate == 0:
+        raise ProtocolError("channels and sample_rate must be positive")
+    if HEADER.size + frame_len + audio_len != len(body):
+        raise ProtocolError(
+            f"Length mismatch: header declares {HEADER.size + frame_len + audio_len} bytes, "
+            f"body has {len(body)}"
+        )
+    if audio_len % (2 * channels):
+        raise ProtocolError("audio_len is not a whole number of PCM16 frames")
+
+    view = memoryview(body)
+    audio_offset = HEADER.size + frame_len
+    samples = np.frombuffer(body, dtype="<i2", count=audio_len // 2, offset=audio_offset)
+    return BinaryRequest(
+        frame=view[HEADER.size : audio_offset],
+        samples=samples.reshape(-1, channels),
+        sample_rate=sample_rate,
+    )
@@ -0,0 +1,156 @@
+"""Per-session rolling state for POST /analyze.
+
+Requests that carry ``X-Session-Id`` update a small, fixed-size state for
+that session: EWMAs of the facial and speech angry scores, an EWMA of the
+escalation flag (either modality concerning) and the last facial /
+speech results.  Every update is O(1).  The
+smoothed verdict runs ``compute_verdict`` itself on the EWMAs, so it uses
+exactly the fusion weights, thresholds and escalation rule of the instant
+verdict, while a single noisy frame or clip no longer flips the indicator
+and clients can capture less often.
+
+A modality skipped by early-exit fusion or cut off by its timeout does
+not overwrite its last result; the session folds in the last known
+result instead of the neutral placeholder.
+
+Sessions live in an LRU-ordered dict.  Each update evicts sessions idle
+for longer than ``idle_seconds`` from the cold end and the coldest
+sessions beyond ``max_sessions``, which caps memory at roughly
+``max_sessions`` small states.  Like admission control, the store is
+touched only from the event loop and needs no locks.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any
+
+from config.settings import get_settings
+from models import FacialEmotionResult, SpeechEmotionResult, compute_verdict
+
+logger = logging.getLogger(__name__)
+
+class SessionState:
+    """Rolling state for one client session."""
+
+    __slots__ = (
+        "facial_ewma",
+        "speech_ewma",
+        "concern_ewma",
+        "count",
+        "last_facial",
+        "last_speech",
+        "last_seen",
+    )
+
+    def __init__(self) -> None:
+        self.facial_ewma = 0.0
+        self.speech_ewma = 0.0
+        self.concern_ewma = 0.0
+        self.count = 0
+        self.last_facial: Any = None
+        self.last_speech: Any = None
+        self.last_seen = 0.0
+
+
+class SessionStore:
+    """Bounded map of session id -> SessionState with idle eviction."""
+
+    def __init__(
+        self,
+        *,
+        max_sessions: int,
+        idle_seconds: float,
+        ewma_alpha: float,
+    ) -> None:
+        if not 0.0 < ewma_alpha <= 1.0:
+            raise ValueError("ewma_alpha must be in (0, 1]")
+        self.max_sessions = max(1, max_sessions)
+        self.idle_seconds = idle_seconds
+        self.alpha = ewma_alpha
+        self.evicted = {"idle": 0, "capacity": 0}
+        self._sessions: OrderedDict[str, SessionState] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: str) -> SessionState | None:
+        return self._sessions.get(session_id)
+
+    def update(self, session_id: str, outcome, now: float | None = None) -> SessionState:
+        """Fold one InferenceOutcome into the session's state and return it."""
+        now = time.monotonic() if now is None else now
+        self._evict_idle(now)
+
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = self._sessions[session_id] = SessionState()
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted["capacity"] += 1
+        else:
+            self._sessions.move_to_end(session_id)
+
+        if not (outcome.facial_skipped or outcome.facial_timed_out):
+            state.last_facial = outcome.facial
+        if not (outcome.speech_skipped or outcome.speech_timed_out):
+            state.last_speech = outcome.speech
+
+        facial, speech = _angry(state.last_facial), _angry(state.last_speech)
+        concerning = float(_concerning(state.last_facial) or _concerning(state.last_speech))
+        if state.count == 0:
+            state.facial_ewma, state.speech_ewma = facial, speech
+            state.concern_ewma = concerning
+        else:
+            state.facial_ewma += self.alpha * (facial - state.facial_ewma)
+            state.speech_ewma += self.alpha * (speech - state.speech_ewma)
+            state.concern_ewma += self.alpha * (concerning - state.concern_ewma)
+
+        state.count += 1
+        state.last_seen = now
+        return state
+
+    def smoothed_verdict(self, state: SessionState) -> str:
+        """``compute_verdict`` on the session's EWMAs: GREEN, YELLOW or RED."""
+        facial = FacialEmotionResult(
+            emotions={"angry": state.facial_ewma},
+            dominant="angry",
+            is_concerning=state.concern_ewma >= 0.5,
+        )
+        speech = SpeechEmotionResult(
+            emotions={"angry": state.speech_ewma}, dominant="angry", is_concerning=False
+        )
+        return _verdict_name(compute_verdict(facial, speech))
+
+    def _evict_idle(self, now: float) -> None:
+        cutoff = now - self.idle_seconds
+        while self._sessions:
+            session_id, state = next(iter(self._sessions.items()))
+            if state.last_seen >= cutoff:
+                return
+            del self._sessions[session_id]
+            self.evicted["idle"] += 1
+
+
+def _angry(result) -> float:
+    return result.emotions.get("angry", 0.0) if result is not None else 0.0
+
+
+def _concerning(result) -> bool:
+    return result is not None and result.is_concerning
+
+
+def _verdict_name(verdict) -> str:
+    return getattr(verdict, "value", verdict)
+
+
+@lru_cache()
+def get_session_store() -> SessionStore:
+    """Return the process-wide session store, configured from config.yaml."""
+    sessions = get_settings().sessions
+    return SessionStore(
+        max_sessions=sessions.max_sessions,
+        idle_seconds=sessions.idle_seconds,
+        ewma_alpha=sessions.ewma_alpha,
+    )
@@ -0,0 +1,63 @@
+"""Per-connection state for the /ws/session streaming endpoint.
+
+A StreamSession keeps the most recent camera frame, an ``eq_models``
+FrameGate and FaceTracker, and an ``eq_models`` SpeechStream for one
+WebSocket connection.  The gate reuses the previous facial result for
+near-identical frames and the tracker lets the rest skip face detection;
+the SpeechStream
+holds the rolling audio window and caches fbank features incrementally, so
+overlapping windows only pay for the audio that is new since the last hop.
+"""
+
+import numpy as np
+
+from eq_models.audio import check_sample_rate
+from models import FaceTracker, FrameGate, SpeechStream, SpeechWindow
+
+# Binary message kinds — the first byte of every binary WebSocket message.
+MSG_FRAME = 0x01
+MSG_AUDIO = 0x02
+
+
+class StreamSession:
+    """Latest frame plus a sliding speech window for one connection."""
+
+    def __init__(self, sample_rate: int, window_seconds: float, hop_seconds: float) -> None:
+        self.window_seconds = window_seconds
+        self.hop_seconds = hop_seconds
+        self.frame: bytes | None = None
+        self.frame_gate = FrameGate()
+        self.face_tracker = FaceTracker()
+        self.set_sample_rate(sample_rate)
+
+    def set_sample_rate(self, sample_rate: int) -> None:
+        """Set the client's PCM sample rate; discards buffered audio.
+
+        Raises ValueError for rates outside the supported range.
+        """
+        check_sample_rate(sample_rate)
+        self.sample_rate = sample_rate
+        self.speech = SpeechStream(self.window_seconds, self.hop_seconds)
+
+    def add_frame(self, jpeg: bytes) -> None:
+        self.frame = jpeg
+
+    def add_audio(self, pcm16: bytes) -> None:
+        """Append a little-endian PCM16 mono chunk to the speech window.
+
+        Resamples and extracts fbank features, so this blocks; the route
+        runs it off the event loop.
+        """
+        if len(pcm16) % 2:
+            raise ValueError("PCM16 chunk has an odd number of bytes")
+        samples = np.frombuffer(pcm16, dtype="<i2").astype(np.float32) / 32768.0
+        self.speech.push(samples, self.sample_rate)
+
+    @property
+    def due(self) -> bool:
+        """True once a frame exists and a hop of new audio has arrived."""
+        return self.frame is not None and self.speech.due
+
+    def take_window(self) -> tuple[bytes, SpeechWindow]:
+        """Return (latest frame, speech window snapshot) and reset the hop."""
+        return self.frame, self.speech.take_window()
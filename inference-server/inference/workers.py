@@ -0,0 +1,174 @@
+"""Model worker pool — owns the inference executor and model readiness.
+
+Models are loaded and warmed (a dummy frame and clip are pushed through
+them) at server startup rather than on the first /analyze call, and all
+inference runs on a sized pool instead of asyncio's default executor.
+
+Two backends are available:
+
+* ``thread`` — a ThreadPoolExecutor sharing one copy of each model.  CPU-bound
+  Python preprocessing (PIL decode, OpenCV detection, resampling) serializes
+  on the GIL.
+* ``process`` — a ProcessPoolExecutor where every worker process loads and
+  warms its own models when it starts.  Payloads travel over the executor's
+  pipes as raw ``bytes`` (pickled with a single copy) and results come back
+  as small pydantic models, so dispatch overhead stays far below model cost.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Sequence
+
+from config.settings import get_settings
+from eq_models.backends import THREAD_ENV_VARS, cap_threads
+from models import face_loaded, speech_loaded, warmup_face, warmup_speech
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("thread", "process")
+
+
+def _init_worker_process(warmups: Sequence[Callable[[], None]], threads: int) -> None:
+    """Process-pool initializer: cap math-library threads, then warm models.
+
+    numpy and its BLAS are already loaded by now (unpickling ``warmups``
+    imports eq_models), so the environment set by the parent covers their
+    start-up and ``cap_threads`` reins in whatever is already running, plus
+    OpenCV and ONNX Runtime.
+
+    A failing warm-up is logged rather than raised: an initializer error
+    would break the whole pool, whereas a worker without models still
+    serves load checks, so /health reports not-ready.
+    """
+    cap_threads(threads)
+    for fn in warmups:
+        try:
+            fn()
+        except Exception:
+            logger.exception("Warm-up %s failed in worker process %d", fn.__name__, os.getpid())
+
+
+def _all_loaded(checks: Sequence[Callable[[], bool]]) -> bool:
+    return all(fn() for fn in checks)
+
+
+class ModelWorkerPool:
+    """A fixed-size pool of inference workers with a warm-up step."""
+
+    def __init__(
+        self,
+        num_workers: int,
+        warmups: Sequence[Callable[[], None]] = (),
+        backend: str = "thread",
+        threads_per_process: int = 1,
+        load_checks: Sequence[Callable[[], bool]] = (),
+    ) -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown worker backend {backend!r}; expected one of {BACKENDS}")
+        self.num_workers = num_workers
+        self.backend = backend
+        self.ready = False
+        self._warmups = tuple(warmups)
+        self._load_checks = tuple(load_checks)
+        if backend == "process":
+            if threads_per_process > 0:
+                # Spawned children inherit the environment and read it when
+                # they import numpy, before the initializer runs.  The parent
+                # runs no models with this backend.
+                for var in THREAD_ENV_VARS:
+                    os.environ[var] = str(threads_per_process)
+            # spawn, not fork: the parent may already hold TF/torch thread pools.
+            self._executor: Executor = ProcessPoolExecutor(
+                max_workers=num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker_process,
+                initargs=(self._warmups, threads_per_process),
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=num_workers, thread_name_prefix="inference"
+            )
+
+    @property
+    def executor(self) -> Executor:
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """Tasks submitted to the executor that no worker has started yet."""
+        if isinstance(self._executor, ThreadPoolExecutor):
+            return self._executor._work_queue.qsize()
+        # Process pools track submitted-but-unfinished items; those beyond
+        # one per worker are still waiting.
+        pending = len(getattr(self._executor, "_pending_work_items", ()))
+        return max(0, pending - self.num_workers)
+
+    async def start(self) -> bool:
+        """Run every warm-up callable on the pool and record readiness.
+
+        Warm-ups run concurrently.  With the process backend each worker
+        process also warms its own models from the pool initializer as it
+        spawns.  A failing warm-up is logged and leaves the pool not ready;
+        the server still starts so /health can say so.
+        """
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(self._executor, fn) for fn in self._warmups),
+            return_exceptions=True,
+        )
+        failed = False
+        for fn, res in zip(self._warmups, results):
+            if isinstance(res, BaseException):
+                logger.error("Warm-up %s failed", fn.__name__, exc_info=res)
+                failed = True
+            else:
+                logger.info("Warm-up %s complete", fn.__name__)
+        self.ready = not failed
+        return self.ready
+
+    async def check_loaded(self) -> bool:
+        """Readiness, marking the pool ready once its models have loaded.
+
+        With warm-up disabled nothing is ready at startup; models load on
+        first use, and this turns ``ready`` on once every load check
+        passes.  With the process backend the checks run on a worker
+        process, where the models live.
+        """
+        if self.ready or not self._load_checks:
+            return self.ready
+        try:
+            if self.backend == "thread":
+                loaded = _all_loaded(self._load_checks)
+            else:
+                loop = asyncio.get_running_loop()
+                loaded = await loop.run_in_executor(
+                    self._executor, _all_loaded, self._load_checks
+                )
+        except Exception:
+            logger.exception("Model load check failed")
+            return False
+        if loaded:
+            logger.info("Models loaded on first use — pool ready")
+            self.ready = True
+        return self.ready
+
+    def shutdown(self) -> None:
+        self.ready = False
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache()
+def get_worker_pool() -> ModelWorkerPool:
+    """Return the process-wide worker pool, configured from config.yaml."""
+    workers = get_settings().workers
+    return ModelWorkerPool(
+        num_workers=workers.num_workers,
+        warmups=(warmup_face, warmup_speech) if workers.warmup else (),
+        backend=workers.backend,
+        threads_per_process=workers.threads_per_process,
+        load_checks=(face_loaded, speech_loaded),
+    )
@@ -1,10 +1,24 @@
+import asyncio
 import logging
+import signal
 
 from fastapi import FastAPI
 
 from config.settings import get_settings
+from inference import (
+    get_admission_controller,
+    get_facial_batcher,
+    get_session_store,
+    get_speech_batcher,
+    get_worker_pool,
+)
+from inference.metrics import install_stage_observer
+from inference.profiling import get_profiler
 from models.schemas import HealthResponse
+from routes.admin import router as admin_router
 from routes.analyze import router as analyze_router
+from routes.metrics import router as metrics_router
+from routes.session import router as session_router
 
 # Load settings
 settings = get_settings()
@@ -24,28 +38,67 @@ app = FastAPI(
 
 # Include routes
 app.include_router(analyze_router)
+app.include_router(session_router)
+app.include_router(metrics_router)
+if settings.profiling.enabled:
+    app.include_router(admin_router)
 
-# Track whether models are loaded (will be set to True once EPIC-4 models initialize)
-models_loaded = False
+# Feed eq_models' per-stage timings into /metrics.
+install_stage_observer()
 
 
 @app.on_event("startup")
 async def startup() -> None:
-    global models_loaded
     logger.info("Starting EQ Meeting Coach Inference Server on port %s", settings.server_port)
     logger.info("Configuration: %s", settings.model_dump())
-    try:
-        from eq_models.facial import analyze_face
-        from eq_models.speech import analyze_speech
-        from eq_models.fusion import compute_verdict
-        models_loaded = True
+    if settings.profiling.enabled:
+        _install_profile_signal()
+    pool = get_worker_pool()
+    if not settings.workers.warmup:
+        logger.info("Model warm-up disabled — models will load on first request; "
+                    "/health reports models_loaded=true once they have")
+        return
+    logger.info("Warming up models on %d %s inference workers", pool.num_workers, pool.backend)
+    if await pool.start():
         logger.info("Server ready — real ML models available")
+    else:
+        logger.error("Model warm-up failed — /health will report models_loaded=false")
+
+
+def _toggle_sampling() -> None:
+    """SIGUSR1: start the sampling profiler, or stop it and write the dump."""
+    profiler = get_profiler()
+    try:
+        if profiler.mode is None:
+            profiler.start_sampling(settings.profiling.sample_interval_ms)
+        else:
+            profiler.stop()
     except Exception:
-        logger.exception("Failed to import ML models — falling back to stubs")
-        models_loaded = False
+        logger.exception("SIGUSR1 profiling toggle failed")
+
+
+def _install_profile_signal() -> None:
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, _toggle_sampling)
+    except (NotImplementedError, RuntimeError, ValueError):
+        logger.warning("SIGUSR1 profiling toggle unavailable here; use /admin/profile")
+    else:
+        logger.info("Profiling enabled — SIGUSR1 toggles the sampling profiler")
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    if get_profiler().mode is not None:
+        get_profiler().stop()
+    get_worker_pool().shutdown()
+    get_worker_pool.cache_clear()
+    get_facial_batcher.cache_clear()
+    get_speech_batcher.cache_clear()
+    get_admission_controller.cache_clear()
+    get_session_store.cache_clear()
 
 
 @app.get("/health", response_model=HealthResponse)
 async def health() -> HealthResponse:
     """Health check endpoint."""
-    return HealthResponse(status="ok", models_loaded=models_loaded)
+    return HealthResponse(status="ok", models_loaded=await get_worker_pool().check_loaded())
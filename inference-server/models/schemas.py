@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Literal
 
 from pydantic import BaseModel
 
@@ -13,6 +14,7 @@ class SpeechEmotionResult(BaseModel):
     emotions: dict[str, float]  # e.g., {"angry": 0.5, "neutral": 0.4, ...}
     dominant: str
     is_concerning: bool
+    inferred_seconds: float = 0.0
 
 
 class Verdict(str, Enum):
@@ -23,9 +25,25 @@ class Verdict(str, Enum):
 
 class AnalyzeResponse(BaseModel):
     verdict: Verdict
+    smoothed_verdict: Verdict | None = None  # only for requests with X-Session-Id
     debug: dict[str, object] | None = None
 
 
 class HealthResponse(BaseModel):
     status: str
     models_loaded: bool
+
+
+class ProfileRequest(BaseModel):
+    mode: Literal["sampling", "requests"] = "sampling"
+    interval_ms: float | None = None  # sampling; defaults to profiling.sample_interval_ms
+    duration_s: float | None = None  # sampling; stop and dump automatically after this long
+    fraction: float | None = None  # requests; defaults to profiling.request_fraction
+
+
+class ProfileStatus(BaseModel):
+    mode: str | None
+    fraction: float
+    samples: int
+    calls_profiled: int
+    last_dump: str | None
@@ -12,6 +12,11 @@ def analyze_face(image_bytes: bytes) -> FacialEmotionResult:
     )
 
 
+def analyze_faces(images: list[bytes]) -> list[FacialEmotionResult]:
+    """Stub: neutral facial emotion for every image in the batch."""
+    return [analyze_face(image) for image in images]
+
+
 def analyze_speech(audio_bytes: bytes) -> SpeechEmotionResult:
     """Stub: always returns neutral speech emotion."""
     return SpeechEmotionResult(
@@ -21,8 +26,20 @@ def analyze_speech(audio_bytes: bytes) -> SpeechEmotionResult:
     )
 
 
+def analyze_speech_batch(clips: list[bytes]) -> list[SpeechEmotionResult]:
+    """Stub: neutral speech emotion for every clip in the batch."""
+    return [analyze_speech(clip) for clip in clips]
+
+
 def compute_verdict(
     facial: FacialEmotionResult, speech: SpeechEmotionResult
 ) -> Verdict:
     """Stub: always returns GREEN."""
     return Verdict.GREEN
+
+
+def settled_verdict(
+    facial: FacialEmotionResult | None = None, speech: SpeechEmotionResult | None = None
+) -> Verdict | None:
+    """Stub: never settles early, so both stub modalities always run."""
+    return None
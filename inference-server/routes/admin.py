@@ -0,0 +1,42 @@
+"""Runtime profiling toggles, mounted only when ``profiling.enabled`` is set."""
+
+from fastapi import APIRouter, HTTPException
+
+from config.settings import get_settings
+from inference.profiling import get_profiler
+from models.schemas import ProfileRequest, ProfileStatus
+
+router = APIRouter(prefix="/admin", include_in_schema=False)
+
+
+@router.get("/profile", response_model=ProfileStatus)
+async def profile_status() -> ProfileStatus:
+    """Report the active profiling mode and the last dump written."""
+    return ProfileStatus(**get_profiler().status())
+
+
+@router.post("/profile", response_model=ProfileStatus)
+async def start_profile(request: ProfileRequest) -> ProfileStatus:
+    """Start sampling the whole process or profiling a fraction of /analyze calls."""
+    settings = get_settings().profiling
+    profiler = get_profiler()
+    try:
+        if request.mode == "sampling":
+            profiler.start_sampling(request.interval_ms or settings.sample_interval_ms, request.duration_s)
+        else:
+            profiler.start_requests(request.fraction or settings.request_fraction)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except RuntimeError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    return ProfileStatus(**profiler.status())
+
+
+@router.delete("/profile", response_model=ProfileStatus)
+async def stop_profile() -> ProfileStatus:
+    """Stop profiling and write the dump (path in ``last_dump``)."""
+    profiler = get_profiler()
+    if profiler.mode is None:
+        raise HTTPException(status_code=409, detail="No profiling is running")
+    profiler.stop()
+    return ProfileStatus(**profiler.status())
@@ -1,10 +1,32 @@
-import asyncio
+import contextlib
 import logging
+import math
 from functools import partial
 
-from fastapi import APIRouter, HTTPException, UploadFile, File
-
-from models import analyze_face, analyze_speech, compute_verdict
+from fastapi import APIRouter, File, Header, HTTPException, Request, Response, UploadFile
+
+from config.settings import get_settings
+from eq_models.audio import compressed_formats
+from inference import (
+    AdmissionRejected,
+    InferenceStageError,
+    get_admission_controller,
+    get_facial_batcher,
+    get_session_store,
+    get_speech_batcher,
+    get_worker_pool,
+    run_inference,
+)
+from inference.metrics import ANALYZE_SECONDS, IN_FLIGHT, REJECTED, time_stage
+from inference.profiling import get_profiler
+from inference.protocol import CONTENT_TYPE as BINARY_CONTENT_TYPE, ProtocolError, parse_request
+from models import (
+    analyze_face,
+    analyze_speech,
+    analyze_speech_samples,
+    compute_verdict,
+    settled_verdict,
+)
 from models.schemas import AnalyzeResponse
 
 logger = logging.getLogger(__name__)
@@ -12,15 +34,34 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/jpg"}
-ALLOWED_AUDIO_TYPES = {"audio/wav", "audio/x-wav", "audio/wave"}
+WAV_AUDIO_TYPES = {"audio/wav", "audio/x-wav", "audio/wave"}
+COMPRESSED_AUDIO_TYPES = {
+    "flac": {"audio/flac", "audio/x-flac"},
+    "opus": {"audio/ogg", "audio/opus"},
+}
+# Compressed uploads are accepted only when the linked libsndfile decodes them.
+ALLOWED_AUDIO_TYPES = WAV_AUDIO_TYPES.union(
+    *(COMPRESSED_AUDIO_TYPES[fmt] for fmt in compressed_formats())
+)
+ALLOWED_BINARY_TYPES = {BINARY_CONTENT_TYPE, "application/octet-stream"}
 
 
 @router.post("/analyze", response_model=AnalyzeResponse)
 async def analyze(
     frame: UploadFile = File(...),
     audio: UploadFile = File(...),
-) -> AnalyzeResponse:
-    """Accept an image frame and audio clip, return an emotion verdict."""
+    session_id: str | None = Header(None, alias="X-Session-Id"),
+) -> Response:
+    """Accept an image frame and audio clip, return an emotion verdict.
+
+    Under overload the request may be shed with 503 and ``Retry-After``;
+    see ``inference/admission.py``.
+    """
+    with IN_FLIGHT.track_inprogress(), ANALYZE_SECONDS.time():
+        return await _analyze(frame, audio, session_id)
+
+
+async def _analyze(frame: UploadFile, audio: UploadFile, session_id: str | None) -> Response:
     logger.info("Received /analyze request — frame=%s (%s), audio=%s (%s)",
                 frame.filename, frame.content_type, audio.filename, audio.content_type)
 
@@ -31,16 +72,20 @@ async def analyze(
             status_code=422,
             detail=f"Invalid content type for frame: {frame.content_type}. Expected image/jpeg.",
         )
-    if audio.content_type not in ALLOWED_AUDIO_TYPES:
+    if _media_type(audio.content_type) not in ALLOWED_AUDIO_TYPES:
         logger.warning("Rejected: invalid audio content_type=%s", audio.content_type)
         raise HTTPException(
             status_code=422,
-            detail=f"Invalid content type for audio: {audio.content_type}. Expected audio/wav.",
+            detail=(
+                f"Invalid content type for audio: {audio.content_type}. "
+                f"Expected one of {', '.join(sorted(ALLOWED_AUDIO_TYPES))}."
+            ),
         )
 
     # Read file bytes
-    image_bytes = await frame.read()
-    audio_bytes = await audio.read()
+    with time_stage("multipart_read"):
+        image_bytes = await frame.read()
+        audio_bytes = await audio.read()
     logger.info("Payload sizes — frame=%d bytes, audio=%d bytes", len(image_bytes), len(audio_bytes))
 
     if not image_bytes:
@@ -50,37 +95,108 @@ async def analyze(
         logger.warning("Rejected: audio file is empty")
         raise HTTPException(status_code=422, detail="Audio file is empty.")
 
-    loop = asyncio.get_event_loop()
+    speech_batcher = get_speech_batcher()
+    return await _respond(
+        image_bytes,
+        audio_bytes,
+        speech_batcher.submit if speech_batcher else analyze_speech,
+        session_id,
+    )
 
-    # Run ML inference in threadpool to avoid blocking the async event loop
-    try:
-        facial_result = await loop.run_in_executor(
-            None, partial(analyze_face, image_bytes)
-        )
-    except Exception:
-        logger.exception("Facial emotion analysis failed")
-        raise HTTPException(status_code=500, detail="Facial emotion analysis failed")
 
-    try:
-        speech_result = await loop.run_in_executor(
-            None, partial(analyze_speech, audio_bytes)
+@router.post("/analyze/binary", response_model=AnalyzeResponse)
+async def analyze_binary(
+    request: Request,
+    session_id: str | None = Header(None, alias="X-Session-Id"),
+) -> Response:
+    """Like /analyze, but the frame and raw PCM16 audio arrive in one binary body.
+
+    See ``inference/protocol.py`` for the layout.  The body is sliced in
+    place: no multipart parsing, temp files or WAV container.
+    """
+    with IN_FLIGHT.track_inprogress(), ANALYZE_SECONDS.time():
+        return await _analyze_binary(request, session_id)
+
+
+async def _analyze_binary(request: Request, session_id: str | None) -> Response:
+    content_type = _media_type(request.headers.get("content-type"))
+    if content_type not in ALLOWED_BINARY_TYPES:
+        logger.warning("Rejected: invalid binary content_type=%s", content_type)
+        raise HTTPException(
+            status_code=422,
+            detail=f"Invalid content type: {content_type}. Expected {BINARY_CONTENT_TYPE}.",
         )
-    except Exception:
-        logger.exception("Speech emotion analysis failed")
-        raise HTTPException(status_code=500, detail="Speech emotion analysis failed")
 
+    with time_stage("binary_read"):
+        body = await request.body()
+        try:
+            parsed = parse_request(body)
+        except ProtocolError as exc:
+            logger.warning("Rejected: %s", exc)
+            raise HTTPException(status_code=422, detail=str(exc))
+    logger.info("Received /analyze/binary request — frame=%d bytes, audio=%d samples @ %d Hz",
+                len(parsed.frame), len(parsed.samples), parsed.sample_rate)
+
+    if not len(parsed.frame):
+        raise HTTPException(status_code=422, detail="Frame is empty.")
+    if not parsed.samples.size:
+        raise HTTPException(status_code=422, detail="Audio is empty.")
+
+    frame = parsed.frame
+    if get_worker_pool().backend == "process":
+        frame = bytes(frame)  # memoryviews cannot be pickled to worker processes
+
+    speech_batcher = get_speech_batcher()
+    if speech_batcher:
+        speech_fn, audio = speech_batcher.submit, (parsed.samples, parsed.sample_rate)
+    else:
+        speech_fn = partial(analyze_speech_samples, sample_rate=parsed.sample_rate)
+        audio = parsed.samples
+    return await _respond(frame, audio, speech_fn, session_id)
+
+
+def _media_type(content_type: str | None) -> str:
+    """``audio/ogg; codecs=opus`` -> ``audio/ogg``."""
+    return (content_type or "").split(";")[0].strip().lower()
+
+
+async def _respond(image, audio, speech_fn, session_id: str | None) -> Response:
+    """Admit, run both modalities, fuse, update the session and serialize."""
+    settings = get_settings()
+    facial_batcher = get_facial_batcher()
+    face_fn = facial_batcher.submit if facial_batcher else analyze_face
+    profiler = get_profiler()
+    if profiler.sample_request():
+        face_fn, speech_fn = profiler.profiled(face_fn), profiler.profiled(speech_fn)
+
+    # Run both modalities concurrently on the worker pool; fusion runs inline.
     try:
-        verdict = await loop.run_in_executor(
-            None, partial(compute_verdict, facial_result, speech_result)
+        async with _admission(settings, session_id):
+            outcome = await run_inference(
+                image,
+                audio,
+                analyze_face=face_fn,
+                analyze_speech=speech_fn,
+                compute_verdict=compute_verdict,
+                settled_verdict=settled_verdict if settings.fusion.early_exit else None,
+                facial_timeout=settings.facial.timeout_seconds,
+                speech_timeout=settings.speech.timeout_seconds,
+                executor=get_worker_pool().executor,
+            )
+    except AdmissionRejected as exc:
+        REJECTED.labels(reason=exc.reason).inc()
+        raise HTTPException(
+            status_code=503,
+            detail=exc.detail,
+            headers={"Retry-After": str(math.ceil(exc.retry_after))},
         )
-    except Exception:
-        logger.exception("Score fusion failed")
-        raise HTTPException(status_code=500, detail="Score fusion failed")
+    except InferenceStageError as exc:
+        logger.exception("Inference failed at %s stage", exc.stage)
+        raise HTTPException(status_code=500, detail=exc.detail)
 
-    fused_score = (
-        facial_result.emotions.get("angry", 0.0) * 0.60
-        + speech_result.emotions.get("angry", 0.0) * 0.40
-    )
+    facial_result = outcome.facial
+    speech_result = outcome.speech
+    verdict = outcome.verdict
 
     logger.info("Analysis complete — verdict: %s | facial=%s dominant=%s | speech=%s dominant=%s | fused=%.3f",
                 verdict.value,
@@ -88,14 +204,22 @@ async def analyze(
                 facial_result.dominant,
                 {k: round(v, 3) for k, v in speech_result.emotions.items()},
                 speech_result.dominant,
-                fused_score)
+                outcome.fused_score)
+
+    smoothed = None
+    if session_id and settings.sessions.enabled:
+        store = get_session_store()
+        smoothed = store.smoothed_verdict(store.update(session_id, outcome))
+
+    with time_stage("serialization"):
+        body = AnalyzeResponse(
+            verdict=verdict, smoothed_verdict=smoothed, debug=outcome.debug_info()
+        ).model_dump_json(exclude_none=True)
+    return Response(content=body, media_type="application/json")
 
-    debug = {
-        "facial_emotions": {k: round(v, 3) for k, v in facial_result.emotions.items()},
-        "facial_dominant": facial_result.dominant,
-        "speech_emotions": {k: round(v, 3) for k, v in speech_result.emotions.items()},
-        "speech_dominant": speech_result.dominant,
-        "fused_score": round(fused_score, 3),
-    }
 
-    return AnalyzeResponse(verdict=verdict, debug=debug)
+def _admission(settings, session_id: str | None):
+    """The admission slot for this request, or a no-op when admission is off."""
+    if not settings.admission.enabled:
+        return contextlib.nullcontext()
+    return get_admission_controller().admit(session_id)
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import logging
+from functools import partial
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from config.settings import get_settings
+from inference import InferenceStageError, get_worker_pool, run_inference
+from inference.streaming import MSG_AUDIO, MSG_FRAME, StreamSession
+from models import SpeechWindow, analyze_face_gated, analyze_speech_window, compute_verdict
+from models.schemas import AnalyzeResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+async def _analyze_face(session: StreamSession, frame: bytes):
+    """Run the session's frame gate + face tracker on the worker pool.
+
+    The gate and tracker come back from the worker, so their state is kept
+    even when the pool is a process pool.
+    """
+    loop = asyncio.get_running_loop()
+    result, session.frame_gate, session.face_tracker = await loop.run_in_executor(
+        get_worker_pool().executor,
+        analyze_face_gated,
+        session.frame_gate,
+        session.face_tracker,
+        frame,
+    )
+    return result
+
+
+async def _emit_verdict(
+    websocket: WebSocket, session: StreamSession, frame: bytes, audio: SpeechWindow
+) -> None:
+    """Analyze a frame + audio window taken from the session and push the verdict."""
+    settings = get_settings()
+    try:
+        outcome = await run_inference(
+            frame,
+            audio,
+            analyze_face=partial(_analyze_face, session),
+            analyze_speech=analyze_speech_window,
+            compute_verdict=compute_verdict,
+            facial_timeout=settings.facial.timeout_seconds,
+            speech_timeout=settings.speech.timeout_seconds,
+            executor=get_worker_pool().executor,
+        )
+    except InferenceStageError as exc:
+        logger.exception("Stream inference failed at %s stage", exc.stage)
+        await websocket.send_json({"error": exc.detail})
+        return
+
+    response = AnalyzeResponse(verdict=outcome.verdict, debug=outcome.debug_info())
+    await websocket.send_json(response.model_dump(mode="json"))
+
+
+def _handle_control(session: StreamSession, text: str) -> None:
+    """Apply a JSON control message, e.g. {"type": "config", "sample_rate": 48000}."""
+    message = json.loads(text)
+    if not isinstance(message, dict) or message.get("type") != "config":
+        raise ValueError("Unknown control message")
+    if "sample_rate" in message:
+        rate = message["sample_rate"]
+        if isinstance(rate, bool) or not isinstance(rate, (int, float, str)):
+            raise ValueError(f"Invalid sample rate: {rate!r}")
+        try:
+            rate = int(rate)
+        except (ValueError, OverflowError):
+            raise ValueError(f"Invalid sample rate: {rate!r}") from None
+        session.set_sample_rate(rate)
+
+
+async def _handle_binary(session: StreamSession, data: bytes) -> None:
+    """Route a binary message to the session by its leading kind byte.
+
+    Audio chunks are resampled and featurized on a thread, off the event
+    loop; messages are handled one at a time, so pushes never overlap.
+    """
+    if len(data) < 2:
+        raise ValueError("Binary message too short")
+    kind, payload = data[0], data[1:]
+    if kind == MSG_FRAME:
+        session.add_frame(payload)
+    elif kind == MSG_AUDIO:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, session.add_audio, payload)
+    else:
+        raise ValueError(f"Unknown binary message kind: {kind:#04x}")
+
+
+@router.websocket("/ws/session")
+async def session_stream(websocket: WebSocket) -> None:
+    """Stream frames and PCM audio in; push verdicts out as they are computed.
+
+    Binary messages start with one kind byte: 0x01 + JPEG frame, or
+    0x02 + little-endian PCM16 mono audio.  A verdict is computed each time
+    ``stream.hop_seconds`` of new audio arrives (once a frame has been
+    seen), over the last ``stream.window_seconds`` of audio; fbank features
+    for the overlap are reused between windows.  If the previous verdict is
+    still being computed the hop is skipped.  Frames go through the
+    session's FrameGate and FaceTracker, so unchanged frames reuse the last
+    facial result and stable faces skip detection.
+    """
+    stream = get_settings().stream
+    await websocket.accept()
+    session = StreamSession(
+        sample_rate=stream.sample_rate,
+        window_seconds=stream.window_seconds,
+        hop_seconds=stream.hop_seconds,
+    )
+    logger.info("Stream session opened")
+    pending: asyncio.Task | None = None
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            try:
+                if message.get("bytes") is not None:
+                    await _handle_binary(session, message["bytes"])
+                elif message.get("text") is not None:
+                    _handle_control(session, message["text"])
+            except ValueError as exc:
+                logger.warning("Rejected stream message: %s", exc)
+                await websocket.send_json({"error": str(exc)})
+                continue
+
+            if session.due and (pending is None or pending.done()):
+                # Snapshot here, between pushes, rather than inside the task.
+                frame, audio = session.take_window()
+                pending = asyncio.create_task(_emit_verdict(websocket, session, frame, audio))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+        logger.info(
+            "Stream session closed — frame gate hit rate %.2f (%d/%d), face detections %d",
+            session.frame_gate.hit_rate,
+            session.frame_gate.hits,
+            session.frame_gate.hits + session.frame_gate.misses,
+            session.face_tracker.detections,
+        )
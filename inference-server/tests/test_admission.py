@@ -0,0 +1,152 @@
+"""Tests for /analyze admission control and load shedding."""
+
+import asyncio
+import io
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+import models.stubs as stubs
+from inference import AdmissionController, AdmissionRejected
+from main import app
+
+client = TestClient(app)
+
+
+# ─── Helpers ───
+
+
+async def _hold(controller: AdmissionController, release: asyncio.Event, session_id=None) -> str:
+    async with controller.admit(session_id):
+        await release.wait()
+    return "done"
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+# ─── AdmissionController ───
+
+
+class TestAdmissionController:
+    def test_admits_up_to_max_concurrent(self):
+        async def run():
+            controller = AdmissionController(max_concurrent=2, max_queue=0, max_queue_wait_ms=100)
+            release = asyncio.Event()
+            holders = [asyncio.create_task(_hold(controller, release)) for _ in range(2)]
+            await _settle()
+            assert controller.active == 2
+            with pytest.raises(AdmissionRejected) as exc:
+                async with controller.admit():
+                    pass
+            assert exc.value.reason == "queue_full"
+            release.set()
+            assert await asyncio.gather(*holders) == ["done", "done"]
+            assert controller.active == 0
+
+        asyncio.run(run())
+
+    def test_waiter_gets_released_slot_in_order(self):
+        async def run():
+            controller = AdmissionController(max_concurrent=1, max_queue=2, max_queue_wait_ms=1000)
+            order = []
+
+            async def job(name):
+                async with controller.admit():
+                    order.append(name)
+                    await asyncio.sleep(0.01)
+
+            await asyncio.gather(job("a"), job("b"), job("c"))
+            assert order == ["a", "b", "c"]
+            assert controller.active == 0 and controller.waiting == 0
+
+        asyncio.run(run())
+
+    def test_queue_wait_deadline(self):
+        async def run():
+            controller = AdmissionController(
+                max_concurrent=1, max_queue=4, max_queue_wait_ms=20, retry_after_seconds=2
+            )
+            release = asyncio.Event()
+            holder = asyncio.create_task(_hold(controller, release))
+            await _settle()
+            with pytest.raises(AdmissionRejected) as exc:
+                async with controller.admit():
+                    pass
+            assert exc.value.reason == "queue_timeout"
+            assert exc.value.retry_after == 2
+            assert controller.waiting == 0
+            release.set()
+            await holder
+            assert controller.active == 0
+
+        asyncio.run(run())
+
+    def test_newer_frame_supersedes_waiting_one_from_same_session(self):
+        async def run():
+            controller = AdmissionController(max_concurrent=1, max_queue=1, max_queue_wait_ms=1000)
+            release = asyncio.Event()
+            holder = asyncio.create_task(_hold(controller, release))
+            await _settle()
+            old = asyncio.create_task(_hold(controller, release, "s1"))
+            await _settle()
+            new = asyncio.create_task(_hold(controller, release, "s1"))
+            await _settle()
+
+            assert controller.waiting == 1
+            with pytest.raises(AdmissionRejected) as exc:
+                await old
+            assert exc.value.reason == "superseded"
+            release.set()
+            assert await new == "done"
+            await holder
+            assert controller.rejected["superseded"] == 1
+            assert controller.active == 0
+
+        asyncio.run(run())
+
+    def test_cancelled_waiter_frees_its_place(self):
+        async def run():
+            controller = AdmissionController(max_concurrent=1, max_queue=1, max_queue_wait_ms=1000)
+            release = asyncio.Event()
+            holder = asyncio.create_task(_hold(controller, release))
+            await _settle()
+            waiter = asyncio.create_task(_hold(controller, release))
+            await _settle()
+            waiter.cancel()
+            await _settle()
+            assert controller.waiting == 0
+            release.set()
+            await holder
+            assert controller.active == 0
+
+        asyncio.run(run())
+
+
+# ─── POST /analyze ───
+
+
+class TestAnalyzeShedding:
+    def test_rejection_returns_503_with_retry_after(self):
+        files = {
+            "frame": ("frame.jpg", io.BytesIO(b"\xff\xd8\xff\xe0" + b"\x00" * 100), "image/jpeg"),
+            "audio": ("audio.wav", io.BytesIO(b"RIFF" + b"\x00" * 100), "audio/wav"),
+        }
+        saturated = AdmissionController(
+            max_concurrent=1, max_queue=0, max_queue_wait_ms=0, retry_after_seconds=1.5
+        )
+        saturated.active = 1
+        with (
+            patch("routes.analyze.get_admission_controller", return_value=saturated),
+            patch("routes.analyze.analyze_face", stubs.analyze_face),
+            patch("routes.analyze.analyze_speech", stubs.analyze_speech),
+        ):
+            resp = client.post("/analyze", files=files, headers={"X-Session-Id": "s1"})
+
+        assert resp.status_code == 503
+        assert resp.headers["retry-after"] == "2"
+        assert "saturated" in resp.json()["detail"]
+        assert saturated.rejected["queue_full"] == 1
@@ -6,6 +6,7 @@ from unittest.mock import patch
 import pytest
 from fastapi.testclient import TestClient
 
+from eq_models.audio import compressed_formats
 from main import app
 from models.schemas import FacialEmotionResult, SpeechEmotionResult, Verdict
 
@@ -66,6 +67,21 @@ class TestAnalyzeValidation:
         assert resp.status_code == 422
         assert "audio" in resp.json()["detail"].lower()
 
+    @pytest.mark.parametrize(
+        "audio_format, audio_type",
+        [("flac", "audio/flac"), ("opus", "audio/ogg; codecs=opus"), ("opus", "audio/opus")],
+    )
+    def test_compressed_audio_content_types_accepted(self, audio_format, audio_type):
+        if audio_format not in compressed_formats():
+            pytest.skip(f"libsndfile here cannot decode {audio_format}")
+        payload = b"fLaC" + b"\x00" * 100
+        with patch("routes.analyze.analyze_speech", return_value=SpeechEmotionResult(
+            emotions={"neutral": 1.0}, dominant="neutral", is_concerning=False
+        )) as mock_speech:
+            resp = _post_analyze(frame=FAKE_JPEG, audio=payload, audio_type=audio_type)
+        assert resp.status_code == 200
+        mock_speech.assert_called_once_with(payload)
+
     def test_empty_frame_returns_422(self):
         resp = _post_analyze(frame=b"", audio=FAKE_WAV)
         assert resp.status_code == 422
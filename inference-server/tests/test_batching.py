@@ -0,0 +1,109 @@
+"""Tests for the request-coalescing micro-batcher."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from config.settings import Settings
+from inference import MicroBatcher, get_facial_batcher, get_speech_batcher
+
+
+class _Recorder:
+    """Batch function that records each batch it receives."""
+
+    def __init__(self):
+        self.batches: list[list[int]] = []
+
+    def __call__(self, items: list[int]) -> list[int]:
+        self.batches.append(list(items))
+        return [item * 10 for item in items]
+
+
+async def _submit_all(batcher: MicroBatcher, items: list[int]) -> list[int]:
+    return await asyncio.gather(*(batcher.submit(i) for i in items))
+
+
+class TestMicroBatcher:
+    def test_concurrent_items_share_one_batch(self):
+        fn = _Recorder()
+        batcher = MicroBatcher(fn, max_batch_size=8, max_wait_ms=20)
+        results = asyncio.run(_submit_all(batcher, [1, 2, 3]))
+        assert results == [10, 20, 30]
+        assert fn.batches == [[1, 2, 3]]
+
+    def test_full_batch_flushes_without_waiting(self):
+        fn = _Recorder()
+        batcher = MicroBatcher(fn, max_batch_size=2, max_wait_ms=10_000)
+
+        async def run():
+            return await asyncio.wait_for(_submit_all(batcher, [1, 2, 3, 4]), timeout=1.0)
+
+        assert asyncio.run(run()) == [10, 20, 30, 40]
+        assert fn.batches == [[1, 2], [3, 4]]
+
+    def test_lone_item_flushes_after_max_wait(self):
+        fn = _Recorder()
+        batcher = MicroBatcher(fn, max_batch_size=8, max_wait_ms=5)
+        assert asyncio.run(batcher.submit(7)) == 70
+        assert fn.batches == [[7]]
+
+    def test_batch_failure_propagates_to_every_item(self):
+        def boom(items):
+            raise RuntimeError("model crash")
+
+        batcher = MicroBatcher(boom, max_batch_size=4, max_wait_ms=5)
+
+        async def run():
+            return await asyncio.gather(
+                batcher.submit(1), batcher.submit(2), return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    def test_abandoned_items_are_skipped(self):
+        fn = _Recorder()
+        batcher = MicroBatcher(fn, max_batch_size=8, max_wait_ms=50)
+
+        async def run():
+            abandoned = asyncio.ensure_future(batcher.submit(1))
+            await asyncio.sleep(0)
+            abandoned.cancel()
+            return await batcher.submit(2)
+
+        assert asyncio.run(run()) == 20
+        assert fn.batches == [[2]]
+
+    def test_counters(self):
+        fn = _Recorder()
+        batcher = MicroBatcher(fn, max_batch_size=2, max_wait_ms=5)
+        asyncio.run(_submit_all(batcher, [1, 2, 3]))
+        assert batcher.batches_run == 2
+        assert batcher.items_run == 3
+
+    def test_result_count_mismatch_is_an_error(self):
+        batcher = MicroBatcher(lambda items: [], max_batch_size=1, max_wait_ms=0)
+        with pytest.raises(RuntimeError):
+            asyncio.run(batcher.submit(1))
+
+
+class TestBatcherFactories:
+    def teardown_method(self):
+        get_facial_batcher.cache_clear()
+        get_speech_batcher.cache_clear()
+
+    def test_disabled_by_default(self):
+        get_facial_batcher.cache_clear()
+        get_speech_batcher.cache_clear()
+        assert get_facial_batcher() is None
+        assert get_speech_batcher() is None
+
+    def test_speech_batcher_built_from_speech_section(self):
+        settings = Settings(speech={"batch_max_size": 8, "batch_max_wait_ms": 15})
+        with patch("inference.batching.get_settings", return_value=settings):
+            get_speech_batcher.cache_clear()
+            batcher = get_speech_batcher()
+        assert batcher.max_batch_size == 8
+        assert batcher.max_wait == pytest.approx(0.015)
+        assert batcher.name == "speech"
@@ -30,6 +30,12 @@ class TestConfigDefaults:
         assert s.fusion.green_threshold == 0.25
         assert s.fusion.red_threshold == 0.50
 
+    def test_workers_default(self):
+        s = Settings()
+        assert s.workers.num_workers == 4
+        assert s.workers.warmup is True
+        assert s.workers.backend == "thread"
+
 
 class TestConfigOverrides:
     def test_override_server_port(self):
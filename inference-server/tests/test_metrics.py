@@ -0,0 +1,112 @@
+"""Tests for the Prometheus metrics subsystem and GET /metrics."""
+
+import io
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+import models.stubs as stubs
+from eq_models.timing import stage
+from inference import ModelWorkerPool, SessionStore
+from inference.metrics import REGISTRY
+from main import app
+
+client = TestClient(app)
+
+
+def _stage_count(name: str) -> float:
+    return REGISTRY.get_sample_value("eq_stage_duration_seconds_count", {"stage": name}) or 0.0
+
+
+def _post_analyze():
+    files = {
+        "frame": ("frame.jpg", io.BytesIO(b"\xff\xd8\xff\xe0" + b"\x00" * 100), "image/jpeg"),
+        "audio": ("audio.wav", io.BytesIO(b"RIFF" + b"\x00" * 100), "audio/wav"),
+    }
+    with (
+        patch("routes.analyze.analyze_face", stubs.analyze_face),
+        patch("routes.analyze.analyze_speech", stubs.analyze_speech),
+        patch("routes.analyze.compute_verdict", stubs.compute_verdict),
+    ):
+        return client.post("/analyze", files=files)
+
+
+class TestMetricsEndpoint:
+    def test_prometheus_text_format(self):
+        resp = client.get("/metrics")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain")
+        for name in (
+            "eq_stage_duration_seconds",
+            "eq_analyze_duration_seconds",
+            "eq_analyze_in_flight_requests",
+            "eq_executor_queue_depth",
+            "eq_admission_waiting_requests",
+            "eq_analyze_rejected",
+        ):
+            assert f"# TYPE {name}" in resp.text
+
+
+class TestAnalyzeInstrumentation:
+    def test_route_stages_recorded(self):
+        before = {s: _stage_count(s) for s in ("multipart_read", "fusion", "serialization")}
+        total_before = REGISTRY.get_sample_value("eq_analyze_duration_seconds_count") or 0.0
+
+        assert _post_analyze().status_code == 200
+
+        for name, count in before.items():
+            assert _stage_count(name) == count + 1
+        assert REGISTRY.get_sample_value("eq_analyze_duration_seconds_count") == total_before + 1
+        assert REGISTRY.get_sample_value("eq_analyze_in_flight_requests") == 0
+
+    def test_response_body_unchanged(self):
+        resp = _post_analyze()
+        assert resp.headers["content-type"] == "application/json"
+        assert resp.json()["verdict"] == "GREEN"
+
+    def test_eq_models_stages_feed_the_histogram(self):
+        before = _stage_count("emotion_cnn")
+        with stage("emotion_cnn"):
+            pass
+        assert _stage_count("emotion_cnn") == before + 1
+
+
+class TestQueueDepth:
+    def test_idle_thread_pool_has_empty_queue(self):
+        pool = ModelWorkerPool(num_workers=1)
+        try:
+            assert pool.queue_depth == 0
+        finally:
+            pool.shutdown()
+
+    def test_counts_tasks_waiting_for_a_worker(self):
+        import threading
+
+        pool = ModelWorkerPool(num_workers=1)
+        started, release = threading.Event(), threading.Event()
+
+        def block() -> None:
+            started.set()
+            release.wait()
+
+        try:
+            pool.executor.submit(block)
+            started.wait()
+            pool.executor.submit(lambda: None)
+            pool.executor.submit(lambda: None)
+            assert pool.queue_depth == 2
+        finally:
+            release.set()
+            pool.shutdown()
+
+
+class TestSessionEvictions:
+    def test_exposed_as_counter_from_store(self):
+        store = SessionStore(max_sessions=1, idle_seconds=60.0, ewma_alpha=0.5)
+        store.evicted["capacity"] = 3
+        with patch("inference.metrics.get_session_store", return_value=store):
+            text = client.get("/metrics").text
+            value = REGISTRY.get_sample_value("eq_session_evictions_total", {"reason": "capacity"})
+        assert "counter" in [line.split()[-1] for line in text.splitlines()
+                             if line.startswith("# TYPE eq_session_evictions")]
+        assert value == 3
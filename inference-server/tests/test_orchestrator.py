@@ -0,0 +1,202 @@
+"""Tests for the concurrent inference orchestrator."""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from inference import InferenceStageError, run_inference
+from inference.orchestrator import InferenceOutcome
+from models import fused_score
+from models.schemas import FacialEmotionResult, SpeechEmotionResult, Verdict
+
+
+def _facial(angry: float = 0.0) -> FacialEmotionResult:
+    return FacialEmotionResult(emotions={"angry": angry}, dominant="angry", is_concerning=False)
+
+
+def _speech(angry: float = 0.0) -> SpeechEmotionResult:
+    return SpeechEmotionResult(emotions={"angry": angry}, dominant="angry", is_concerning=False)
+
+
+def _slow(result, delay: float):
+    def fn(_payload):
+        time.sleep(delay)
+        return result
+    return fn
+
+
+def _raise(_payload):
+    raise RuntimeError("model crash")
+
+
+def _run(**kwargs):
+    kwargs.setdefault("analyze_face", lambda b: _facial())
+    kwargs.setdefault("analyze_speech", lambda b: _speech())
+    kwargs.setdefault("compute_verdict", lambda f, s: Verdict.GREEN)
+    return asyncio.run(run_inference(b"frame", b"audio", **kwargs))
+
+
+class TestConcurrency:
+    def test_modalities_run_in_parallel(self):
+        start = time.perf_counter()
+        _run(analyze_face=_slow(_facial(), 0.3), analyze_speech=_slow(_speech(), 0.3))
+        elapsed = time.perf_counter() - start
+        assert elapsed < 0.5
+
+    def test_results_are_passed_to_fusion(self):
+        seen = {}
+
+        def fuse(f, s):
+            seen["facial"], seen["speech"] = f, s
+            return Verdict.RED
+
+        outcome = _run(
+            analyze_face=lambda b: _facial(0.9),
+            analyze_speech=lambda b: _speech(0.8),
+            compute_verdict=fuse,
+        )
+        assert outcome.verdict == Verdict.RED
+        assert seen["facial"].emotions["angry"] == 0.9
+        assert seen["speech"].emotions["angry"] == 0.8
+
+
+    def test_coroutine_functions_are_awaited_directly(self):
+        async def face(payload):
+            return _facial(0.5)
+
+        outcome = _run(analyze_face=face)
+        assert outcome.facial.emotions["angry"] == 0.5
+
+
+class TestTimeouts:
+    def test_slow_speech_falls_back_to_neutral(self):
+        outcome = _run(analyze_speech=_slow(_speech(0.9), 0.5), speech_timeout=0.05)
+        assert outcome.speech_timed_out is True
+        assert outcome.facial_timed_out is False
+        assert outcome.speech.dominant == "neutral"
+
+    def test_slow_face_falls_back_to_neutral(self):
+        outcome = _run(analyze_face=_slow(_facial(0.9), 0.5), facial_timeout=0.05)
+        assert outcome.facial_timed_out is True
+        assert outcome.facial.dominant == "neutral"
+
+    def test_no_timeout_waits_for_result(self):
+        outcome = _run(analyze_speech=_slow(_speech(0.9), 0.1), speech_timeout=None)
+        assert outcome.speech_timed_out is False
+        assert outcome.speech.emotions["angry"] == 0.9
+
+
+class TestStageErrors:
+    @pytest.mark.parametrize("kwarg,stage", [
+        ("analyze_face", "facial"),
+        ("analyze_speech", "speech"),
+    ])
+    def test_modality_failure_reports_stage(self, kwarg, stage):
+        with pytest.raises(InferenceStageError) as exc_info:
+            _run(**{kwarg: _raise})
+        assert exc_info.value.stage == stage
+
+    def test_fusion_failure_reports_stage(self):
+        def fuse(f, s):
+            raise RuntimeError("fusion crash")
+
+        with pytest.raises(InferenceStageError) as exc_info:
+            _run(compute_verdict=fuse)
+        assert exc_info.value.stage == "fusion"
+
+
+class TestEarlyExit:
+    @staticmethod
+    def _settle_on_angry_face(f, s):
+        if f is not None and f.emotions.get("angry", 0.0) > 0.8:
+            return Verdict.RED
+        return None
+
+    def test_settled_face_skips_slow_speech(self):
+        calls = []
+
+        def fuse(f, s):
+            calls.append((f, s))
+            return Verdict.GREEN
+
+        # A private executor not waited on at shutdown: asyncio.run would
+        # otherwise block on the default executor's still-running speech call.
+        executor = ThreadPoolExecutor(max_workers=2)
+        try:
+            start = time.perf_counter()
+            outcome = _run(
+                analyze_face=lambda b: _facial(0.9),
+                analyze_speech=_slow(_speech(), 0.5),
+                compute_verdict=fuse,
+                settled_verdict=self._settle_on_angry_face,
+                executor=executor,
+            )
+            elapsed = time.perf_counter() - start
+        finally:
+            executor.shutdown(wait=False)
+        assert elapsed < 0.4
+        assert outcome.verdict == Verdict.RED
+        assert outcome.speech_skipped is True and outcome.facial_skipped is False
+        assert outcome.speech.dominant == "neutral"
+        assert outcome.debug_info()["speech_skipped"] is True
+        assert calls == []
+
+    def test_queued_speech_never_runs(self):
+        async def run():
+            loop = asyncio.get_running_loop()
+            ran = []
+            with ThreadPoolExecutor(max_workers=1) as executor:
+
+                async def face(payload):
+                    return _facial(0.9)
+
+                def speech(payload):
+                    ran.append(payload)
+                    return _speech()
+
+                # Occupy the only worker so speech stays queued.
+                busy = loop.run_in_executor(executor, time.sleep, 0.1)
+                outcome = await run_inference(
+                    b"frame",
+                    b"audio",
+                    analyze_face=face,
+                    analyze_speech=speech,
+                    compute_verdict=lambda f, s: Verdict.GREEN,
+                    settled_verdict=self._settle_on_angry_face,
+                    executor=executor,
+                )
+                await busy
+            return outcome, ran
+
+        outcome, ran = asyncio.run(run())
+        assert outcome.speech_skipped is True
+        assert ran == []
+
+    def test_open_verdict_waits_for_both(self):
+        outcome = _run(
+            analyze_face=lambda b: _facial(0.1),
+            analyze_speech=_slow(_speech(0.7), 0.05),
+            compute_verdict=lambda f, s: Verdict.YELLOW,
+            settled_verdict=self._settle_on_angry_face,
+        )
+        assert outcome.verdict == Verdict.YELLOW
+        assert not outcome.facial_skipped and not outcome.speech_skipped
+        assert outcome.speech.emotions["angry"] == 0.7
+
+    def test_failed_first_modality_still_reports_error(self):
+        with pytest.raises(InferenceStageError) as exc:
+            _run(
+                analyze_face=_raise,
+                analyze_speech=_slow(_speech(), 0.05),
+                settled_verdict=self._settle_on_angry_face,
+            )
+        assert exc.value.stage == "facial"
+
+
+class TestOutcome:
+    def test_fused_score_matches_fusion_weights(self):
+        facial, speech = _facial(1.0), _speech(0.5)
+        outcome = InferenceOutcome(facial=facial, speech=speech, verdict=Verdict.RED)
+        assert outcome.fused_score == pytest.approx(fused_score(facial, speech))
@@ -0,0 +1,152 @@
+"""Tests for the runtime profiler and the /admin/profile toggles."""
+
+import pstats
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from inference.profiling import Profiler
+from routes.admin import router as admin_router
+
+
+def _busy(n: int = 20000) -> int:
+    return sum(i * i for i in range(n))
+
+
+# ─── Profiler ───
+
+
+class TestSampling:
+    def test_dumps_collapsed_stacks(self, tmp_path):
+        profiler = Profiler(tmp_path)
+        profiler.start_sampling(interval_ms=1)
+        deadline = time.monotonic() + 0.2
+        while time.monotonic() < deadline:
+            _busy()
+        path = profiler.stop()
+
+        assert path.suffix == ".folded" and path.parent == tmp_path
+        lines = path.read_text().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) >= 1
+        assert any("_busy" in line for line in lines)
+        assert profiler.mode is None and profiler.last_dump == path
+
+    def test_duration_stops_automatically(self, tmp_path):
+        profiler = Profiler(tmp_path)
+        profiler.start_sampling(interval_ms=1, duration_s=0.05)
+        deadline = time.monotonic() + 2
+        while profiler.last_dump is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert profiler.mode is None
+        assert profiler.last_dump is not None and profiler.last_dump.exists()
+
+    def test_stop_waits_for_the_sampler(self, tmp_path):
+        profiler = Profiler(tmp_path)
+        profiler.start_sampling(interval_ms=1)
+        sampler = profiler._sampler
+        time.sleep(0.02)
+        path = profiler.stop()
+
+        assert not sampler.is_alive()
+        dumped = sum(int(line.rsplit(" ", 1)[1]) for line in path.read_text().splitlines())
+        assert dumped == sum(sampler.counts.values())
+
+    def test_one_mode_at_a_time(self, tmp_path):
+        profiler = Profiler(tmp_path)
+        profiler.start_sampling(interval_ms=5)
+        try:
+            with pytest.raises(RuntimeError):
+                profiler.start_requests(0.5)
+        finally:
+            profiler.stop()
+
+
+class TestRequestProfiling:
+    def test_merges_profiled_calls_into_pstats(self, tmp_path):
+        profiler = Profiler(tmp_path)
+        profiler.start_requests(1.0)
+        assert profiler.sample_request()
+        wrapped = profiler.profiled(_busy)
+        assert wrapped(100) == _busy(100)
+        wrapped(100)
+        path = profiler.stop()
+
+        assert path.suffix == ".pstats"
+        assert profiler.status()["calls_profiled"] == 2
+        stats = pstats.Stats(str(path))
+        assert any(func[2] == "_busy" for func in stats.stats)
+
+    def test_idle_profiler_samples_nothing(self, tmp_path):
+        profiler = Profiler(tmp_path)
+        assert not profiler.sample_request()
+        assert profiler.stop() is None
+        assert not list(tmp_path.iterdir())
+
+    def test_coroutine_callables_left_alone(self, tmp_path):
+        async def submit(data):
+            return data
+
+        assert Profiler(tmp_path).profiled(submit) is submit
+
+    def test_rejected_without_thread_backend(self, tmp_path):
+        with pytest.raises(ValueError):
+            Profiler(tmp_path, allow_requests=False).start_requests(0.5)
+
+    @pytest.mark.parametrize("fraction", [0.0, 1.5])
+    def test_fraction_bounds(self, tmp_path, fraction):
+        with pytest.raises(ValueError):
+            Profiler(tmp_path).start_requests(fraction)
+
+
+# ─── /admin/profile ───
+
+
+@pytest.fixture
+def admin(tmp_path):
+    app = FastAPI()
+    app.include_router(admin_router)
+    profiler = Profiler(tmp_path)
+    with patch("routes.admin.get_profiler", return_value=profiler):
+        yield TestClient(app), profiler
+    if profiler.mode is not None:
+        profiler.stop()
+
+
+class TestAdminEndpoints:
+    def test_sampling_round_trip(self, admin):
+        client, _ = admin
+        assert client.get("/admin/profile").json()["mode"] is None
+
+        resp = client.post("/admin/profile", json={"mode": "sampling", "interval_ms": 2})
+        assert resp.status_code == 200
+        assert resp.json()["mode"] == "sampling"
+        assert client.post("/admin/profile", json={"mode": "sampling"}).status_code == 409
+
+        resp = client.delete("/admin/profile")
+        assert resp.status_code == 200
+        assert resp.json()["mode"] is None
+        assert resp.json()["last_dump"].endswith(".folded")
+
+    def test_requests_mode_uses_fraction(self, admin):
+        client, profiler = admin
+        resp = client.post("/admin/profile", json={"mode": "requests", "fraction": 0.25})
+        assert resp.status_code == 200
+        assert profiler.fraction == 0.25
+
+    def test_bad_fraction_is_400(self, admin):
+        client, _ = admin
+        assert client.post("/admin/profile", json={"mode": "requests", "fraction": 2}).status_code == 400
+
+    def test_stop_when_idle_is_409(self, admin):
+        client, _ = admin
+        assert client.delete("/admin/profile").status_code == 409
+
+    def test_not_mounted_by_default(self):
+        from main import app
+
+        assert all(getattr(r, "path", "") != "/admin/profile" for r in app.routes)
@@ -0,0 +1,134 @@
+"""Tests for the binary request protocol and POST /analyze/binary."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from inference.protocol import (
+    CONTENT_TYPE,
+    HEADER,
+    ProtocolError,
+    encode_request,
+    parse_request,
+)
+from main import app
+from models.schemas import SpeechEmotionResult
+
+client = TestClient(app)
+
+FAKE_JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 100
+
+
+def _pcm(n: int = 16000, channels: int = 1, value: int = 1000) -> bytes:
+    return np.full(n * channels, value, dtype="<i2").tobytes()
+
+
+def _post(body: bytes, content_type: str = CONTENT_TYPE):
+    return client.post("/analyze/binary", content=body, headers={"Content-Type": content_type})
+
+
+# ── parse_request ───────────────────────────────────────────────
+
+
+class TestParseRequest:
+    def test_round_trip(self):
+        pcm = np.arange(-8, 8, dtype="<i2")
+        parsed = parse_request(encode_request(FAKE_JPEG, pcm.tobytes(), 48000, channels=2))
+
+        assert bytes(parsed.frame) == FAKE_JPEG
+        assert parsed.sample_rate == 48000
+        assert parsed.samples.shape == (8, 2)
+        np.testing.assert_array_equal(parsed.samples.reshape(-1), pcm)
+
+    def test_views_share_the_body(self):
+        body = encode_request(FAKE_JPEG, _pcm(100), 16000)
+        parsed = parse_request(body)
+
+        assert parsed.frame.obj is body
+        assert np.shares_memory(parsed.samples, np.frombuffer(body, dtype=np.uint8))
+
+    def test_short_body_rejected(self):
+        with pytest.raises(ProtocolError, match="shorter"):
+            parse_request(b"EQA1")
+
+    def test_bad_magic_rejected(self):
+        body = b"XXXX" + encode_request(FAKE_JPEG, _pcm(10), 16000)[4:]
+        with pytest.raises(ProtocolError, match="magic"):
+            parse_request(body)
+
+    def test_unknown_version_rejected(self):
+        body = bytearray(encode_request(FAKE_JPEG, _pcm(10), 16000))
+        body[4] = 2
+        with pytest.raises(ProtocolError, match="version"):
+            parse_request(bytes(body))
+
+    def test_zero_sample_rate_rejected(self):
+        with pytest.raises(ProtocolError, match="sample_rate"):
+            parse_request(encode_request(FAKE_JPEG, _pcm(10), 0))
+
+    def test_length_mismatch_rejected(self):
+        body = encode_request(FAKE_JPEG, _pcm(10), 16000)
+        with pytest.raises(ProtocolError, match="Length mismatch"):
+            parse_request(body[:-2])
+
+    def test_partial_frame_rejected(self):
+        with pytest.raises(ProtocolError, match="whole number"):
+            parse_request(encode_request(FAKE_JPEG, b"\x00" * 6, 16000, channels=2))
+
+    def test_header_is_20_bytes(self):
+        assert HEADER.size == 20
+
+
+# ── POST /analyze/binary ────────────────────────────────────────
+
+
+class TestAnalyzeBinary:
+    def test_returns_verdict(self):
+        resp = _post(encode_request(FAKE_JPEG, _pcm(), 16000))
+        assert resp.status_code == 200
+        assert resp.json()["verdict"] == "GREEN"
+
+    def test_octet_stream_accepted(self):
+        resp = _post(encode_request(FAKE_JPEG, _pcm(), 16000), "application/octet-stream")
+        assert resp.status_code == 200
+
+    def test_wrong_content_type_returns_422(self):
+        resp = _post(encode_request(FAKE_JPEG, _pcm(), 16000), "multipart/form-data")
+        assert resp.status_code == 422
+
+    def test_malformed_body_returns_422(self):
+        resp = _post(b"garbage")
+        assert resp.status_code == 422
+        assert "shorter" in resp.json()["detail"]
+
+    def test_empty_frame_returns_422(self):
+        resp = _post(encode_request(b"", _pcm(), 16000))
+        assert resp.status_code == 422
+
+    def test_empty_audio_returns_422(self):
+        resp = _post(encode_request(FAKE_JPEG, b"", 16000))
+        assert resp.status_code == 422
+
+    def test_samples_reach_speech_model_without_wav(self):
+        seen = {}
+
+        def speech(samples, sample_rate):
+            seen["samples"], seen["rate"] = samples, sample_rate
+            return SpeechEmotionResult(emotions={}, dominant="neutral", is_concerning=False)
+
+        with patch("routes.analyze.analyze_speech_samples", side_effect=speech), \
+             patch("routes.analyze.analyze_speech") as wav_path:
+            resp = _post(encode_request(FAKE_JPEG, _pcm(800, channels=2), 8000, channels=2))
+
+        assert resp.status_code == 200
+        wav_path.assert_not_called()
+        assert seen["rate"] == 8000
+        assert seen["samples"].dtype == np.int16
+        assert seen["samples"].shape == (800, 2)
+
+    def test_facial_failure_returns_500(self):
+        with patch("routes.analyze.analyze_face", side_effect=RuntimeError("model crash")):
+            resp = _post(encode_request(FAKE_JPEG, _pcm(), 16000))
+        assert resp.status_code == 500
@@ -0,0 +1,199 @@
+"""Tests for the /ws/session streaming endpoint and StreamSession buffer."""
+
+import asyncio
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from inference.streaming import MSG_AUDIO, MSG_FRAME, StreamSession
+from main import app
+from models.schemas import FacialEmotionResult, SpeechEmotionResult, Verdict
+
+client = TestClient(app)
+
+FAKE_JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 100
+
+
+def _pcm(seconds: float, sample_rate: int = 16000, value: int = 1000) -> bytes:
+    return np.full(int(seconds * sample_rate), value, dtype="<i2").tobytes()
+
+
+def _facial(*_, **__):
+    return FacialEmotionResult(emotions={"angry": 0.9}, dominant="angry", is_concerning=True)
+
+
+def _gated(gate, tracker, frame):
+    return _facial(), gate, tracker
+
+
+def _speech(*_, **__):
+    return SpeechEmotionResult(emotions={"angry": 0.8}, dominant="angry", is_concerning=True)
+
+
+# ── StreamSession ───────────────────────────────────────────────
+
+
+class TestStreamSession:
+    def test_not_due_without_frame(self):
+        session = StreamSession(sample_rate=16000, window_seconds=4.0, hop_seconds=1.0)
+        session.add_audio(_pcm(2.0))
+        assert session.due is False
+
+    def test_due_after_one_hop_of_audio(self):
+        session = StreamSession(sample_rate=16000, window_seconds=4.0, hop_seconds=1.0)
+        session.add_frame(FAKE_JPEG)
+        session.add_audio(_pcm(0.5))
+        assert session.due is False
+        session.add_audio(_pcm(0.5))
+        assert session.due is True
+        session.take_window()
+        assert session.due is False
+
+    def test_window_contains_pcm_as_float(self):
+        session = StreamSession(sample_rate=16000, window_seconds=1.0, hop_seconds=0.25)
+        session.add_frame(FAKE_JPEG)
+        session.add_audio(_pcm(2.0, value=16384))
+        frame, window = session.take_window()
+        assert frame == FAKE_JPEG
+        assert len(window.audio) == 16000
+        np.testing.assert_allclose(window.audio, 0.5)
+
+    def test_odd_length_chunk_rejected(self):
+        session = StreamSession(sample_rate=16000, window_seconds=4.0, hop_seconds=1.0)
+        with pytest.raises(ValueError):
+            session.add_audio(b"\x00\x01\x02")
+
+    def test_set_sample_rate_resets_audio(self):
+        session = StreamSession(sample_rate=16000, window_seconds=4.0, hop_seconds=1.0)
+        session.add_audio(_pcm(1.0))
+        session.set_sample_rate(48000)
+        assert session.sample_rate == 48000
+        assert session.speech.due is False
+
+    def test_invalid_sample_rate_rejected(self):
+        session = StreamSession(sample_rate=16000, window_seconds=4.0, hop_seconds=1.0)
+        with pytest.raises(ValueError):
+            session.set_sample_rate(0)
+
+    @pytest.mark.parametrize("rate", [1, 4000, 10**7])
+    def test_out_of_range_sample_rate_rejected(self, rate):
+        session = StreamSession(sample_rate=16000, window_seconds=4.0, hop_seconds=1.0)
+        with pytest.raises(ValueError, match="sample rate"):
+            session.set_sample_rate(rate)
+        assert session.sample_rate == 16000
+
+
+# ── /ws/session ─────────────────────────────────────────────────
+
+
+class TestSessionWebSocket:
+    def test_streams_verdict_after_one_hop(self):
+        with patch("routes.session.analyze_face_gated", side_effect=_gated), \
+             patch("routes.session.analyze_speech_window", side_effect=_speech), \
+             patch("routes.session.compute_verdict", return_value=Verdict.RED):
+            with client.websocket_connect("/ws/session") as ws:
+                ws.send_bytes(bytes([MSG_FRAME]) + FAKE_JPEG)
+                ws.send_bytes(bytes([MSG_AUDIO]) + _pcm(1.0))
+                message = ws.receive_json()
+
+        assert message["verdict"] == "RED"
+        assert message["debug"]["facial_dominant"] == "angry"
+
+    def test_speech_window_is_resampled_to_model_rate(self):
+        seen = {}
+
+        def speech(window):
+            seen["len"] = len(window.audio)
+            return _speech()
+
+        with patch("routes.session.analyze_face_gated", side_effect=_gated), \
+             patch("routes.session.analyze_speech_window", side_effect=speech), \
+             patch("routes.session.compute_verdict", return_value=Verdict.GREEN):
+            with client.websocket_connect("/ws/session") as ws:
+                ws.send_text('{"type": "config", "sample_rate": 8000}')
+                ws.send_bytes(bytes([MSG_FRAME]) + FAKE_JPEG)
+                ws.send_bytes(bytes([MSG_AUDIO]) + _pcm(1.0, 8000))
+                ws.receive_json()
+
+        assert seen["len"] == pytest.approx(16000, abs=2)
+
+    def test_unknown_message_kind_reports_error(self):
+        with client.websocket_connect("/ws/session") as ws:
+            ws.send_bytes(b"\x7f\x00\x00")
+            assert "unknown" in ws.receive_json()["error"].lower()
+
+    def test_invalid_control_message_reports_error(self):
+        with client.websocket_connect("/ws/session") as ws:
+            ws.send_text('{"type": "dance"}')
+            assert "error" in ws.receive_json()
+
+    @pytest.mark.parametrize("rate", ["null", "[16000]", '{"hz": 16000}', "true", '"fast"', "Infinity"])
+    def test_malformed_sample_rate_reported_without_closing(self, rate):
+        with client.websocket_connect("/ws/session") as ws:
+            ws.send_text(f'{{"type": "config", "sample_rate": {rate}}}')
+            assert "sample rate" in ws.receive_json()["error"].lower()
+            ws.send_text('{"type": "dance"}')
+            assert "error" in ws.receive_json()
+
+    @pytest.mark.parametrize("rate", ["1", "4000", "1000000000"])
+    def test_out_of_range_sample_rate_reported_without_closing(self, rate):
+        with client.websocket_connect("/ws/session") as ws:
+            ws.send_text(f'{{"type": "config", "sample_rate": {rate}}}')
+            assert "sample rate" in ws.receive_json()["error"].lower()
+            ws.send_text('{"type": "dance"}')
+            assert "error" in ws.receive_json()
+
+    def test_audio_is_pushed_off_the_event_loop(self):
+        seen = {}
+        add_audio = StreamSession.add_audio
+
+        def spy(self, pcm16):
+            try:
+                asyncio.get_running_loop()
+                seen["on_loop"] = True
+            except RuntimeError:
+                seen["on_loop"] = False
+            add_audio(self, pcm16)
+
+        with patch.object(StreamSession, "add_audio", spy):
+            with client.websocket_connect("/ws/session") as ws:
+                ws.send_bytes(bytes([MSG_AUDIO]) + b"\x00")
+                assert "odd" in ws.receive_json()["error"]
+
+        assert seen["on_loop"] is False
+
+    def test_stage_failure_reported_without_closing(self):
+        with patch("routes.session.analyze_face_gated", side_effect=RuntimeError("crash")), \
+             patch("routes.session.analyze_speech_window", side_effect=_speech):
+            with client.websocket_connect("/ws/session") as ws:
+                ws.send_bytes(bytes([MSG_FRAME]) + FAKE_JPEG)
+                ws.send_bytes(bytes([MSG_AUDIO]) + _pcm(1.0))
+                assert "facial" in ws.receive_json()["error"].lower()
+                ws.send_bytes(b"\x7f\x00\x00")
+                assert "error" in ws.receive_json()
+
+
+class TestSessionFaceState:
+    def test_gate_and_tracker_state_kept_between_verdicts(self):
+        trackers = []
+
+        def gated(gate, tracker, frame):
+            trackers.append(tracker)
+            gate.hits += 1
+            tracker.tracked_frames += 1
+            return _facial(), gate, tracker
+
+        with patch("routes.session.analyze_face_gated", side_effect=gated), \
+             patch("routes.session.analyze_speech_window", side_effect=_speech), \
+             patch("routes.session.compute_verdict", return_value=Verdict.GREEN):
+            with client.websocket_connect("/ws/session") as ws:
+                ws.send_bytes(bytes([MSG_FRAME]) + FAKE_JPEG)
+                ws.send_bytes(bytes([MSG_AUDIO]) + _pcm(1.0))
+                ws.receive_json()
+                ws.send_bytes(bytes([MSG_AUDIO]) + _pcm(1.0))
+                ws.receive_json()
+
+        assert trackers[0] is trackers[1]
+        assert trackers[1].tracked_frames == 2
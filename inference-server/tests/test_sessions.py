@@ -0,0 +1,175 @@
+"""Tests for per-session rolling state and smoothed verdicts."""
+
+import io
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+import models.stubs as stubs
+from inference import SessionStore
+from inference.orchestrator import InferenceOutcome
+from main import app
+from models import compute_verdict
+from models.schemas import FacialEmotionResult, SpeechEmotionResult, Verdict
+
+client = TestClient(app)
+
+
+# ─── Helpers ───
+
+
+def _store(**overrides) -> SessionStore:
+    params = dict(
+        max_sessions=100,
+        idle_seconds=60.0,
+        ewma_alpha=0.5,
+    )
+    params.update(overrides)
+    return SessionStore(**params)
+
+
+def _outcome(
+    facial_angry: float = 0.0,
+    speech_angry: float = 0.0,
+    verdict: Verdict = Verdict.GREEN,
+    concerning: bool = False,
+    **flags,
+) -> InferenceOutcome:
+    return InferenceOutcome(
+        facial=FacialEmotionResult(
+            emotions={"angry": facial_angry}, dominant="angry", is_concerning=concerning
+        ),
+        speech=SpeechEmotionResult(
+            emotions={"angry": speech_angry}, dominant="angry", is_concerning=False
+        ),
+        verdict=verdict,
+        **flags,
+    )
+
+
+# ─── SessionStore ───
+
+
+class TestRollingState:
+    def test_first_update_seeds_the_ewma(self):
+        store = _store()
+        state = store.update("s1", _outcome(facial_angry=1.0), now=0.0)
+        assert state.facial_ewma == pytest.approx(1.0)
+        assert state.speech_ewma == 0.0
+        assert store.smoothed_verdict(state) == "RED"
+
+    def test_single_spike_does_not_flip_smoothed_verdict(self):
+        store = _store(ewma_alpha=0.2)
+        for t in range(5):
+            store.update("s1", _outcome(), now=float(t))
+        state = store.update("s1", _outcome(facial_angry=0.9, verdict=Verdict.RED), now=5.0)
+        assert store.smoothed_verdict(state) == "GREEN"
+
+    def test_sustained_concern_escalates(self):
+        store = _store()
+        state = None
+        for t in range(3):
+            state = store.update("s1", _outcome(concerning=True), now=float(t))
+        assert store.smoothed_verdict(state) == "YELLOW"
+
+    def test_skipped_modality_keeps_last_result(self):
+        store = _store()
+        store.update("s1", _outcome(speech_angry=1.0), now=0.0)
+        state = store.update(
+            "s1", _outcome(facial_angry=1.0, verdict=Verdict.RED, speech_skipped=True), now=1.0
+        )
+        assert state.last_speech.emotions["angry"] == 1.0
+        assert state.facial_ewma == pytest.approx(0.5)
+        assert state.speech_ewma == pytest.approx(1.0)
+
+    def test_timed_out_facial_keeps_last_result(self):
+        store = _store()
+        last = store.update("s1", _outcome(facial_angry=1.0), now=0.0).last_facial
+        state = store.update("s1", _outcome(facial_timed_out=True), now=1.0)
+        assert state.last_facial is last
+        assert state.facial_ewma == pytest.approx(1.0)
+
+    def test_timed_out_speech_keeps_last_result(self):
+        store = _store()
+        last = store.update("s1", _outcome(speech_angry=1.0), now=0.0).last_speech
+        state = store.update("s1", _outcome(speech_timed_out=True), now=1.0)
+        assert state.last_speech is last
+        assert state.speech_ewma == pytest.approx(1.0)
+
+    def test_sessions_are_independent(self):
+        store = _store()
+        store.update("a", _outcome(facial_angry=1.0), now=0.0)
+        state = store.update("b", _outcome(), now=0.0)
+        assert state.facial_ewma == 0.0
+        assert len(store) == 2
+
+    @pytest.mark.parametrize(
+        "facial_angry, speech_angry, concerning",
+        [(0.9, 0.0, False), (0.0, 0.9, False), (0.3, 0.2, True), (0.5, 0.5, False)],
+    )
+    def test_steady_input_matches_instant_verdict(self, facial_angry, speech_angry, concerning):
+        outcome = _outcome(facial_angry=facial_angry, speech_angry=speech_angry,
+                           concerning=concerning)
+        store = _store()
+        for t in range(5):
+            state = store.update("s1", outcome, now=float(t))
+        instant = compute_verdict(outcome.facial, outcome.speech)
+        assert store.smoothed_verdict(state) == instant.value
+
+    def test_invalid_alpha(self):
+        with pytest.raises(ValueError):
+            _store(ewma_alpha=0.0)
+
+
+class TestEviction:
+    def test_idle_sessions_evicted(self):
+        store = _store(idle_seconds=10.0)
+        store.update("old", _outcome(), now=0.0)
+        store.update("fresh", _outcome(), now=5.0)
+        store.update("fresh", _outcome(), now=12.0)
+        assert store.get("old") is None
+        assert store.get("fresh") is not None
+        assert store.evicted["idle"] == 1
+
+    def test_capacity_evicts_least_recently_seen(self):
+        store = _store(max_sessions=2)
+        store.update("a", _outcome(), now=0.0)
+        store.update("b", _outcome(), now=1.0)
+        store.update("a", _outcome(), now=2.0)
+        store.update("c", _outcome(), now=3.0)
+        assert store.get("b") is None
+        assert store.get("a") is not None and store.get("c") is not None
+        assert store.evicted["capacity"] == 1
+
+
+# ─── POST /analyze ───
+
+
+def _post(headers=None):
+    files = {
+        "frame": ("frame.jpg", io.BytesIO(b"\xff\xd8\xff\xe0" + b"\x00" * 100), "image/jpeg"),
+        "audio": ("audio.wav", io.BytesIO(b"RIFF" + b"\x00" * 100), "audio/wav"),
+    }
+    with (
+        patch("routes.analyze.analyze_face", stubs.analyze_face),
+        patch("routes.analyze.analyze_speech", stubs.analyze_speech),
+        patch("routes.analyze.compute_verdict", stubs.compute_verdict),
+    ):
+        return client.post("/analyze", files=files, headers=headers or {})
+
+
+class TestAnalyzeSessions:
+    def test_session_requests_get_smoothed_verdict(self):
+        store = _store()
+        with patch("routes.analyze.get_session_store", return_value=store):
+            first = _post({"X-Session-Id": "abc"})
+            second = _post({"X-Session-Id": "abc"})
+        assert first.json()["smoothed_verdict"] == "GREEN"
+        assert second.status_code == 200
+        assert store.get("abc").count == 2
+
+    def test_no_session_id_no_smoothed_verdict(self):
+        resp = _post()
+        assert resp.status_code == 200
+        assert "smoothed_verdict" not in resp.json()
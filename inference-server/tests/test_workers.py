@@ -0,0 +1,170 @@
+"""Tests for the model worker pool and startup readiness."""
+
+import asyncio
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from inference import ModelWorkerPool, get_worker_pool
+import main
+from main import app
+
+
+def _noop_warmup() -> None:
+    pass
+
+
+def _failing_warmup() -> None:
+    raise RuntimeError("weights missing")
+
+
+def _noop_loaded() -> bool:
+    return True
+
+
+def _not_loaded() -> bool:
+    return False
+
+
+def _thread_limits() -> tuple[str | None, int, int]:
+    import cv2
+    from threadpoolctl import threadpool_info
+
+    from eq_models import backends
+
+    blas = max((pool["num_threads"] for pool in threadpool_info()), default=1)
+    return os.environ.get("OMP_NUM_THREADS"), cv2.getNumThreads(), max(blas, backends._THREAD_CAP)
+
+
+class TestModelWorkerPool:
+    def test_successful_warmup_marks_ready(self):
+        pool = ModelWorkerPool(num_workers=2, warmups=[_noop_warmup, _noop_warmup])
+        try:
+            assert pool.ready is False
+            assert asyncio.run(pool.start()) is True
+            assert pool.ready is True
+        finally:
+            pool.shutdown()
+
+    def test_failed_warmup_leaves_pool_not_ready(self):
+        pool = ModelWorkerPool(num_workers=2, warmups=[_noop_warmup, _failing_warmup])
+        try:
+            assert asyncio.run(pool.start()) is False
+            assert pool.ready is False
+        finally:
+            pool.shutdown()
+
+    def test_warmups_run_on_pool_threads(self):
+        names = []
+        pool = ModelWorkerPool(
+            num_workers=1, warmups=[lambda: names.append(threading.current_thread().name)]
+        )
+        try:
+            asyncio.run(pool.start())
+        finally:
+            pool.shutdown()
+        assert names[0].startswith("inference")
+
+    def test_unknown_backend_rejected(self):
+        with pytest.raises(ValueError):
+            ModelWorkerPool(num_workers=1, backend="gpu")
+
+    def test_get_worker_pool_uses_configured_size(self):
+        get_worker_pool.cache_clear()
+        pool = get_worker_pool()
+        assert pool.num_workers == 4
+        assert pool.backend == "thread"
+
+
+class TestProcessBackend:
+    def test_work_runs_in_separate_processes(self):
+        pool = ModelWorkerPool(num_workers=2, warmups=[_noop_warmup], backend="process")
+        try:
+            assert asyncio.run(pool.start()) is True
+            pid = pool.executor.submit(os.getpid).result(timeout=30)
+        finally:
+            pool.shutdown()
+        assert pid != os.getpid()
+
+    def test_workers_cap_math_library_threads(self):
+        with patch.dict(os.environ):
+            pool = ModelWorkerPool(
+                num_workers=1, warmups=[_noop_warmup], backend="process", threads_per_process=1
+            )
+            try:
+                asyncio.run(pool.start())
+                env, cv2_threads, cap = pool.executor.submit(_thread_limits).result(timeout=30)
+            finally:
+                pool.shutdown()
+        assert env == "1"
+        assert cv2_threads == 1
+        assert cap == 1
+
+    def test_failing_initializer_warmup_marks_not_ready(self):
+        pool = ModelWorkerPool(num_workers=1, warmups=[_failing_warmup], backend="process")
+        try:
+            assert asyncio.run(pool.start()) is False
+        finally:
+            pool.shutdown()
+
+    def test_failing_initializer_warmup_keeps_pool_usable(self):
+        pool = ModelWorkerPool(
+            num_workers=1,
+            warmups=[_failing_warmup],
+            backend="process",
+            load_checks=[_not_loaded],
+        )
+        try:
+            # No BrokenProcessPool: the worker is up and reports not-loaded.
+            assert pool.executor.submit(os.getpid).result() != os.getpid()
+            assert asyncio.run(pool.check_loaded()) is False
+        finally:
+            pool.shutdown()
+
+
+class TestHealthReadiness:
+    def test_health_reports_pool_readiness(self):
+        get_worker_pool.cache_clear()
+        client = TestClient(app)
+        pool = get_worker_pool()
+
+        pool.ready = False
+        assert client.get("/health").json()["models_loaded"] is False
+
+        pool.ready = True
+        assert client.get("/health").json()["models_loaded"] is True
+
+    def test_warmup_disabled_not_ready_until_models_load(self):
+        loaded = {"face": False, "speech": False}
+        pool = ModelWorkerPool(
+            num_workers=1,
+            load_checks=[lambda: loaded["face"], lambda: loaded["speech"]],
+        )
+        client = TestClient(app)
+        try:
+            with (
+                patch.object(main.settings.workers, "warmup", False),
+                patch("main.get_worker_pool", return_value=pool),
+            ):
+                asyncio.run(main.startup())
+                assert pool.ready is False
+                assert client.get("/health").json()["models_loaded"] is False
+
+                loaded["face"] = True
+                assert client.get("/health").json()["models_loaded"] is False
+
+                loaded["speech"] = True
+                assert client.get("/health").json()["models_loaded"] is True
+                assert pool.ready is True
+        finally:
+            pool.shutdown()
+
+    def test_process_backend_checks_load_in_a_worker(self):
+        pool = ModelWorkerPool(num_workers=1, backend="process", load_checks=[_noop_loaded])
+        try:
+            assert asyncio.run(pool.check_loaded()) is True
+        finally:
+            pool.shutdown()
@@ -1,15 +1,40 @@
 """EQ Meeting Coach — ML Models & Score Fusion (EPIC-4)."""
 
 from eq_models.models import FacialEmotionResult, SpeechEmotionResult, Verdict
-from eq_models.facial import analyze_face
-from eq_models.speech import analyze_speech
-from eq_models.fusion import compute_verdict
+from eq_models.facial import analyze_face, analyze_faces, face_loaded, warmup_face
+from eq_models.speech import (
+    analyze_speech,
+    analyze_speech_batch,
+    analyze_speech_samples,
+    speech_loaded,
+    warmup_speech,
+)
+from eq_models.fusion import compute_verdict, fused_score, settled_verdict
+from eq_models.streaming import SpeechStream, SpeechWindow, analyze_speech_window
+from eq_models.tracking import FaceTracker, analyze_face_tracked
+from eq_models.gating import FrameGate, analyze_face_gated
 
 __all__ = [
+    "FaceTracker",
     "FacialEmotionResult",
+    "FrameGate",
     "SpeechEmotionResult",
+    "SpeechStream",
+    "SpeechWindow",
     "Verdict",
     "analyze_face",
+    "analyze_face_gated",
+    "analyze_face_tracked",
+    "analyze_faces",
     "analyze_speech",
+    "analyze_speech_batch",
+    "analyze_speech_samples",
+    "analyze_speech_window",
     "compute_verdict",
+    "face_loaded",
+    "fused_score",
+    "settled_verdict",
+    "speech_loaded",
+    "warmup_face",
+    "warmup_speech",
 ]
@@ -0,0 +1,237 @@
+"""Pluggable inference backends for the facial and speech models.
+
+``facial.backend`` selects how the emotion CNN runs (``tensorflow`` — the
+Keras model inside DeepFace — or ``onnx``) and ``speech.backend`` selects
+how SenseVoice runs (``funasr`` — the PyTorch AutoModel — or ``onnx``).
+
+The ONNX Runtime wrappers expose the same call surface as the models they
+replace — ``predict`` for the CNN, ``generate`` for SenseVoice — so
+``facial.py`` and ``speech.py`` drive either backend unchanged.  Neither
+wrapper imports TensorFlow or PyTorch; export the models once with
+``python -m eq_models.export`` and the inference image can drop both.
+
+Either ONNX model can also be loaded as an INT8 variant produced by
+``python -m eq_models.export quantize``: dynamic (weights quantized ahead of
+time, activations per batch) or static (activations calibrated on fixture
+data).  Variants sit next to the FP32 file, see ``quantized_path``.
+"""
+
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FACIAL_BACKENDS = ("tensorflow", "onnx")
+SPEECH_BACKENDS = ("funasr", "onnx")
+GRAPH_OPTIMIZATION_LEVELS = ("disable", "basic", "extended", "all")
+QUANTIZATION_MODES = ("none", "dynamic", "static")
+
+# SenseVoice prepends four query frames to the fbank features, and its
+# output opens with one rich tag per frame in the same order:
+# ``<|lang|><|EMO|><|Event|><|itn|>``.  The encoder output at the emotion
+# frame is classified over the vocabulary's emotion tokens.
+SENSEVOICE_RICH_TAGS = ("lang", "emotion", "event", "itn")
+SENSEVOICE_EMOTION_FRAME = SENSEVOICE_RICH_TAGS.index("emotion")
+
+
+# Per-process cap on intra-op threads, set by ``cap_threads``; 0 = no cap.
+_THREAD_CAP = 0
+
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+def cap_threads(threads: int) -> None:
+    """Limit every math library's thread pool in this process to ``threads``.
+
+    Covers BLAS / OpenMP pools that are already loaded (through threadpoolctl,
+    when installed), OpenCV, ONNX Runtime sessions opened afterwards, and —
+    through the environment — torch / TensorFlow if imported later.  Used
+    by worker processes so N of them do not oversubscribe the host.
+    """
+    global _THREAD_CAP
+    if threads <= 0:
+        return
+    _THREAD_CAP = threads
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        logger.warning("threadpoolctl not installed; BLAS threads already started stay uncapped")
+    else:
+        threadpool_limits(limits=threads)
+    try:
+        import cv2
+    except ImportError:
+        pass
+    else:
+        cv2.setNumThreads(threads)
+
+
+def check_backend(name: str, choices: tuple[str, ...], key: str) -> str:
+    """Validate a configured backend name; raise ValueError if unknown."""
+    if name not in choices:
+        raise ValueError(f"Unknown {key} {name!r}; expected one of {choices}")
+    return name
+
+
+def quantized_path(path: str | Path, quantization: str = "none") -> Path:
+    """Where the INT8 variant of an FP32 ONNX file lives.
+
+    ``emotion-cnn.onnx`` becomes ``emotion-cnn.int8-dynamic.onnx`` or
+    ``emotion-cnn.int8-static.onnx``; ``"none"`` returns ``path`` itself.
+    """
+    check_backend(quantization, QUANTIZATION_MODES, "quantization mode")
+    path = Path(path)
+    if quantization == "none":
+        return path
+    return path.with_name(f"{path.stem}.int8-{quantization}{path.suffix}")
+
+
+def onnx_session(path: str | Path, threads: int = 0, optimization: str = "all"):
+    """Open a CPU ONNX Runtime session.
+
+    Args:
+        path: The ``.onnx`` model file.
+        threads: Intra-op threads; 0 lets ONNX Runtime pick one per core.
+            Either way at most the ``cap_threads`` limit, if one is set.
+        optimization: Graph optimization level, one of
+            ``GRAPH_OPTIMIZATION_LEVELS``.
+    """
+    import onnxruntime as ort
+
+    check_backend(optimization, GRAPH_OPTIMIZATION_LEVELS, "graph optimization level")
+    levels = {
+        "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+        "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+        "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+        "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+    }
+    if _THREAD_CAP:
+        threads = min(threads, _THREAD_CAP) if threads else _THREAD_CAP
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = threads
+    options.graph_optimization_level = levels[optimization]
+    path = Path(path).resolve()
+    if not path.exists():
+        raise FileNotFoundError(f"ONNX model not found at {path} — run python -m eq_models.export")
+    logger.info("Loading ONNX model %s (threads=%d, optimization=%s)", path, threads, optimization)
+    return ort.InferenceSession(
+        str(path), sess_options=options, providers=["CPUExecutionProvider"]
+    )
+
+
+class OnnxEmotionModel:
+    """The emotion CNN exported to ONNX, with a Keras-style ``predict``."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        threads: int = 0,
+        optimization: str = "all",
+        quantization: str = "none",
+    ) -> None:
+        self._session = onnx_session(quantized_path(path, quantization), threads, optimization)
+        self._input = self._session.get_inputs()[0].name
+
+    def predict(self, batch: np.ndarray, verbose: int = 0) -> np.ndarray:
+        """Run an (N, 48, 48, 1) float32 batch; return (N, 7) probabilities."""
+        batch = np.ascontiguousarray(batch, dtype=np.float32)
+        return self._session.run(None, {self._input: batch})[0]
+
+
+class OnnxSenseVoice:
+    """SenseVoice exported to ONNX, with a FunASR-style ``generate``.
+
+    The fbank frontend and tokenizer come from ``funasr_onnx``; the encoder
+    runs on a session built by ``onnx_session`` so thread count and
+    optimization level follow config.  Greedy CTC decoding is done here so
+    in-memory buffers can be batched (``funasr_onnx`` treats a list input
+    as file paths).
+    """
+
+    def __init__(
+        self,
+        model_dir: str | Path,
+        threads: int = 0,
+        optimization: str = "all",
+        batch_size: int = 1,
+        quantization: str = "none",
+    ) -> None:
+        from funasr_onnx import SenseVoiceSmall
+
+        model_dir = Path(model_dir).resolve()
+        model_file = quantized_path(model_dir / "model.onnx", quantization)
+        session = onnx_session(model_file, threads, optimization)
+        self._model = SenseVoiceSmall(str(model_dir), batch_size=batch_size, intra_op_num_threads=1)
+        self._model.ort_infer.session = session
+        self._batch_size = batch_size
+
+    def generate(
+        self,
+        input: np.ndarray | list[np.ndarray],
+        fs: int = 16000,
+        language: str = "auto",
+        batch_size: int | None = None,
+        **kwargs,
+    ) -> list[dict]:
+        """Transcribe one buffer or a list of buffers; one ``{"text": ...}`` per input.
+
+        Buffers must already be float32 mono at the model's sample rate;
+        ``fs`` is accepted for call compatibility with FunASR.  The text
+        keeps SenseVoice's ``<|...|>`` tags, as FunASR's output does.
+        """
+        buffers = input if isinstance(input, list) else [input]
+        step = batch_size or self._batch_size
+
+        texts: list[str] = []
+        for start in range(0, len(buffers), step):
+            logits, lengths = self._model.infer(
+                *self.encoder_inputs(buffers[start : start + step], language)
+            )
+            for row, length in zip(logits, lengths):
+                ids = np.argmax(row[: int(length)], axis=-1)
+                ids = ids[np.concatenate(([True], np.diff(ids) != 0))]
+                texts.append(self._model.tokenizer.decode(ids[ids != 0].tolist()))
+        return [{"text": text} for text in texts]
+
+    def emotion_logits(
+        self,
+        buffers: list[np.ndarray],
+        language: str = "auto",
+        batch_size: int | None = None,
+    ) -> np.ndarray:
+        """Vocabulary logits at the emotion query frame, shape (len(buffers), vocab).
+
+        Runs the encoder only; no CTC decoding or detokenization.
+        """
+        step = batch_size or self._batch_size
+        rows = []
+        for start in range(0, len(buffers), step):
+            logits, _ = self._model.infer(
+                *self.encoder_inputs(buffers[start : start + step], language)
+            )
+            rows.append(logits[:, SENSEVOICE_EMOTION_FRAME])
+        return np.concatenate(rows)
+
+    @property
+    def input_names(self) -> list[str]:
+        """Names of the encoder inputs, in ``encoder_inputs`` order."""
+        return [i.name for i in self._model.ort_infer.session.get_inputs()]
+
+    def encoder_inputs(self, buffers: list[np.ndarray], language: str = "auto") -> list[np.ndarray]:
+        """Encoder input arrays (features, lengths, language, textnorm) for a batch.
+
+        Also used to feed calibration data when quantizing statically.
+        """
+        feats, feats_len = self._model.extract_feat(buffers)
+        n = feats.shape[0]
+        return [
+            feats,
+            feats_len,
+            np.full(n, self._model._get_lid(language), dtype=np.int32),
+            np.full(n, self._model._get_tnid("woitn"), dtype=np.int32),
+        ]
@@ -0,0 +1,177 @@
+"""Export the emotion CNN and SenseVoice to ONNX for the ``onnx`` backends.
+
+Needs the full training-side stack (DeepFace + TensorFlow + tf2onnx for the
+CNN, FunASR + PyTorch for SenseVoice); the exported files are all the
+ONNX Runtime backends need at inference time.  ``quantize`` then writes
+INT8 variants of an exported model next to it (static mode calibrates on
+a directory of ``.jpg`` frames or ``.wav`` clips).
+
+    PYTHONPATH=src python -m eq_models.export facial [--output PATH]
+    PYTHONPATH=src python -m eq_models.export speech [--model-dir DIR]
+    PYTHONPATH=src python -m eq_models.export quantize facial|speech \\
+        [--mode dynamic|static] [--calibration DIR]
+"""
+
+import argparse
+import logging
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from eq_models.backends import quantized_path
+from eq_models.config import config
+
+logger = logging.getLogger(__name__)
+
+_ONNX_OPSET = 13
+
+
+def export_facial(output: str | Path) -> Path:
+    """Write DeepFace's emotion CNN to ``output`` as ONNX; return the path."""
+    import tensorflow as tf
+    import tf2onnx
+
+    from eq_models.facial import _load_keras_emotion_model
+
+    model = _load_keras_emotion_model()
+    output = Path(output).resolve()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    signature = (tf.TensorSpec((None, 48, 48, 1), tf.float32, name="face"),)
+    tf2onnx.convert.from_keras(
+        model, input_signature=signature, opset=_ONNX_OPSET, output_path=str(output)
+    )
+    logger.info("Exported emotion CNN to %s", output)
+    return output
+
+
+def export_speech(model_dir: str | Path) -> Path:
+    """Write ``model.onnx`` next to the SenseVoice weights in ``model_dir``."""
+    from funasr import AutoModel
+
+    model_dir = Path(model_dir).resolve()
+    AutoModel(model=str(model_dir), device="cpu").export(type="onnx", quantize=False)
+    output = model_dir / "model.onnx"
+    logger.info("Exported SenseVoice to %s", output)
+    return output
+
+
+def facial_calibration(images: Iterable[bytes], input_name: str = "face") -> list[dict]:
+    """Emotion CNN input feeds for static quantization, one per frame.
+
+    Uses the detected face crop, or the whole frame when no face is found,
+    so synthetic fixtures still yield calibration data.
+    """
+    from eq_models.facial import _decode_frame, _detect_face_box, _emotion_input
+
+    feeds = []
+    for image_bytes in images:
+        gray = _decode_frame(image_bytes)
+        box = _detect_face_box(gray) or (0, 0, gray.shape[1], gray.shape[0])
+        feeds.append({input_name: _emotion_input(gray, box)[np.newaxis, ..., np.newaxis]})
+    return feeds
+
+
+def speech_calibration(clips: Iterable[bytes], model_dir: str | Path) -> list[dict]:
+    """SenseVoice encoder feeds for static quantization, one per voiced clip."""
+    from eq_models.backends import OnnxSenseVoice
+    from eq_models.speech import _decode_audio, _voiced_audio
+
+    model = OnnxSenseVoice(model_dir)
+    feeds = []
+    for audio_bytes in clips:
+        voiced = _voiced_audio(_decode_audio(audio_bytes))
+        if voiced is not None:
+            feeds.append(dict(zip(model.input_names, model.encoder_inputs([voiced]))))
+    return feeds
+
+
+def quantize_onnx(path: str | Path, mode: str, calibration: Iterable[dict] = ()) -> Path:
+    """Write the INT8 ``mode`` variant of an FP32 ONNX file; return its path.
+
+    ``dynamic`` quantizes weights only and needs no data; ``static`` also
+    fixes activation ranges from the ``calibration`` feeds.
+    """
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        QuantType,
+        quantize_dynamic,
+        quantize_static,
+    )
+
+    path = Path(path).resolve()
+    output = quantized_path(path, mode)
+    if mode == "dynamic":
+        quantize_dynamic(path, output, weight_type=QuantType.QInt8)
+    elif mode == "static":
+        feeds = list(calibration)
+        if not feeds:
+            raise ValueError("Static quantization needs at least one calibration feed")
+
+        class _Feeds(CalibrationDataReader):
+            def __init__(self) -> None:
+                self._iter = iter(feeds)
+
+            def get_next(self) -> dict | None:
+                return next(self._iter, None)
+
+        quantize_static(
+            path,
+            output,
+            _Feeds(),
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+        )
+    else:
+        raise ValueError(f"Unknown quantization mode {mode!r}; expected dynamic or static")
+    logger.info("Wrote %s INT8 variant to %s", mode, output)
+    return output
+
+
+def quantize_facial(mode: str, path: str | Path, calibration_dir: str | Path | None = None) -> Path:
+    """Quantize the exported emotion CNN at ``path``."""
+    feeds: list[dict] = []
+    if mode == "static":
+        images = [p.read_bytes() for p in sorted(Path(calibration_dir).glob("*.jpg"))]
+        feeds = facial_calibration(images)
+    return quantize_onnx(path, mode, feeds)
+
+
+def quantize_speech(mode: str, model_dir: str | Path, calibration_dir: str | Path | None = None) -> Path:
+    """Quantize the exported SenseVoice ``model.onnx`` in ``model_dir``."""
+    feeds: list[dict] = []
+    if mode == "static":
+        clips = [p.read_bytes() for p in sorted(Path(calibration_dir).glob("*.wav"))]
+        feeds = speech_calibration(clips, model_dir)
+    return quantize_onnx(Path(model_dir) / "model.onnx", mode, feeds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    facial = sub.add_parser("facial", help="export the emotion CNN")
+    facial.add_argument("--output", default=config["facial"]["onnx_model_path"])
+    speech = sub.add_parser("speech", help="export SenseVoice")
+    speech.add_argument("--model-dir", default=config["speech"]["model_path"])
+    quantize = sub.add_parser("quantize", help="write an INT8 variant of an exported model")
+    quantize.add_argument("model", choices=("facial", "speech"))
+    quantize.add_argument("--mode", choices=("dynamic", "static"), default="dynamic")
+    quantize.add_argument("--calibration", help="frames (.jpg) or clips (.wav) for static mode")
+    args = parser.parse_args()
+
+    if args.command == "quantize" and args.mode == "static" and not args.calibration:
+        parser.error("--calibration is required with --mode static")
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "facial":
+        print(export_facial(args.output))
+    elif args.command == "speech":
+        print(export_speech(args.model_dir))
+    elif args.model == "facial":
+        print(quantize_facial(args.mode, config["facial"]["onnx_model_path"], args.calibration))
+    else:
+        print(quantize_speech(args.mode, config["speech"]["model_path"], args.calibration))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,43 @@
 """STORY-4.1 — Facial Emotion Detection via DeepFace.
 
-Accepts raw JPEG bytes, runs DeepFace emotion analysis, and returns a
-structured FacialEmotionResult.  Gracefully handles no-face, corrupted
-images, and low-confidence outputs.
+Accepts raw JPEG bytes, runs DeepFace's emotion CNN on the detected face,
+and returns a structured FacialEmotionResult.  Gracefully handles no-face,
+corrupted images, and low-confidence outputs.
+
+The OpenCV face detector and the emotion CNN are held as preloaded
+singletons and called directly rather than through ``DeepFace.analyze``,
+which re-validates arguments, reloads the image, aligns the face and looks
+the model up again on every call.  Frames are decoded straight to
+grayscale, which detection and the CNN input share.
+
+``facial.backend`` picks the CNN runtime: ``tensorflow`` (DeepFace's Keras
+model) or ``onnx`` (the same weights exported for ONNX Runtime, see
+``eq_models.backends``), optionally as an INT8 variant
+(``facial.onnx_quantization``).
 """
 
 import io
 import logging
+import os
 
 import numpy as np
 from PIL import Image
 
+from eq_models.backends import FACIAL_BACKENDS, OnnxEmotionModel, check_backend
 from eq_models.config import config
 from eq_models.models import FacialEmotionResult
+from eq_models.timing import stage
 
 logger = logging.getLogger(__name__)
 
 _EMOTION_LABELS = ["angry", "disgust", "fear", "happy", "sad", "surprise", "neutral"]
 _CONCERNING_THRESHOLD: float = config["facial"]["concerning_threshold"]
 _BACKEND: str = config["facial"]["backend"]
+_DECODE_MAX_SIDE: int = config["facial"]["decode_max_side"]
+_ONNX_MODEL_PATH: str = config["facial"]["onnx_model_path"]
+_ONNX_THREADS: int = config["facial"]["onnx_threads"]
+_ONNX_OPTIMIZATION: str = config["facial"]["onnx_optimization"]
+_ONNX_QUANTIZATION: str = config["facial"]["onnx_quantization"]
 
 
 def _neutral_result() -> FacialEmotionResult:
@@ -36,59 +55,191 @@ def _get_deepface():
     return DeepFace
 
 
-def analyze_face(image_bytes: bytes) -> FacialEmotionResult:
-    """Run facial emotion detection on a JPEG image.
+# Lazy-loaded emotion classifier singleton — the Keras model inside DeepFace,
+# or its ONNX export; either way it exposes ``predict``.
+_emotion_model = None
 
-    Args:
-        image_bytes: Raw JPEG image data.
+# Lazy-loaded OpenCV face detector — the cascade DeepFace's "opencv" backend uses.
+_face_detector = None
 
-    Returns:
-        FacialEmotionResult with emotion scores, dominant emotion, and
-        concerning flag.  Never raises — returns a neutral result on
-        any failure.
-    """
+
+def _load_keras_emotion_model():
+    """Build DeepFace's Keras emotion CNN."""
+    DeepFace = _get_deepface()
     try:
+        client = DeepFace.build_model(task="facial_attribute", model_name="Emotion")
+    except TypeError:
+        # deepface < 0.0.90 takes the model name positionally.
+        client = DeepFace.build_model("Emotion")
+    return getattr(client, "model", client)
+
+
+def _get_emotion_model():
+    """Load the emotion CNN for the configured backend once (lazy singleton)."""
+    global _emotion_model
+    if _emotion_model is None:
+        check_backend(_BACKEND, FACIAL_BACKENDS, "facial.backend")
+        if _BACKEND == "onnx":
+            _emotion_model = OnnxEmotionModel(
+                _ONNX_MODEL_PATH, _ONNX_THREADS, _ONNX_OPTIMIZATION, _ONNX_QUANTIZATION
+            )
+        else:
+            _emotion_model = _load_keras_emotion_model()
+    return _emotion_model
+
+
+def _get_face_detector():
+    """Load OpenCV's frontal-face Haar cascade once (lazy singleton)."""
+    global _face_detector
+    if _face_detector is None:
+        import cv2
+
+        path = os.path.join(cv2.data.haarcascades, "haarcascade_frontalface_default.xml")
+        detector = cv2.CascadeClassifier(path)
+        if detector.empty():
+            raise RuntimeError(f"Could not load face cascade from {path}")
+        _face_detector = detector
+    return _face_detector
+
+
+def _decode_frame(image_bytes: bytes, max_side: int = _DECODE_MAX_SIDE) -> np.ndarray:
+    """Decode an image straight to a grayscale uint8 array no larger than ``max_side``.
+
+    JPEG draft mode lets libjpeg emit only the luma channel and downscale in
+    the DCT domain (by up to 1/8) while decoding, so large phone frames never
+    materialise in colour or at full resolution; a small final resize lands
+    on the exact size.  Grayscale is all the face detector and the emotion
+    CNN use.  ``max_side <= 0`` keeps the full resolution.
+    """
+    with stage("image_decode"):
         image = Image.open(io.BytesIO(image_bytes))
-        img_array = np.array(image)
+        width, height = image.size
+        target = (width, height)
+        if 0 < max_side < max(width, height):
+            scale = max_side / max(width, height)
+            target = (max(1, round(width * scale)), max(1, round(height * scale)))
+        image.draft("L", target)
+        if image.mode != "L":
+            image = image.convert("L")
+        if image.size != target:
+            image = image.resize(target, Image.BILINEAR)
+        return np.asarray(image)
+
+
+def _result_from_probs(probs: np.ndarray) -> FacialEmotionResult:
+    """Build a FacialEmotionResult from a probability row over _EMOTION_LABELS."""
+    emotions = {label: float(p) for label, p in zip(_EMOTION_LABELS, probs)}
+    dominant = _EMOTION_LABELS[int(np.argmax(probs))]
+    is_concerning = (emotions["angry"] + emotions["disgust"]) > _CONCERNING_THRESHOLD
+    return FacialEmotionResult(
+        emotions=emotions,
+        dominant=dominant,
+        is_concerning=is_concerning,
+    )
 
-        DeepFace = _get_deepface()
 
-        # DeepFace returns a list of dicts (one per detected face).
-        results = DeepFace.analyze(
-            img_path=img_array,
-            actions=["emotion"],
-            enforce_detection=False,
-            detector_backend="opencv",
-        )
+def _detect_face_box(gray: np.ndarray) -> tuple[int, int, int, int] | None:
+    """Largest face in a grayscale frame as (x, y, w, h), or None."""
+    # Same parameters as DeepFace's opencv detector.
+    detector = _get_face_detector()
+    with stage("face_detection"):
+        boxes = detector.detectMultiScale(gray, 1.1, 10)
+    if len(boxes) == 0:
+        return None
+    x, y, w, h = max(boxes, key=lambda b: int(b[2]) * int(b[3]))
+    return int(x), int(y), int(w), int(h)
 
-        if not results:
-            return _neutral_result()
 
-        # Take the first detected face.
-        face = results[0] if isinstance(results, list) else results
+def _emotion_input(gray: np.ndarray, box: tuple[int, int, int, int]) -> np.ndarray:
+    """Crop ``box`` from a grayscale frame into the CNN's 48x48 input in [0, 1]."""
+    import cv2
 
-        raw_emotions: dict[str, float] = face.get("emotion", {})
-        if not raw_emotions:
-            return _neutral_result()
+    x, y, w, h = box
+    face = cv2.resize(gray[y : y + h, x : x + w], (48, 48))
+    return face.astype(np.float32) * np.float32(1.0 / 255.0)
+
+
+def _classify_faces(batch: np.ndarray) -> np.ndarray:
+    """Run the emotion CNN over an (N, 48, 48) batch; return (N, 7) probabilities."""
+    model = _get_emotion_model()
+    with stage("emotion_cnn"):
+        preds = np.asarray(model.predict(batch[..., np.newaxis], verbose=0), dtype=np.float64)
+    totals = preds.sum(axis=1, keepdims=True)
+    totals[totals == 0.0] = 1.0
+    return preds / totals
 
-        # DeepFace returns percentages (0-100); normalize to 0.0-1.0.
-        emotions = {
-            label: raw_emotions.get(label, 0.0) / 100.0
-            for label in _EMOTION_LABELS
-        }
 
-        dominant = face.get("dominant_emotion", "neutral")
+def face_loaded() -> bool:
+    """Whether the face detector and emotion model are loaded in this process."""
+    return _face_detector is not None and _emotion_model is not None
+
+
+def warmup_face() -> None:
+    """Load the face detector and emotion model and run each once.
+
+    Raises on failure so callers can report the model as not ready.
+    """
+    _detect_face_box(np.zeros((224, 224), dtype=np.uint8))
+    _classify_faces(np.zeros((1, 48, 48), dtype=np.float32))
+
 
-        # Concerning flag: (angry + disgust) > threshold
-        angry_score = emotions.get("angry", 0.0)
-        disgust_score = emotions.get("disgust", 0.0)
-        is_concerning = (angry_score + disgust_score) > _CONCERNING_THRESHOLD
+def analyze_faces(images: list[bytes]) -> list[FacialEmotionResult]:
+    """Run facial emotion detection over a batch of JPEG images.
 
-        return FacialEmotionResult(
-            emotions=emotions,
-            dominant=dominant,
-            is_concerning=is_concerning,
-        )
+    Face detection runs per image; the emotion classifier runs once over
+    all detected faces.  Results line up with ``images``.  Never raises —
+    an image with no face, one that fails to decode, or a failing batch
+    yields neutral results.
+    """
+    results = [_neutral_result() for _ in images]
+
+    crops: list[np.ndarray] = []
+    indices: list[int] = []
+    for i, image_bytes in enumerate(images):
+        try:
+            gray = _decode_frame(image_bytes)
+            box = _detect_face_box(gray)
+            if box is not None:
+                crops.append(_emotion_input(gray, box))
+                indices.append(i)
+        except Exception:
+            logger.exception("Face extraction failed for batch item %d", i)
+
+    if not crops:
+        return results
+
+    try:
+        probs = _classify_faces(np.stack(crops))
+    except Exception:
+        logger.exception("analyze_faces classifier failed — returning neutral results")
+        return results
+
+    for i, row in zip(indices, probs):
+        results[i] = _result_from_probs(row)
+    return results
+
+
+def analyze_face(image_bytes: bytes) -> FacialEmotionResult:
+    """Run facial emotion detection on a JPEG image.
+
+    The frame is decoded at reduced resolution (``facial.decode_max_side``)
+    before detection.
+
+    Args:
+        image_bytes: Raw JPEG image data.
+
+    Returns:
+        FacialEmotionResult with emotion scores, dominant emotion, and
+        concerning flag.  Never raises — returns a neutral result when no
+        face is found or on any failure.
+    """
+    try:
+        gray = _decode_frame(image_bytes)
+        box = _detect_face_box(gray)
+        if box is None:
+            return _neutral_result()
+        probs = _classify_faces(_emotion_input(gray, box)[np.newaxis])
+        return _result_from_probs(probs[0])
 
     except Exception:
         logger.exception("analyze_face failed — returning neutral result")
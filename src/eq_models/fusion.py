@@ -2,6 +2,8 @@
 
 Pure function — no side effects, no I/O, no model loading.
 Combines facial and speech emotion results into a single verdict.
+``settled_verdict`` tells a caller holding only one modality's result
+whether the other can still change the verdict.
 
 NOTE: Full implementation is Wave 2.  The function is stubbed here so that
 the package is importable and the Server API Agent can reference it.
@@ -16,6 +18,14 @@ _GREEN_THRESHOLD: float = config["fusion"]["green_threshold"]
 _RED_THRESHOLD: float = config["fusion"]["red_threshold"]
 
 
+def fused_score(facial: FacialEmotionResult, speech: SpeechEmotionResult) -> float:
+    """Weighted angry score that ``compute_verdict`` thresholds."""
+    return (
+        facial.emotions.get("angry", 0.0) * _FACIAL_WEIGHT
+        + speech.emotions.get("angry", 0.0) * _SPEECH_WEIGHT
+    )
+
+
 def compute_verdict(
     facial: FacialEmotionResult,
     speech: SpeechEmotionResult,
@@ -29,15 +39,12 @@ def compute_verdict(
     Returns:
         Verdict (GREEN, YELLOW, or RED).
     """
-    fused_score = (
-        facial.emotions.get("angry", 0.0) * _FACIAL_WEIGHT
-        + speech.emotions.get("angry", 0.0) * _SPEECH_WEIGHT
-    )
+    score = fused_score(facial, speech)
 
     # Base verdict from thresholds.
-    if fused_score < _GREEN_THRESHOLD:
+    if score < _GREEN_THRESHOLD:
         verdict = Verdict.GREEN
-    elif fused_score < _RED_THRESHOLD:
+    elif score < _RED_THRESHOLD:
         verdict = Verdict.YELLOW
     else:
         verdict = Verdict.RED
@@ -50,3 +57,38 @@ def compute_verdict(
             verdict = Verdict.RED
 
     return verdict
+
+
+# The extremes of the missing modality: the verdict is monotone in the
+# angry score and in the concerning flag, so these two bound every
+# reachable verdict.
+_CALMEST = {"emotions": {"angry": 0.0}, "dominant": "neutral", "is_concerning": False}
+_ANGRIEST = {"emotions": {"angry": 1.0}, "dominant": "angry", "is_concerning": True}
+
+
+def settled_verdict(
+    facial: FacialEmotionResult | None = None,
+    speech: SpeechEmotionResult | None = None,
+) -> Verdict | None:
+    """The verdict, if the one modality given already decides it.
+
+    Pass exactly one of ``facial`` / ``speech``.  Returns the verdict
+    ``compute_verdict`` will produce for any result of the other modality,
+    or None when that result can still move it.
+
+    Args:
+        facial: Result from analyze_face, or None if still pending.
+        speech: Result from analyze_speech, or None if still pending.
+
+    Returns:
+        The settled Verdict, or None.
+    """
+    if (facial is None) == (speech is None):
+        raise ValueError("settled_verdict needs exactly one modality result")
+    if facial is not None:
+        low = compute_verdict(facial, SpeechEmotionResult(**_CALMEST))
+        high = compute_verdict(facial, SpeechEmotionResult(**_ANGRIEST))
+    else:
+        low = compute_verdict(FacialEmotionResult(**_CALMEST), speech)
+        high = compute_verdict(FacialEmotionResult(**_ANGRIEST), speech)
+    return low if low == high else None
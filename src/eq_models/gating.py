@@ -0,0 +1,102 @@
+"""Frame-difference gating for facial inference.
+
+With a participant sitting still, consecutive frames are nearly identical
+and re-running decode + detection + CNN on each one is wasted work.  A
+FrameGate keeps a tiny grayscale thumbnail of the last frame that was
+actually analyzed; when a new frame's thumbnail is within
+``gate_threshold`` mean absolute difference of it, the previous
+FacialEmotionResult is returned instead.  After ``gate_max_reuse``
+consecutive reuses the frame is analyzed anyway so slow drift (lighting,
+gradual expression change) is still picked up.
+"""
+
+import io
+import logging
+from typing import Callable
+
+import numpy as np
+from PIL import Image
+
+from eq_models.config import config
+from eq_models.models import FacialEmotionResult
+from eq_models.tracking import FaceTracker
+
+logger = logging.getLogger(__name__)
+
+_THRESHOLD: float = config["facial"]["gate_threshold"]
+_THUMBNAIL_SIZE: int = config["facial"]["gate_thumbnail_size"]
+_MAX_REUSE: int = config["facial"]["gate_max_reuse"]
+
+
+def _thumbnail(image_bytes: bytes, size: int) -> np.ndarray:
+    """Decode straight to a small grayscale thumbnail with values in [0, 1]."""
+    image = Image.open(io.BytesIO(image_bytes))
+    # JPEG draft mode lets libjpeg downscale in the DCT domain (up to 1/8).
+    image.draft("L", (size * 4, size * 4))
+    thumb = image.convert("L").resize((size, size), Image.BILINEAR)
+    return np.asarray(thumb, dtype=np.float32) / 255.0
+
+
+class FrameGate:
+    """Per-session change detector in front of facial inference."""
+
+    def __init__(
+        self,
+        threshold: float = _THRESHOLD,
+        thumbnail_size: int = _THUMBNAIL_SIZE,
+        max_reuse: int = _MAX_REUSE,
+    ) -> None:
+        self.threshold = threshold
+        self.thumbnail_size = thumbnail_size
+        self.max_reuse = max_reuse
+        self._reference: np.ndarray | None = None
+        self._result: FacialEmotionResult | None = None
+        self._reuse_streak = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def analyze(
+        self,
+        image_bytes: bytes,
+        analyze_fn: Callable[[bytes], FacialEmotionResult],
+    ) -> FacialEmotionResult:
+        """Return the cached result for a near-identical frame, else ``analyze_fn``."""
+        try:
+            thumb = _thumbnail(image_bytes, self.thumbnail_size)
+        except Exception:
+            logger.debug("Thumbnail decode failed — analyzing frame ungated")
+            self.misses += 1
+            return analyze_fn(image_bytes)
+
+        if (
+            self._result is not None
+            and self._reuse_streak < self.max_reuse
+            and float(np.mean(np.abs(thumb - self._reference))) <= self.threshold
+        ):
+            self.hits += 1
+            self._reuse_streak += 1
+            return self._result
+
+        self.misses += 1
+        result = analyze_fn(image_bytes)
+        self._reference = thumb
+        self._result = result
+        self._reuse_streak = 0
+        return result
+
+
+def analyze_face_gated(
+    gate: FrameGate, tracker: FaceTracker, image_bytes: bytes
+) -> tuple[FacialEmotionResult, FrameGate, FaceTracker]:
+    """Per-session facial pipeline for one frame: gate first, then track.
+
+    Returns the updated gate and tracker so their state survives a round
+    trip through a worker process.
+    """
+    result = gate.analyze(image_bytes, tracker.analyze)
+    return result, gate, tracker
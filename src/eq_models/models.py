@@ -19,6 +19,7 @@ class SpeechEmotionResult(BaseModel):
     emotions: dict[str, float]  # e.g. {"angry": 0.5, "neutral": 0.4, ...}
     dominant: str               # e.g. "angry"
     is_concerning: bool         # True if angry > threshold
+    inferred_seconds: float = 0.0  # voiced audio actually sent to the model
 
 
 class Verdict(str, Enum):
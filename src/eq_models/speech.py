@@ -2,38 +2,81 @@
 
 Accepts raw WAV bytes, runs SenseVoice emotion analysis, and returns a
 structured SpeechEmotionResult.  Gracefully handles silence, short clips,
-and resampling.
+and resampling.  An energy / zero-crossing VAD trims non-speech audio so
+only voiced segments reach the model.
+
+``speech.backend`` picks the SenseVoice runtime: ``funasr`` (PyTorch
+AutoModel) or ``onnx`` (the exported model on ONNX Runtime, see
+``eq_models.backends``), optionally as an INT8 variant
+(``speech.onnx_quantization``).
+
+``speech.inference_mode`` picks what is read from SenseVoice:
+``transcribe`` decodes the full transcript and counts its ``<|ANGRY|>``-style
+emotion tags, giving a one-hot distribution; ``emotion`` runs the encoder
+only and applies a softmax over the emotion-token logits at the emotion
+query frame, so no ASR tokens are decoded and fusion gets real
+probabilities.
 """
 
-import io
 import logging
 import re
-import tempfile
 from pathlib import Path
 
-import librosa
 import numpy as np
-import soundfile as sf
 
+from eq_models.audio import decode_audio, resample, to_mono
+from eq_models.backends import (
+    SENSEVOICE_EMOTION_FRAME,
+    SPEECH_BACKENDS,
+    OnnxSenseVoice,
+    check_backend,
+)
 from eq_models.config import config
 from eq_models.models import SpeechEmotionResult
+from eq_models.timing import stage
 
 logger = logging.getLogger(__name__)
 
 _EMOTION_LABELS = ["angry", "happy", "sad", "neutral"]
+INFERENCE_MODES = ("transcribe", "emotion")
+# SenseVoice vocabulary ids of <|ANGRY|>, <|HAPPY|>, <|SAD|>, <|NEUTRAL|>,
+# in _EMOTION_LABELS order.
+_EMOTION_TOKEN_IDS = [25003, 25001, 25002, 25004]
 _CONCERNING_THRESHOLD: float = config["speech"]["concerning_threshold"]
 _MODEL_PATH: str = config["speech"]["model_path"]
+_BACKEND: str = config["speech"]["backend"]
+_INFERENCE_MODE: str = config["speech"]["inference_mode"]
+_ONNX_THREADS: int = config["speech"]["onnx_threads"]
+_ONNX_OPTIMIZATION: str = config["speech"]["onnx_optimization"]
+_ONNX_QUANTIZATION: str = config["speech"]["onnx_quantization"]
 _TARGET_SAMPLE_RATE: int = config["speech"]["sample_rate"]
 _MIN_DURATION_SECONDS: float = 1.0
+_SILENCE_RMS: float = 0.005
+
+# Voice activity detection.
+_VAD_ENABLED: bool = config["speech"]["vad_enabled"]
+_VAD_FRAME_MS: float = config["speech"]["vad_frame_ms"]
+_VAD_ENERGY_THRESHOLD: float = config["speech"]["vad_energy_threshold"]
+_VAD_MAX_ZCR: float = config["speech"]["vad_max_zcr"]
+_VAD_MIN_SILENCE_MS: float = config["speech"]["vad_min_silence_ms"]
+_VAD_PADDING_MS: float = config["speech"]["vad_padding_ms"]
+_VAD_MIN_SPEECH_SECONDS: float = config["speech"]["vad_min_speech_seconds"]
 
 # Lazy-loaded model singleton.
 _model = None
 
 
 def _get_model():
-    """Load the SenseVoice model once (lazy singleton)."""
+    """Load SenseVoice for the configured backend once (lazy singleton)."""
     global _model
     if _model is None:
+        check_backend(_BACKEND, SPEECH_BACKENDS, "speech.backend")
+        check_backend(_INFERENCE_MODE, INFERENCE_MODES, "speech.inference_mode")
+        if _BACKEND == "onnx":
+            _model = OnnxSenseVoice(
+                _MODEL_PATH, _ONNX_THREADS, _ONNX_OPTIMIZATION, quantization=_ONNX_QUANTIZATION
+            )
+            return _model
         import torch
         from funasr import AutoModel
         model_path = str(Path(_MODEL_PATH).resolve())
@@ -43,6 +86,126 @@ def _get_model():
     return _model
 
 
+def _get_frontend():
+    """Return the loaded model's WavFrontend, or None if not loaded yet.
+
+    Never triggers a model load, so it is safe on latency-sensitive paths.
+    Always None on the ONNX backend, which has no fbank entry point.
+    """
+    if _model is None or _BACKEND != "funasr":
+        return None
+    return _model.kwargs.get("frontend")
+
+
+def _frame_geometry(frontend) -> tuple[int, int]:
+    """(frame length, frame shift) in samples for a WavFrontend."""
+    frame_len = int(frontend.fs * frontend.frame_length / 1000)
+    shift = int(frontend.fs * frontend.frame_shift / 1000)
+    return frame_len, shift
+
+
+def _fbank(frontend, audio_data: np.ndarray) -> np.ndarray:
+    """Kaldi fbank frames for a float32 buffer, matching the model frontend.
+
+    With snip_edges and no dither every frame depends only on its own
+    samples, so frames computed chunk-by-chunk equal a whole-clip pass.
+    """
+    import torch
+    import torchaudio.compliance.kaldi as kaldi
+
+    waveform = torch.from_numpy(audio_data * (1 << 15)).unsqueeze(0)
+    feats = kaldi.fbank(
+        waveform,
+        num_mel_bins=frontend.n_mels,
+        frame_length=frontend.frame_length,
+        frame_shift=frontend.frame_shift,
+        dither=0.0,
+        energy_floor=0.0,
+        window_type=frontend.window,
+        sample_frequency=frontend.fs,
+        snip_edges=True,
+    )
+    return feats.numpy()
+
+
+def _analyze_features(fbank: np.ndarray, inferred_seconds: float = 0.0) -> SpeechEmotionResult:
+    """Run SenseVoice on precomputed fbank frames (skips the audio frontend)."""
+    import torch
+    from funasr.frontends.wav_frontend import apply_cmvn, apply_lfr
+
+    model = _get_model()
+    frontend = model.kwargs["frontend"]
+    feats = apply_lfr(torch.from_numpy(fbank), frontend.lfr_m, frontend.lfr_n)
+    if frontend.cmvn is not None:
+        feats = apply_cmvn(feats, frontend.cmvn)
+
+    if _INFERENCE_MODE == "emotion":
+        with stage("sensevoice_generate"):
+            logits = _funasr_emotion_logits(model, feats.unsqueeze(0), torch.tensor([feats.shape[0]]))
+        return _result_from_emotions(_emotion_distribution(logits[0]), inferred_seconds)
+
+    kwargs = dict(model.kwargs)
+    kwargs.update(language="auto", data_type="fbank")
+    with stage("sensevoice_generate"):
+        result, _ = model.model.inference(
+            data_in=feats.unsqueeze(0),
+            data_lengths=torch.tensor([feats.shape[0]]),
+            key=["stream"],
+            **kwargs,
+        )
+    if not result:
+        return _neutral_result()
+    return _result_from_text(_extract_text(result[0]), inferred_seconds)
+
+
+def _funasr_emotion_logits(model, feats, lengths) -> np.ndarray:
+    """Encoder-only SenseVoice pass over LFR/CMVN features (FunASR backend).
+
+    Builds the same query prefix as ``SenseVoiceSmall.inference`` (language
+    ``auto``, event + emotion, no ITN) and projects only the emotion query
+    frame onto the vocabulary, skipping the CTC head over the speech frames.
+    Returns (batch, vocab) logits.
+    """
+    import torch
+
+    net = model.model
+    device = next(net.parameters()).device
+    feats = feats.to(device)
+    n = feats.size(0)
+
+    def query(ids: list[int]):
+        return net.embed(torch.LongTensor([ids]).to(device)).repeat(n, 1, 1)
+
+    speech = torch.cat(
+        (query([net.lid_dict["auto"]]), query([1, 2]), query([net.textnorm_dict["woitn"]]), feats),
+        dim=1,
+    )
+    with torch.no_grad():
+        encoder_out, _ = net.encoder(speech, lengths.to(device) + 4)
+        logits = net.ctc.ctc_lo(encoder_out[:, SENSEVOICE_EMOTION_FRAME])
+    return logits.float().cpu().numpy()
+
+
+def _emotion_logits(buffers: list[np.ndarray]) -> np.ndarray:
+    """Emotion-query vocabulary logits for voiced buffers, one row per buffer."""
+    model = _get_model()
+    if _BACKEND == "onnx":
+        return model.emotion_logits(buffers, "auto", batch_size=len(buffers))
+
+    from funasr.utils.load_utils import extract_fbank
+
+    feats, lengths = extract_fbank(buffers, data_type="sound", frontend=model.kwargs["frontend"])
+    return _funasr_emotion_logits(model, feats, lengths)
+
+
+def _emotion_distribution(logits: np.ndarray) -> dict[str, float]:
+    """Softmax over the emotion-token logits, keyed by ``_EMOTION_LABELS``."""
+    scores = np.asarray(logits, dtype=np.float64)[_EMOTION_TOKEN_IDS]
+    probs = np.exp(scores - scores.max())
+    probs /= probs.sum()
+    return {label: float(p) for label, p in zip(_EMOTION_LABELS, probs)}
+
+
 def _neutral_result() -> SpeechEmotionResult:
     """Return a safe neutral result when speech analysis fails."""
     return SpeechEmotionResult(
@@ -90,80 +253,278 @@ def _parse_emotion_tags(text: str) -> dict[str, float]:
     return emotions
 
 
-def analyze_speech(audio_bytes: bytes) -> SpeechEmotionResult:
-    """Run speech emotion detection on a WAV audio clip.
+def _as_samples(samples) -> np.ndarray:
+    """int16 PCM as is (``to_mono`` scales it), anything else as float32."""
+    samples = np.asarray(samples)
+    if samples.dtype == np.int16:
+        return samples
+    return samples.astype(np.float32, copy=False)
 
-    Args:
-        audio_bytes: Raw WAV audio data (ideally 16 kHz mono 16-bit PCM).
 
-    Returns:
-        SpeechEmotionResult with emotion scores, dominant emotion, and
-        concerning flag.  Never raises — returns a neutral result on any
-        failure.
-    """
-    try:
-        # Read the WAV bytes.
-        audio_data, sample_rate = sf.read(io.BytesIO(audio_bytes), dtype="float32")
+def _to_model_input(audio_data: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Downmix to mono and resample to the model's sample rate."""
+    audio_data = to_mono(audio_data)
+    with stage("resample"):
+        audio_data = resample(audio_data, sample_rate, _TARGET_SAMPLE_RATE)
+    return np.ascontiguousarray(audio_data, dtype=np.float32)
 
-        # Convert stereo to mono if necessary.
-        if audio_data.ndim > 1:
-            audio_data = np.mean(audio_data, axis=1)
 
-        # Resample to target sample rate if needed.
-        if sample_rate != _TARGET_SAMPLE_RATE:
-            audio_data = librosa.resample(
-                audio_data, orig_sr=sample_rate, target_sr=_TARGET_SAMPLE_RATE
-            )
-            sample_rate = _TARGET_SAMPLE_RATE
+def _decode_audio(audio_bytes: bytes) -> np.ndarray:
+    """Decode WAV, FLAC or Ogg Opus bytes to mono float32 at the target rate."""
+    return decode_audio(audio_bytes, _TARGET_SAMPLE_RATE)
 
-        duration = len(audio_data) / sample_rate
 
-        # Too short for meaningful analysis — return neutral.
-        if duration < _MIN_DURATION_SECONDS:
-            return _neutral_result()
+def _voice_segments(audio_data: np.ndarray) -> list[tuple[int, int]]:
+    """Voiced [start, end) sample ranges in a buffer at the target sample rate.
 
-        # Check for silence (RMS below a small threshold).
-        rms = np.sqrt(np.mean(audio_data**2))
-        if rms < 0.005:
-            return _neutral_result()
+    A frame counts as speech when its RMS clears the energy threshold and
+    its zero-crossing rate stays below the noise ceiling.  Pauses shorter
+    than ``vad_min_silence_ms`` are bridged, each segment is padded, and
+    overlapping segments are merged.  Returns [] when there is too little
+    speech to analyse.  With the VAD disabled the whole buffer is one
+    segment unless it is silent.
+    """
+    if not _VAD_ENABLED:
+        rms = np.sqrt(np.mean(audio_data**2)) if len(audio_data) else 0.0
+        return [(0, len(audio_data))] if rms >= _SILENCE_RMS else []
+
+    frame = max(1, int(_TARGET_SAMPLE_RATE * _VAD_FRAME_MS / 1000))
+    n_frames = len(audio_data) // frame
+    if n_frames == 0:
+        return []
+
+    frames = audio_data[: n_frames * frame].reshape(n_frames, frame)
+    rms = np.sqrt(np.mean(frames**2, axis=1))
+    signs = np.signbit(frames)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+    voiced = np.flatnonzero((rms >= _VAD_ENERGY_THRESHOLD) & (zcr <= _VAD_MAX_ZCR))
+    if voiced.size * frame < _VAD_MIN_SPEECH_SECONDS * _TARGET_SAMPLE_RATE:
+        return []
+
+    # Split voiced frames into runs wherever the gap exceeds the allowed pause.
+    max_gap = int(_VAD_MIN_SILENCE_MS / _VAD_FRAME_MS)
+    breaks = np.flatnonzero(np.diff(voiced) > max_gap + 1)
+    starts = np.concatenate((voiced[:1], voiced[breaks + 1]))
+    ends = np.concatenate((voiced[breaks], voiced[-1:])) + 1
+
+    pad = int(_TARGET_SAMPLE_RATE * _VAD_PADDING_MS / 1000)
+    segments: list[tuple[int, int]] = []
+    for start, end in zip(starts, ends):
+        lo = max(0, int(start) * frame - pad)
+        hi = min(len(audio_data), int(end) * frame + pad)
+        if segments and lo <= segments[-1][1]:
+            segments[-1] = (segments[-1][0], hi)
+        else:
+            segments.append((lo, hi))
+    return segments
+
+
+def _voiced_audio(audio_data: np.ndarray) -> np.ndarray | None:
+    """Concatenated voiced segments of a buffer, or None if nothing to analyse."""
+    # Too short for meaningful analysis.
+    if len(audio_data) / _TARGET_SAMPLE_RATE < _MIN_DURATION_SECONDS:
+        return None
+
+    segments = _voice_segments(audio_data)
+    if not segments:
+        return None
+    if len(segments) == 1 and segments[0] == (0, len(audio_data)):
+        return audio_data
+    return np.concatenate([audio_data[lo:hi] for lo, hi in segments])
+
+
+def _extract_text(entry) -> str:
+    """Pull the transcription text out of one FunASR result entry."""
+    if isinstance(entry, dict):
+        return entry.get("text", "")
+    return str(entry)
+
+
+def _result_from_text(text: str, inferred_seconds: float = 0.0) -> SpeechEmotionResult:
+    """Build a SpeechEmotionResult from SenseVoice transcription text."""
+    return _result_from_emotions(_parse_emotion_tags(text), inferred_seconds)
+
+
+def _result_from_emotions(
+    emotions: dict[str, float], inferred_seconds: float = 0.0
+) -> SpeechEmotionResult:
+    """Build a SpeechEmotionResult from a distribution over ``_EMOTION_LABELS``."""
+    dominant = max(emotions, key=emotions.get)  # type: ignore[arg-type]
+
+    angry_score = emotions.get("angry", 0.0)
+    is_concerning = angry_score > _CONCERNING_THRESHOLD
 
-        # SenseVoice / FunASR expects a file path — write to a temp file.
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-            sf.write(tmp.name, audio_data, sample_rate, subtype="PCM_16")
-            tmp_path = tmp.name
+    return SpeechEmotionResult(
+        emotions=emotions,
+        dominant=dominant,
+        is_concerning=is_concerning,
+        inferred_seconds=inferred_seconds,
+    )
 
-        model = _get_model()
-        result = model.generate(input=tmp_path, language="auto")
 
-        # Clean up temp file.
-        Path(tmp_path).unlink(missing_ok=True)
+def speech_loaded() -> bool:
+    """Whether SenseVoice is loaded in this process."""
+    return _model is not None
 
-        if not result:
-            return _neutral_result()
 
-        # Extract text from result — FunASR returns a list of dicts.
-        text = ""
-        if isinstance(result, list) and len(result) > 0:
-            entry = result[0]
-            if isinstance(entry, dict):
-                text = entry.get("text", "")
+def warmup_speech() -> None:
+    """Load SenseVoice and run one short synthetic clip through it.
+
+    Raises on failure so callers can report the model as not ready.
+    """
+    t = np.arange(_TARGET_SAMPLE_RATE, dtype=np.float32) / _TARGET_SAMPLE_RATE
+    clip = (0.1 * np.sin(2 * np.pi * 220.0 * t)).astype(np.float32)
+    if _INFERENCE_MODE == "emotion":
+        _emotion_logits([clip])
+    else:
+        _get_model().generate(input=clip, fs=_TARGET_SAMPLE_RATE, language="auto")
+
+
+def analyze_speech_batch(
+    clips: list[bytes | tuple[np.ndarray, int]],
+) -> list[SpeechEmotionResult]:
+    """Run speech emotion detection over a batch of WAV, FLAC or Ogg Opus clips.
+
+    An item may also be a ``(samples, sample_rate)`` pair of already-decoded
+    audio, as accepted by ``analyze_speech_samples``.
+
+    Clips that are too short, contain no speech, or are undecodable get a
+    neutral result without touching the model; the voiced segments of the
+    rest go through SenseVoice as one padded batch.  Results line up with
+    ``clips``.  Never raises.
+    """
+    results = [_neutral_result() for _ in clips]
+
+    buffers: list[np.ndarray] = []
+    indices: list[int] = []
+    for i, clip in enumerate(clips):
+        try:
+            if isinstance(clip, tuple):
+                audio_data = _to_model_input(_as_samples(clip[0]), clip[1])
             else:
-                text = str(entry)
-        elif isinstance(result, dict):
-            text = result.get("text", "")
+                audio_data = _decode_audio(clip)
+        except Exception:
+            logger.exception("Audio decode failed for batch item %d", i)
+            continue
+        voiced = _voiced_audio(audio_data)
+        if voiced is not None:
+            buffers.append(voiced)
+            indices.append(i)
+
+    if not buffers:
+        return results
+
+    if _INFERENCE_MODE == "emotion":
+        try:
+            with stage("sensevoice_generate"):
+                logits = _emotion_logits(buffers)
+        except Exception:
+            logger.exception("analyze_speech_batch failed — returning neutral results")
+            return results
+        for i, buffer, row in zip(indices, buffers, logits):
+            results[i] = _result_from_emotions(
+                _emotion_distribution(row), len(buffer) / _TARGET_SAMPLE_RATE
+            )
+        return results
 
-        emotions = _parse_emotion_tags(text)
-        dominant = max(emotions, key=emotions.get)  # type: ignore[arg-type]
+    try:
+        model = _get_model()
+        with stage("sensevoice_generate"):
+            output = model.generate(
+                input=buffers,
+                fs=_TARGET_SAMPLE_RATE,
+                language="auto",
+                batch_size=len(buffers),
+            )
+    except Exception:
+        logger.exception("analyze_speech_batch failed — returning neutral results")
+        return results
+
+    if not isinstance(output, list) or len(output) != len(buffers):
+        logger.error(
+            "SenseVoice returned %s results for %d clips — returning neutral results",
+            len(output) if isinstance(output, list) else type(output).__name__,
+            len(buffers),
+        )
+        return results
+
+    for i, buffer, entry in zip(indices, buffers, output):
+        results[i] = _result_from_text(
+            _extract_text(entry), len(buffer) / _TARGET_SAMPLE_RATE
+        )
+    return results
 
-        angry_score = emotions.get("angry", 0.0)
-        is_concerning = angry_score > _CONCERNING_THRESHOLD
 
-        return SpeechEmotionResult(
-            emotions=emotions,
-            dominant=dominant,
-            is_concerning=is_concerning,
+def _analyze_buffer(audio_data: np.ndarray) -> SpeechEmotionResult:
+    """Run SenseVoice on the voiced part of a mono float32 buffer."""
+    voiced = _voiced_audio(audio_data)
+    if voiced is None:
+        return _neutral_result()
+
+    inferred_seconds = len(voiced) / _TARGET_SAMPLE_RATE
+    if _INFERENCE_MODE == "emotion":
+        with stage("sensevoice_generate"):
+            logits = _emotion_logits([voiced])
+        return _result_from_emotions(_emotion_distribution(logits[0]), inferred_seconds)
+
+    model = _get_model()
+    with stage("sensevoice_generate"):
+        result = model.generate(
+            input=voiced, fs=_TARGET_SAMPLE_RATE, language="auto"
         )
 
+    if not result:
+        return _neutral_result()
+
+    # FunASR returns a list of dicts — one per input.
+    if isinstance(result, list):
+        text = _extract_text(result[0])
+    else:
+        text = _extract_text(result)
+
+    return _result_from_text(text, inferred_seconds)
+
+
+def analyze_speech(audio_bytes: bytes) -> SpeechEmotionResult:
+    """Run speech emotion detection on a WAV, FLAC or Ogg Opus audio clip.
+
+    The decoded float32 buffer is handed to FunASR directly, so no
+    intermediate WAV is written to disk.
+
+    Args:
+        audio_bytes: Raw WAV audio data (ideally 16 kHz mono 16-bit PCM),
+            or the same audio encoded as FLAC or Ogg Opus to cut upload
+            size.  See ``eq_models.audio.compressed_formats``.
+
+    Returns:
+        SpeechEmotionResult with emotion scores, dominant emotion, and
+        concerning flag.  Never raises — returns a neutral result on any
+        failure.
+    """
+    try:
+        return _analyze_buffer(_decode_audio(audio_bytes))
     except Exception:
         logger.exception("analyze_speech failed — returning neutral result")
         return _neutral_result()
+
+
+def analyze_speech_samples(samples: np.ndarray, sample_rate: int) -> SpeechEmotionResult:
+    """Run speech emotion detection on already-decoded float samples.
+
+    Used by streaming callers that receive raw PCM rather than WAV files.
+
+    Args:
+        samples: Float audio in [-1, 1] or int16 PCM, shape (n,) or
+            (n, channels).  int16 is scaled while downmixing, without an
+            intermediate float copy.
+        sample_rate: Sample rate of ``samples`` in Hz.
+
+    Returns:
+        SpeechEmotionResult.  Never raises — returns a neutral result on
+        any failure.
+    """
+    try:
+        return _analyze_buffer(_to_model_input(_as_samples(samples), sample_rate))
+    except Exception:
+        logger.exception("analyze_speech_samples failed — returning neutral result")
+        return _neutral_result()
@@ -0,0 +1,202 @@
+"""Incremental sliding-window speech emotion over streamed audio.
+
+A SpeechStream ingests PCM chunks for one session and keeps the last
+``window_seconds`` of audio in a ring buffer.  As chunks arrive it computes
+Kaldi fbank frames for the *new* audio only and keeps those in a second
+ring, so overlapping windows never recompute the fbank for audio they
+share — each hop only pays for LFR/CMVN (cheap) and the encoder itself.
+
+Feature caching needs the SenseVoice frontend parameters, which are only
+available once the model has been loaded (see ``warmup_speech``).  Before
+that, windows fall back to the plain audio path.
+"""
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+
+from eq_models.models import SpeechEmotionResult
+from eq_models.speech import (
+    _TARGET_SAMPLE_RATE,
+    _analyze_buffer,
+    _analyze_features,
+    _fbank,
+    _frame_geometry,
+    _get_frontend,
+    _neutral_result,
+    _to_model_input,
+    _voice_segments,
+    _voiced_audio,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _RingBuffer:
+    """Fixed-capacity FIFO over the first axis of a numpy array."""
+
+    def __init__(self, capacity: int, row_shape: tuple[int, ...] = ()) -> None:
+        self.capacity = capacity
+        self._data = np.zeros((capacity, *row_shape), dtype=np.float32)
+        self._write = 0
+        self._filled = 0
+
+    def __len__(self) -> int:
+        return self._filled
+
+    def extend(self, rows: np.ndarray) -> None:
+        rows = rows[-self.capacity :]
+        n = len(rows)
+        end = self._write + n
+        if end <= self.capacity:
+            self._data[self._write : end] = rows
+        else:
+            split = self.capacity - self._write
+            self._data[self._write :] = rows[:split]
+            self._data[: n - split] = rows[split:]
+        self._write = end % self.capacity
+        self._filled = min(self.capacity, self._filled + n)
+
+    def ordered(self) -> np.ndarray:
+        """Copy of the buffered rows, oldest first."""
+        if self._filled < self.capacity:
+            return self._data[: self._filled].copy()
+        return np.concatenate((self._data[self._write :], self._data[: self._write]))
+
+
+@dataclass
+class SpeechWindow:
+    """Snapshot of one analysis window, safe to ship to a worker."""
+
+    audio: np.ndarray                 # float32 samples at the model rate
+    features: np.ndarray | None       # cached fbank frames, or None
+    feature_start: int = 0            # audio sample where features[0] starts
+    frame_length: int = 0             # fbank frame length in samples
+    frame_shift: int = 0              # fbank frame shift in samples (0 = unknown)
+
+
+def _voiced_features(window: SpeechWindow) -> np.ndarray | None:
+    """Cached fbank rows whose frames fall inside the window's voiced segments."""
+    if _voiced_audio(window.audio) is None:
+        return None
+    if not window.frame_shift:
+        return window.features
+    rows = []
+    for lo, hi in _voice_segments(window.audio):
+        first = max(0, -(-(lo - window.feature_start) // window.frame_shift))
+        last = (hi - window.frame_length - window.feature_start) // window.frame_shift
+        if last >= first:
+            rows.append(window.features[first : last + 1])
+    if not rows:
+        return None
+    return rows[0] if len(rows) == 1 else np.concatenate(rows)
+
+
+def analyze_speech_window(window: SpeechWindow) -> SpeechEmotionResult:
+    """Run speech emotion detection on a SpeechStream window.
+
+    Uses the cached fbank frames of the voiced segments when present,
+    otherwise the raw audio.  Never raises — returns a neutral result on
+    any failure.
+    """
+    try:
+        if window.features is None:
+            return _analyze_buffer(window.audio)
+        features = _voiced_features(window)
+        if features is None:
+            return _neutral_result()
+        inferred = (len(features) - 1) * window.frame_shift + window.frame_length
+        return _analyze_features(features, inferred / _TARGET_SAMPLE_RATE)
+    except Exception:
+        logger.exception("analyze_speech_window failed — returning neutral result")
+        return _neutral_result()
+
+
+class SpeechStream:
+    """Per-session audio ring buffer with incrementally cached fbank frames."""
+
+    def __init__(self, window_seconds: float = 4.0, hop_seconds: float = 1.0) -> None:
+        self.window_samples = int(window_seconds * _TARGET_SAMPLE_RATE)
+        self.hop_samples = max(1, int(hop_seconds * _TARGET_SAMPLE_RATE))
+        self._audio = _RingBuffer(self.window_samples)
+        self._since_emit = 0
+
+        # Feature cache state — set up lazily once the frontend is known.
+        self._frontend = None
+        self._features: _RingBuffer | None = None
+        self._pending = np.zeros(0, dtype=np.float32)   # samples not yet framed
+        self.frames_computed = 0
+
+    def push(self, samples: np.ndarray, sample_rate: int = _TARGET_SAMPLE_RATE) -> None:
+        """Append a chunk of float samples in [-1, 1].
+
+        Chunks at other rates are resampled one at a time, which can add a
+        tiny discontinuity at chunk edges; send model-rate audio to avoid it.
+        Resampling and fbank extraction are blocking CPU work, so async
+        callers should run this in an executor, one push at a time.
+        """
+        samples = _to_model_input(np.asarray(samples, dtype=np.float32), sample_rate)
+        self._audio.extend(samples)
+        self._since_emit += len(samples)
+        self._update_features(samples)
+
+    def _update_features(self, samples: np.ndarray) -> None:
+        if self._frontend is None:
+            self._frontend = _get_frontend()
+            if self._frontend is None:
+                return
+            frame_len, shift = _frame_geometry(self._frontend)
+            window_frames = 1 + max(0, self.window_samples - frame_len) // shift
+            self._features = _RingBuffer(window_frames, (self._frontend.n_mels,))
+            # Start framing from whatever audio is already buffered.
+            samples = self._audio.ordered()
+
+        frame_len, shift = _frame_geometry(self._frontend)
+        pending = np.concatenate((self._pending, samples))
+        if len(pending) < frame_len:
+            self._pending = pending
+            return
+        n_frames = 1 + (len(pending) - frame_len) // shift
+        used = (n_frames - 1) * shift + frame_len
+        try:
+            feats = _fbank(self._frontend, pending[:used])
+        except Exception:
+            logger.exception("Incremental fbank failed — falling back to audio windows")
+            self._frontend = None
+            self._features = None
+            self._pending = np.zeros(0, dtype=np.float32)
+            return
+        self._features.extend(feats)
+        self.frames_computed += len(feats)
+        # Keep the overlap so the next frame starts exactly one shift later.
+        self._pending = pending[n_frames * shift :]
+
+    @property
+    def due(self) -> bool:
+        """True once a hop's worth of new audio has arrived since the last window."""
+        return len(self._audio) > 0 and self._since_emit >= self.hop_samples
+
+    def take_window(self) -> SpeechWindow:
+        """Snapshot the current window and start counting the next hop."""
+        self._since_emit = 0
+        audio = self._audio.ordered()
+        if self._features is None or not len(self._features):
+            return SpeechWindow(audio=audio, features=None)
+
+        features = self._features.ordered()
+        frame_len, shift = _frame_geometry(self._frontend)
+        # The unframed tail begins where the next frame would start.
+        start = len(audio) - len(self._pending) - len(features) * shift
+        if start < 0:
+            # Oldest frames reach back past the buffered audio; drop them.
+            skip = -(-start // shift)
+            features = features[skip:]
+            start += skip * shift
+        return SpeechWindow(
+            audio=audio,
+            features=features,
+            feature_start=start,
+            frame_length=frame_len,
+            frame_shift=shift,
+        )
@@ -0,0 +1,39 @@
+"""Optional per-stage timing hooks.
+
+eq_models has no metrics dependency of its own.  A host such as the
+inference server installs an observer with ``set_stage_observer`` and each
+instrumented stage (image decode, face detection, emotion CNN, audio
+decode, resample, SenseVoice generate) reports ``(stage, seconds)`` to it.
+Observers are per process, so with a process-pool host each worker
+process must install its own.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+StageObserver = Callable[[str, float], None]
+
+_observer: StageObserver | None = None
+
+
+def set_stage_observer(observer: StageObserver | None) -> None:
+    """Install (or with None, remove) the process-wide stage observer."""
+    global _observer
+    _observer = observer
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block and report it to the observer, if one is set.
+
+    The observer is called only when the block completes normally, so
+    failed stages do not skew the latency distribution.
+    """
+    observer = _observer
+    if observer is None:
+        yield
+        return
+    start = time.perf_counter()
+    yield
+    observer(name, time.perf_counter() - start)
@@ -0,0 +1,124 @@
+"""Per-session face tracking that skips detection on stable frames.
+
+In a meeting the face barely moves between frames, so running the OpenCV
+detector on every frame is almost entirely redundant.  A FaceTracker keeps
+the last face box and a grayscale template of the face; on the next frame
+it template-matches inside a small search region around the old box and,
+if the match is confident, crops the face there and sends it straight to
+the emotion CNN.  Full detection re-runs every ``track_redetect_every``
+frames, when the match score drops below ``track_min_score``, or when
+there is no face being tracked.
+"""
+
+import logging
+
+import numpy as np
+
+from eq_models.config import config
+from eq_models.facial import (
+    _classify_faces,
+    _decode_frame,
+    _detect_face_box,
+    _emotion_input,
+    _neutral_result,
+    _result_from_probs,
+)
+from eq_models.models import FacialEmotionResult
+
+logger = logging.getLogger(__name__)
+
+_REDETECT_EVERY: int = config["facial"]["track_redetect_every"]
+_MIN_SCORE: float = config["facial"]["track_min_score"]
+_SEARCH_MARGIN: float = config["facial"]["track_search_margin"]
+
+
+class FaceTracker:
+    """Tracking state for one session's camera stream.
+
+    Holds only numpy arrays and ints, so it pickles cheaply and can be
+    shipped to a worker process alongside each frame.
+    """
+
+    def __init__(
+        self,
+        redetect_every: int = _REDETECT_EVERY,
+        min_score: float = _MIN_SCORE,
+        search_margin: float = _SEARCH_MARGIN,
+    ) -> None:
+        self.redetect_every = redetect_every
+        self.min_score = min_score
+        self.search_margin = search_margin
+        self.box: tuple[int, int, int, int] | None = None   # x, y, w, h
+        self.template: np.ndarray | None = None              # uint8 gray face
+        self.frames_since_detect = 0
+        self.detections = 0
+        self.tracked_frames = 0
+
+    def reset(self) -> None:
+        self.box = None
+        self.template = None
+        self.frames_since_detect = 0
+
+    def _track(self, gray: np.ndarray) -> tuple[int, int, int, int] | None:
+        """Template-match the last face near its old box; None if unsure."""
+        import cv2
+
+        x, y, w, h = self.box
+        mx, my = int(w * self.search_margin), int(h * self.search_margin)
+        x0, y0 = max(0, x - mx), max(0, y - my)
+        x1, y1 = min(gray.shape[1], x + w + mx), min(gray.shape[0], y + h + my)
+        region = gray[y0:y1, x0:x1]
+        if region.shape[0] < h or region.shape[1] < w:
+            return None
+        scores = cv2.matchTemplate(region, self.template, cv2.TM_CCOEFF_NORMED)
+        _, best, _, (bx, by) = cv2.minMaxLoc(scores)
+        if best < self.min_score:
+            return None
+        return x0 + bx, y0 + by, w, h
+
+    def analyze(self, image_bytes: bytes) -> FacialEmotionResult:
+        """Facial emotion for one frame, reusing the tracked face when possible.
+
+        Never raises — returns a neutral result on any failure.
+        """
+        try:
+            gray = _decode_frame(image_bytes)
+
+            box = None
+            if self.box is not None and self.frames_since_detect < self.redetect_every:
+                box = self._track(gray)
+
+            if box is not None:
+                self.frames_since_detect += 1
+                self.tracked_frames += 1
+            else:
+                box = _detect_face_box(gray)
+                self.detections += 1
+                self.frames_since_detect = 0
+                if box is None:
+                    self.reset()
+                    return _neutral_result()
+
+            x, y, w, h = box
+            self.box = box
+            self.template = gray[y : y + h, x : x + w].copy()
+
+            probs = _classify_faces(_emotion_input(gray, box)[np.newaxis])
+            return _result_from_probs(probs[0])
+
+        except Exception:
+            logger.exception("FaceTracker.analyze failed — returning neutral result")
+            self.reset()
+            return _neutral_result()
+
+
+def analyze_face_tracked(
+    tracker: FaceTracker, image_bytes: bytes
+) -> tuple[FacialEmotionResult, FaceTracker]:
+    """Run ``tracker.analyze`` and return the (possibly copied) tracker too.
+
+    Lets callers using a process pool carry tracker state across frames:
+    the worker gets a pickled copy, so the updated state must come back.
+    """
+    result = tracker.analyze(image_bytes)
+    return result, tracker
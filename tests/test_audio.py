@@ -0,0 +1,228 @@
+"""Unit tests for the fast-path audio ingestion module."""
+
+import io
+import math
+import struct
+
+import numpy as np
+import pytest
+import soundfile as sf
+from scipy.signal import resample_poly
+
+from eq_models.audio import (
+    _decimation_bank,
+    _parse_pcm16_wav,
+    _polyphase_filter,
+    _rational_bank,
+    compressed_formats,
+    decode_audio,
+    is_compressed,
+    resample,
+    to_mono,
+)
+
+
+# ─── Helpers ───
+
+
+def _tone(seconds: float, sample_rate: int, channels: int = 1) -> np.ndarray:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    mono = 0.5 * np.sin(2 * np.pi * 440.0 * t)
+    if channels == 1:
+        return mono.astype(np.float32)
+    return np.stack([mono * (c + 1) / channels for c in range(channels)], axis=1).astype(np.float32)
+
+
+def _wav(data: np.ndarray, sample_rate: int, subtype: str = "PCM_16") -> bytes:
+    buf = io.BytesIO()
+    sf.write(buf, data, sample_rate, format="WAV", subtype=subtype)
+    return buf.getvalue()
+
+
+def _encoded(data: np.ndarray, sample_rate: int, fmt: str, subtype: str) -> bytes:
+    buf = io.BytesIO()
+    sf.write(buf, data, sample_rate, format=fmt, subtype=subtype)
+    return buf.getvalue()
+
+
+def _reduced(up: int, down: int) -> tuple[int, int]:
+    g = math.gcd(up, down)
+    return up // g, down // g
+
+
+# ─── Tests: WAV header parsing ───
+
+
+class TestParsePcm16Wav:
+    def test_mono_matches_soundfile(self):
+        wav = _wav(_tone(0.5, 16000), 16000)
+        samples, rate = _parse_pcm16_wav(wav)
+        expected, _ = sf.read(io.BytesIO(wav), dtype="int16", always_2d=True)
+        assert rate == 16000
+        np.testing.assert_array_equal(samples, expected)
+
+    def test_stereo_shape(self):
+        samples, rate = _parse_pcm16_wav(_wav(_tone(0.5, 48000, channels=2), 48000))
+        assert rate == 48000
+        assert samples.shape == (24000, 2)
+
+    def test_view_does_not_copy(self):
+        wav = _wav(_tone(0.5, 16000), 16000)
+        samples, _ = _parse_pcm16_wav(wav)
+        assert np.shares_memory(samples, np.frombuffer(wav, dtype=np.uint8))
+
+    def test_skips_unknown_chunks(self):
+        wav = _wav(_tone(0.1, 16000), 16000)
+        extra = b"LIST" + struct.pack("<I", 3) + b"abc\x00"
+        patched = wav[:36] + extra + wav[36:]
+        samples, _ = _parse_pcm16_wav(patched)
+        assert samples.shape == (1600, 1)
+
+    def test_unset_data_size_reads_to_end(self):
+        wav = bytearray(_wav(_tone(0.1, 16000), 16000))
+        data_pos = wav.index(b"data")
+        wav[data_pos + 4 : data_pos + 8] = struct.pack("<I", 0)
+        samples, _ = _parse_pcm16_wav(bytes(wav))
+        assert samples.shape == (1600, 1)
+
+    @pytest.mark.parametrize("subtype", ["FLOAT", "PCM_24"])
+    def test_other_encodings_are_rejected(self, subtype):
+        assert _parse_pcm16_wav(_wav(_tone(0.1, 16000), 16000, subtype=subtype)) is None
+
+    def test_non_wav_is_rejected(self):
+        assert _parse_pcm16_wav(b"not a wav file at all") is None
+
+
+# ─── Tests: downmix & resampling ───
+
+
+class TestToMono:
+    def test_int16_is_scaled(self):
+        out = to_mono(np.array([[16384], [-32768]], dtype=np.int16))
+        np.testing.assert_allclose(out, [0.5, -1.0])
+        assert out.dtype == np.float32
+
+    def test_stereo_is_averaged(self):
+        out = to_mono(np.array([[0.2, 0.4], [-0.2, 0.0]], dtype=np.float32))
+        np.testing.assert_allclose(out, [0.3, -0.1], rtol=1e-6)
+
+
+class TestResample:
+    @pytest.mark.parametrize("orig_sr", [96000, 48000, 44100, 32000, 8000])
+    def test_matches_resample_poly(self, orig_sr):
+        audio = _tone(0.5, orig_sr)
+        out = resample(audio, orig_sr, 16000)
+        expected = resample_poly(audio, *_reduced(16000, orig_sr))
+        assert out.dtype == np.float32
+        assert len(out) == len(expected)
+        np.testing.assert_allclose(out, expected, atol=1e-5)
+
+    @pytest.mark.parametrize("orig_sr", [44100, 22050, 8000])
+    @pytest.mark.parametrize("n", [0, 1, 5, 441, 1000])
+    def test_rational_path_matches_resample_poly_on_short_input(self, orig_sr, n):
+        audio = np.random.default_rng(n).standard_normal(n).astype(np.float32)
+        out = resample(audio, orig_sr, 16000)
+        expected = resample_poly(audio, *_reduced(16000, orig_sr)) if n else np.zeros(0)
+        assert len(out) == len(expected)
+        np.testing.assert_allclose(out, expected, atol=1e-5)
+
+    def test_unwieldy_ratio_falls_back_to_upfirdn(self):
+        # 15992 Hz -> 16000 Hz is 2000/1999: within the factor cap, bank too large.
+        assert _rational_bank(2000, 1999) is None
+        audio = _tone(0.05, 15992)
+        out = resample(audio, 15992, 16000)
+        expected = resample_poly(audio, 2000, 1999)
+        np.testing.assert_allclose(out, expected, atol=1e-5)
+
+    def test_coprime_ratio_takes_uncached_fft_path(self):
+        _polyphase_filter.cache_clear()
+        audio = _tone(0.2, 44101)
+        out = resample(audio, 44101, 16000)
+
+        assert _polyphase_filter.cache_info().currsize == 0
+        assert out.dtype == np.float32
+        assert len(out) == len(resample_poly(audio, 16000, 44101))
+        # Away from the (circular) edges the tone survives intact.
+        expected = 0.5 * np.sin(2 * np.pi * 440.0 * np.arange(len(out)) / 16000)
+        np.testing.assert_allclose(out[400:-400], expected[400:-400], atol=1e-2)
+
+    @pytest.mark.parametrize("orig_sr", [0, -16000, 4000, 384000])
+    def test_out_of_range_rate_rejected(self, orig_sr):
+        with pytest.raises(ValueError, match="sample rate"):
+            resample(_tone(0.01, 16000), orig_sr, 16000)
+
+    def test_same_rate_is_passthrough(self):
+        audio = _tone(0.1, 16000)
+        assert resample(audio, 16000, 16000) is audio
+
+    @pytest.mark.parametrize(("orig_sr", "design"), [(44100, _rational_bank), (48000, _decimation_bank)])
+    def test_filter_is_cached_per_rate_pair(self, orig_sr, design):
+        design.cache_clear()
+        for _ in range(3):
+            resample(_tone(0.1, orig_sr), orig_sr, 16000)
+        info = design.cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
+
+
+# ─── Tests: decode_audio ───
+
+
+class TestDecodeAudio:
+    def test_stereo_48k_pcm16_to_16k_mono(self):
+        out = decode_audio(_wav(_tone(1.0, 48000, channels=2), 48000), 16000)
+        assert out.dtype == np.float32
+        assert out.ndim == 1
+        assert len(out) == 16000
+
+    def test_float_wav_falls_back_to_soundfile(self):
+        audio = _tone(0.5, 16000)
+        out = decode_audio(_wav(audio, 16000, subtype="FLOAT"), 16000)
+        np.testing.assert_allclose(out, audio, atol=1e-6)
+
+    def test_pcm16_matches_soundfile_float_read(self):
+        wav = _wav(_tone(0.5, 16000), 16000)
+        expected, _ = sf.read(io.BytesIO(wav), dtype="float32")
+        np.testing.assert_array_equal(decode_audio(wav, 16000), expected)
+
+
+# ─── Tests: compressed uploads ───
+
+
+@pytest.mark.skipif("flac" not in compressed_formats(), reason="libsndfile without FLAC")
+class TestDecodeFlac:
+    def test_flac_matches_pcm16_to_one_lsb(self):
+        # libsndfile's FLAC and WAV writers round float input differently.
+        audio = _tone(0.5, 16000)
+        expected = decode_audio(_wav(audio, 16000), 16000)
+        out = decode_audio(_encoded(audio, 16000, "FLAC", "PCM_16"), 16000)
+        assert out.dtype == np.float32
+        np.testing.assert_allclose(out, expected, rtol=0, atol=1.5 / 32768)
+
+    def test_stereo_48k_flac_to_16k_mono(self):
+        out = decode_audio(_encoded(_tone(1.0, 48000, channels=2), 48000, "FLAC", "PCM_16"), 16000)
+        assert out.ndim == 1
+        assert len(out) == 16000
+
+
+@pytest.mark.skipif("opus" not in compressed_formats(), reason="libsndfile without Opus")
+class TestDecodeOpus:
+    def test_opus_round_trip_is_close(self):
+        audio = _tone(1.0, 16000)
+        out = decode_audio(_encoded(audio, 16000, "OGG", "OPUS"), 16000)
+        assert out.dtype == np.float32
+        assert len(out) == len(audio)
+        assert np.abs(out[1000:-1000] - audio[1000:-1000]).max() < 0.05
+
+    def test_opus_is_much_smaller_than_wav(self):
+        audio = _tone(4.0, 16000)
+        assert len(_encoded(audio, 16000, "OGG", "OPUS")) < len(_wav(audio, 16000)) / 4
+
+
+class TestIsCompressed:
+    def test_wav_is_not_compressed(self):
+        assert not is_compressed(_wav(_tone(0.1, 16000), 16000))
+
+    def test_flac_and_ogg_magic(self):
+        assert is_compressed(b"fLaC" + b"\x00" * 8)
+        assert is_compressed(b"OggS" + b"\x00" * 8)
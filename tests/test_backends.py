@@ -0,0 +1,233 @@
+"""Unit tests for the pluggable ONNX Runtime inference backends.
+
+The emotion CNN tests build a tiny softmax graph with ``onnx.helper`` so
+they exercise a real ONNX Runtime session without exported weights; the
+SenseVoice wrapper is tested against a mocked ``funasr_onnx`` model.
+"""
+
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from eq_models import facial, speech
+from eq_models.backends import (
+    FACIAL_BACKENDS,
+    OnnxEmotionModel,
+    OnnxSenseVoice,
+    cap_threads,
+    check_backend,
+    onnx_session,
+    quantized_path,
+)
+from eq_models.export import quantize_onnx
+
+
+# ─── Helpers ───
+
+
+@pytest.fixture
+def softmax_model_path(tmp_path):
+    """An (N, 48, 48, 1) -> (N, 7) ONNX model: softmax over 7 pixel sums."""
+    onnx = pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    from onnx import TensorProto, helper
+
+    weights = np.zeros((48 * 48, 7), dtype=np.float32)
+    weights[:, 3] = 1.0  # every pixel votes "happy"
+    graph = helper.make_graph(
+        [
+            helper.make_node("Flatten", ["face"], ["flat"], axis=1),
+            helper.make_node("MatMul", ["flat", "w"], ["logits"]),
+            helper.make_node("Softmax", ["logits"], ["probs"], axis=1),
+        ],
+        "emotion",
+        [helper.make_tensor_value_info("face", TensorProto.FLOAT, [None, 48, 48, 1])],
+        [helper.make_tensor_value_info("probs", TensorProto.FLOAT, [None, 7])],
+        [helper.make_tensor("w", TensorProto.FLOAT, weights.shape, weights.ravel())],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)], ir_version=8)
+    path = tmp_path / "emotion.onnx"
+    onnx.save(model, str(path))
+    return path
+
+
+# ─── Backend selection ───
+
+
+class TestCheckBackend:
+    def test_known_backend_passes(self):
+        assert check_backend("onnx", FACIAL_BACKENDS, "facial.backend") == "onnx"
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(ValueError, match="facial.backend"):
+            check_backend("pytorch", FACIAL_BACKENDS, "facial.backend")
+
+
+# ─── ONNX sessions ───
+
+
+class TestOnnxSession:
+    def test_missing_model_raises(self, tmp_path):
+        pytest.importorskip("onnxruntime")
+        with pytest.raises(FileNotFoundError):
+            onnx_session(tmp_path / "missing.onnx")
+
+    def test_unknown_optimization_level_raises(self, softmax_model_path):
+        with pytest.raises(ValueError, match="optimization"):
+            onnx_session(softmax_model_path, optimization="maximum")
+
+    def test_threads_and_level_applied(self, softmax_model_path):
+        import onnxruntime as ort
+
+        session = onnx_session(softmax_model_path, threads=2, optimization="basic")
+        options = session.get_session_options()
+        assert options.intra_op_num_threads == 2
+        assert options.graph_optimization_level == ort.GraphOptimizationLevel.ORT_ENABLE_BASIC
+
+    @pytest.mark.parametrize("threads, expected", [(0, 2), (1, 1), (8, 2)])
+    def test_thread_cap_bounds_intra_op_threads(self, softmax_model_path, threads, expected):
+        with patch("eq_models.backends._THREAD_CAP", 2):
+            session = onnx_session(softmax_model_path, threads=threads)
+        assert session.get_session_options().intra_op_num_threads == expected
+
+    def test_cap_threads_covers_env_blas_and_opencv(self):
+        with (
+            patch.dict(os.environ),
+            patch("eq_models.backends._THREAD_CAP", 0),
+            patch("threadpoolctl.threadpool_limits") as limits,
+            patch("cv2.setNumThreads") as set_cv2,
+        ):
+            cap_threads(3)
+            from eq_models import backends
+
+            assert backends._THREAD_CAP == 3
+            assert os.environ["OPENBLAS_NUM_THREADS"] == "3"
+        limits.assert_called_once_with(limits=3)
+        set_cv2.assert_called_once_with(3)
+
+
+class TestOnnxEmotionModel:
+    def test_predict_matches_keras_contract(self, softmax_model_path):
+        model = OnnxEmotionModel(softmax_model_path, threads=1)
+        batch = np.full((3, 48, 48, 1), 0.01, dtype=np.float64)
+        preds = model.predict(batch, verbose=0)
+        assert preds.shape == (3, 7)
+        assert np.allclose(preds.sum(axis=1), 1.0, atol=1e-5)
+        assert (np.argmax(preds, axis=1) == 3).all()
+
+    def test_classify_faces_runs_on_onnx_backend(self, softmax_model_path):
+        with (
+            patch("eq_models.facial._BACKEND", "onnx"),
+            patch("eq_models.facial._ONNX_MODEL_PATH", str(softmax_model_path)),
+            patch("eq_models.facial._emotion_model", None),
+            patch("eq_models.facial._load_keras_emotion_model") as mock_keras,
+        ):
+            probs = facial._classify_faces(np.full((2, 48, 48), 0.5, dtype=np.float32))
+        mock_keras.assert_not_called()
+        assert probs.shape == (2, 7)
+        assert facial._result_from_probs(probs[0]).dominant == "happy"
+
+    def test_unknown_facial_backend_raises_on_load(self):
+        with (
+            patch("eq_models.facial._BACKEND", "pytorch"),
+            patch("eq_models.facial._emotion_model", None),
+        ):
+            with pytest.raises(ValueError):
+                facial._get_emotion_model()
+
+
+# ─── INT8 variants ───
+
+
+class TestQuantization:
+    def test_quantized_path_naming(self):
+        assert quantized_path("models/cnn.onnx") == Path("models/cnn.onnx")
+        assert quantized_path("models/cnn.onnx", "dynamic") == Path("models/cnn.int8-dynamic.onnx")
+        assert quantized_path("models/cnn.onnx", "static") == Path("models/cnn.int8-static.onnx")
+
+    def test_unknown_quantization_mode_raises(self):
+        with pytest.raises(ValueError, match="quantization"):
+            quantized_path("models/cnn.onnx", "int4")
+
+    @pytest.mark.parametrize("mode", ["dynamic", "static"])
+    def test_quantized_variant_loads_and_agrees(self, softmax_model_path, mode):
+        feeds = [{"face": np.full((1, 48, 48, 1), v, dtype=np.float32)} for v in (0.1, 0.5, 0.9)]
+        output = quantize_onnx(softmax_model_path, mode, feeds)
+        assert output == quantized_path(softmax_model_path, mode).resolve()
+
+        batch = np.full((2, 48, 48, 1), 0.5, dtype=np.float32)
+        fp32 = OnnxEmotionModel(softmax_model_path).predict(batch)
+        int8 = OnnxEmotionModel(softmax_model_path, quantization=mode).predict(batch)
+        assert (np.argmax(int8, axis=1) == np.argmax(fp32, axis=1)).all()
+
+    def test_static_without_calibration_raises(self, softmax_model_path):
+        with pytest.raises(ValueError, match="calibration"):
+            quantize_onnx(softmax_model_path, "static")
+
+
+# ─── SenseVoice ───
+
+
+def _fake_sensevoice(token_rows: list[list[int]]) -> MagicMock:
+    """Mock funasr_onnx model whose CTC argmax yields ``token_rows``."""
+    vocab = 8
+    logits = np.zeros((len(token_rows), max(map(len, token_rows)), vocab), dtype=np.float32)
+    for b, row in enumerate(token_rows):
+        logits[b, np.arange(len(row)), row] = 1.0
+    model = MagicMock()
+    model._get_lid.return_value = 0
+    model._get_tnid.return_value = 15
+    model.extract_feat.side_effect = lambda buffers: (
+        np.zeros((len(buffers), 10, 560), dtype=np.float32),
+        np.full(len(buffers), 10, dtype=np.int32),
+    )
+    model.infer.return_value = (logits, np.array([len(r) for r in token_rows]))
+    model.tokenizer.decode.side_effect = lambda ids: " ".join(map(str, ids))
+    return model
+
+
+class TestOnnxSenseVoice:
+    def _wrapper(self, model: MagicMock, batch_size: int = 1) -> OnnxSenseVoice:
+        wrapper = OnnxSenseVoice.__new__(OnnxSenseVoice)
+        wrapper._model = model
+        wrapper._batch_size = batch_size
+        return wrapper
+
+    def test_greedy_ctc_collapses_repeats_and_blanks(self):
+        wrapper = self._wrapper(_fake_sensevoice([[2, 2, 0, 3, 3, 0, 2]]))
+        output = wrapper.generate(np.zeros(16000, dtype=np.float32))
+        assert output == [{"text": "2 3 2"}]
+
+    def test_batch_uses_one_encoder_call(self):
+        model = _fake_sensevoice([[4], [5], [6]])
+        buffers = [np.zeros(16000, dtype=np.float32) for _ in range(3)]
+        output = self._wrapper(model).generate(input=buffers, fs=16000, batch_size=3)
+        assert model.infer.call_count == 1
+        assert [entry["text"] for entry in output] == ["4", "5", "6"]
+
+    def test_emotion_logits_read_the_emotion_query_frame(self):
+        model = _fake_sensevoice([[1, 7, 2, 3], [1, 5, 2, 3]])
+        buffers = [np.zeros(16000, dtype=np.float32) for _ in range(2)]
+        logits = self._wrapper(model, batch_size=2).emotion_logits(buffers)
+        assert logits.shape == (2, 8)
+        assert logits.argmax(axis=-1).tolist() == [7, 5]
+        model.tokenizer.decode.assert_not_called()
+
+    def test_speech_get_model_builds_onnx_backend(self):
+        with (
+            patch("eq_models.speech._BACKEND", "onnx"),
+            patch("eq_models.speech._model", None),
+            patch("eq_models.speech.OnnxSenseVoice") as mock_cls,
+        ):
+            model = speech._get_model()
+            assert speech._get_frontend() is None
+        assert model is mock_cls.return_value
+        mock_cls.assert_called_once_with(
+            speech._MODEL_PATH,
+            speech._ONNX_THREADS,
+            speech._ONNX_OPTIMIZATION,
+            quantization=speech._ONNX_QUANTIZATION,
+        )
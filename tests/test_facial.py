@@ -1,15 +1,26 @@
 """Unit tests for STORY-4.1 — Facial Emotion Detection (DeepFace).
 
-These tests mock DeepFace.analyze so they can run without a GPU or the
-actual model weights.  Integration tests with the real model should be
+These tests mock the face detector and emotion CNN so they can run without
+a GPU or the actual model weights.  Integration tests with the real model should be
 run separately on hardware that has DeepFace installed.
 """
 
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 
-from eq_models.facial import analyze_face, _neutral_result, _EMOTION_LABELS
+from eq_models.facial import (
+    analyze_face,
+    analyze_faces,
+    warmup_face,
+    _decode_frame,
+    _detect_face_box,
+    _emotion_input,
+    _neutral_result,
+    _DECODE_MAX_SIDE,
+    _EMOTION_LABELS,
+)
 from eq_models.models import FacialEmotionResult
 
 
@@ -26,41 +37,37 @@ def _make_dummy_jpeg() -> bytes:
     return buf.getvalue()
 
 
-def _deepface_response(
+def _emotion_probs(
     angry: float = 0.0,
     disgust: float = 0.0,
     fear: float = 0.0,
     happy: float = 0.0,
     sad: float = 0.0,
     surprise: float = 0.0,
-    neutral: float = 100.0,
-    dominant: str = "neutral",
-) -> list[dict]:
-    """Build a fake DeepFace.analyze response (percentages 0-100)."""
-    return [
-        {
-            "emotion": {
-                "angry": angry,
-                "disgust": disgust,
-                "fear": fear,
-                "happy": happy,
-                "sad": sad,
-                "surprise": surprise,
-                "neutral": neutral,
-            },
-            "dominant_emotion": dominant,
-        }
-    ]
-
-
-def _patch_deepface(return_value=None, side_effect=None):
-    """Create a patch for _get_deepface that returns a mock DeepFace module."""
-    mock_deepface = MagicMock()
+    neutral: float = 1.0,
+) -> list[float]:
+    """Build a fake emotion CNN output row (probabilities in label order)."""
+    return [angry, disgust, fear, happy, sad, surprise, neutral]
+
+
+def _patch_engine(probs=None, box=(0, 0, 1, 1), side_effect=None):
+    """Patch the face detector and emotion CNN.
+
+    ``probs`` is one output row, or one row per image; ``box`` is what the
+    detector finds, or None for no face.
+    """
+    rows = np.atleast_2d(np.asarray(_emotion_probs() if probs is None else probs, dtype=np.float64))
+    mock_model = MagicMock()
     if side_effect:
-        mock_deepface.analyze.side_effect = side_effect
+        mock_model.predict.side_effect = side_effect
     else:
-        mock_deepface.analyze.return_value = return_value
-    return patch("eq_models.facial._get_deepface", return_value=mock_deepface)
+        mock_model.predict.side_effect = lambda batch, verbose=0: np.resize(rows, (len(batch), 7))
+    mock_detector = MagicMock()
+    mock_detector.detectMultiScale.return_value = [] if box is None else [box]
+    return (
+        patch("eq_models.facial._get_face_detector", return_value=mock_detector),
+        patch("eq_models.facial._get_emotion_model", return_value=mock_model),
+    )
 
 
 # ─── Tests ───
@@ -80,9 +87,8 @@ class TestNeutralResult:
 
 class TestAnalyzeFaceHappyPath:
     def test_angry_face(self):
-        with _patch_deepface(_deepface_response(
-            angry=70.0, disgust=5.0, neutral=10.0, dominant="angry"
-        )):
+        p_det, p_model = _patch_engine(_emotion_probs(angry=0.70, disgust=0.05, neutral=0.25))
+        with p_det, p_model:
             result = analyze_face(_make_dummy_jpeg())
 
         assert isinstance(result, FacialEmotionResult)
@@ -91,9 +97,8 @@ class TestAnalyzeFaceHappyPath:
         assert result.is_concerning is True  # 0.70 + 0.05 = 0.75 > 0.40
 
     def test_happy_face(self):
-        with _patch_deepface(_deepface_response(
-            happy=85.0, neutral=10.0, dominant="happy"
-        )):
+        p_det, p_model = _patch_engine(_emotion_probs(happy=0.85, neutral=0.15))
+        with p_det, p_model:
             result = analyze_face(_make_dummy_jpeg())
 
         assert result.dominant == "happy"
@@ -101,14 +106,16 @@ class TestAnalyzeFaceHappyPath:
         assert result.is_concerning is False
 
     def test_neutral_face(self):
-        with _patch_deepface(_deepface_response(neutral=90.0, dominant="neutral")):
+        p_det, p_model = _patch_engine(_emotion_probs(happy=0.10, neutral=0.90))
+        with p_det, p_model:
             result = analyze_face(_make_dummy_jpeg())
 
         assert result.dominant == "neutral"
         assert result.is_concerning is False
 
     def test_all_seven_labels_present(self):
-        with _patch_deepface(_deepface_response()):
+        p_det, p_model = _patch_engine()
+        with p_det, p_model:
             result = analyze_face(_make_dummy_jpeg())
 
         assert set(result.emotions.keys()) == set(_EMOTION_LABELS)
@@ -116,13 +123,16 @@ class TestAnalyzeFaceHappyPath:
 
 class TestAnalyzeFaceEdgeCases:
     def test_no_face_detected_returns_neutral(self):
-        with _patch_deepface([]):
+        p_det, p_model = _patch_engine(box=None)
+        with p_det, p_model as mock_get_model:
             result = analyze_face(_make_dummy_jpeg())
 
         assert result == _neutral_result()
+        mock_get_model.return_value.predict.assert_not_called()
 
     def test_exception_returns_neutral(self):
-        with _patch_deepface(side_effect=RuntimeError("model failed")):
+        p_det, p_model = _patch_engine(side_effect=RuntimeError("model failed"))
+        with p_det, p_model:
             result = analyze_face(_make_dummy_jpeg())
 
         assert result == _neutral_result()
@@ -133,24 +143,168 @@ class TestAnalyzeFaceEdgeCases:
 
     def test_concerning_at_exact_threshold(self):
         # angry + disgust = 0.40 exactly — should NOT be concerning (> not >=).
-        with _patch_deepface(_deepface_response(
-            angry=30.0, disgust=10.0, neutral=60.0, dominant="neutral"
-        )):
+        p_det, p_model = _patch_engine(_emotion_probs(angry=0.30, disgust=0.10, neutral=0.60))
+        with p_det, p_model:
             result = analyze_face(_make_dummy_jpeg())
         assert result.is_concerning is False
 
     def test_concerning_just_above_threshold(self):
-        with _patch_deepface(_deepface_response(
-            angry=30.0, disgust=11.0, neutral=59.0, dominant="neutral"
-        )):
+        p_det, p_model = _patch_engine(_emotion_probs(angry=0.30, disgust=0.11, neutral=0.59))
+        with p_det, p_model:
             result = analyze_face(_make_dummy_jpeg())
         assert result.is_concerning is True  # 0.30 + 0.11 = 0.41 > 0.40
 
     def test_scores_normalized_to_0_1(self):
-        with _patch_deepface(_deepface_response(
-            angry=50.0, happy=50.0, dominant="angry"
-        )):
+        p_det, p_model = _patch_engine(_emotion_probs(angry=50.0, happy=50.0, neutral=0.0))
+        with p_det, p_model:
             result = analyze_face(_make_dummy_jpeg())
 
         for score in result.emotions.values():
             assert 0.0 <= score <= 1.0
+
+
+class TestWarmup:
+    def test_warmup_runs_detector_and_classifier(self):
+        p_det, p_model = _patch_engine()
+        with p_det as mock_get_detector, p_model as mock_get_model:
+            warmup_face()
+        mock_get_detector.return_value.detectMultiScale.assert_called_once()
+        assert mock_get_model.return_value.predict.call_args[0][0].shape == (1, 48, 48, 1)
+
+    def test_warmup_propagates_errors(self):
+        p_det, p_model = _patch_engine(side_effect=RuntimeError("weights missing"))
+        with p_det, p_model:
+            with pytest.raises(RuntimeError):
+                warmup_face()
+
+
+class TestLeanEngine:
+    def test_largest_face_is_classified(self):
+        detector = MagicMock()
+        detector.detectMultiScale.return_value = np.array([[5, 5, 10, 10], [20, 20, 40, 30]])
+        with patch("eq_models.facial._get_face_detector", return_value=detector):
+            assert _detect_face_box(np.zeros((100, 100), dtype=np.uint8)) == (20, 20, 40, 30)
+
+    def test_emotion_input_is_48x48_unit_range(self):
+        gray = np.full((100, 100), 255, dtype=np.uint8)
+        face = _emotion_input(gray, (10, 10, 60, 60))
+        assert face.shape == (48, 48)
+        assert face.dtype == np.float32
+        assert face.max() == pytest.approx(1.0)
+
+    def test_detector_and_cnn_share_one_grayscale_frame(self):
+        p_det, p_model = _patch_engine(box=(0, 0, 1, 1))
+        with p_det as mock_get_detector, p_model:
+            analyze_face(_make_jpeg(64, 48))
+        gray = mock_get_detector.return_value.detectMultiScale.call_args[0][0]
+        assert gray.shape == (48, 64)
+        assert gray.dtype == np.uint8
+
+    def test_deepface_analyze_is_not_used(self):
+        p_det, p_model = _patch_engine()
+        with p_det, p_model, patch("eq_models.facial._get_deepface") as mock_get_deepface:
+            analyze_face(_make_dummy_jpeg())
+        mock_get_deepface.return_value.analyze.assert_not_called()
+
+
+class TestAnalyzeFacesBatch:
+    def test_one_classifier_call_for_whole_batch(self):
+        probs = [
+            [0.7, 0.1, 0.0, 0.0, 0.0, 0.0, 0.2],
+            [0.0, 0.0, 0.0, 0.9, 0.0, 0.0, 0.1],
+        ]
+        p_det, p_model = _patch_engine(probs)
+        with p_det, p_model as mock_get_model:
+            results = analyze_faces([_make_dummy_jpeg(), _make_dummy_jpeg()])
+
+        mock_model = mock_get_model.return_value
+        mock_model.predict.assert_called_once()
+        assert mock_model.predict.call_args[0][0].shape == (2, 48, 48, 1)
+        assert [r.dominant for r in results] == ["angry", "happy"]
+        assert results[0].is_concerning is True
+        assert results[1].is_concerning is False
+
+    def test_probabilities_are_normalized(self):
+        p_det, p_model = _patch_engine([[2.0, 0.0, 0.0, 0.0, 0.0, 0.0, 2.0]])
+        with p_det, p_model:
+            (result,) = analyze_faces([_make_dummy_jpeg()])
+        assert result.emotions["angry"] == pytest.approx(0.5)
+        assert sum(result.emotions.values()) == pytest.approx(1.0)
+
+    def test_corrupted_item_is_neutral_others_scored(self):
+        p_det, p_model = _patch_engine([[0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0]])
+        with p_det, p_model:
+            results = analyze_faces([b"not-a-jpeg", _make_dummy_jpeg()])
+        assert results[0] == _neutral_result()
+        assert results[1].dominant == "happy"
+
+    def test_classifier_failure_returns_all_neutral(self):
+        p_det, p_model = _patch_engine([])
+        with p_det, p_model as mock_get_model:
+            mock_get_model.return_value.predict.side_effect = RuntimeError("oom")
+            results = analyze_faces([_make_dummy_jpeg(), _make_dummy_jpeg()])
+        assert results == [_neutral_result(), _neutral_result()]
+
+    def test_image_without_face_is_neutral(self):
+        p_det, p_model = _patch_engine(_emotion_probs(happy=1.0, neutral=0.0), box=None)
+        with p_det, p_model as mock_get_model:
+            (result,) = analyze_faces([_make_dummy_jpeg()])
+        assert result == _neutral_result()
+        mock_get_model.return_value.predict.assert_not_called()
+
+    def test_empty_batch(self):
+        assert analyze_faces([]) == []
+
+
+def _make_jpeg(width: int, height: int, color=(200, 30, 10)) -> bytes:
+    import io
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buf, "JPEG")
+    return buf.getvalue()
+
+
+class TestDecodeFrame:
+    def test_large_frame_is_downscaled_to_max_side(self):
+        assert _decode_frame(_make_jpeg(1920, 1080), max_side=640).shape == (360, 640)
+
+    def test_portrait_frame_limits_longest_side(self):
+        assert _decode_frame(_make_jpeg(1080, 1920), max_side=640).shape == (640, 360)
+
+    def test_small_frame_keeps_its_size(self):
+        assert _decode_frame(_make_jpeg(320, 240), max_side=640).shape == (240, 320)
+
+    def test_zero_max_side_keeps_full_resolution(self):
+        assert _decode_frame(_make_jpeg(1920, 1080), max_side=0).shape == (1080, 1920)
+
+    def test_output_is_luma_uint8(self):
+        frame = _decode_frame(_make_jpeg(64, 64, color=(200, 30, 10)), max_side=640)
+        assert frame.dtype == np.uint8
+        # ITU-R 601 luma of (200, 30, 10): 0.299*200 + 0.587*30 + 0.114*10 ≈ 79
+        assert abs(frame.mean() - 79) < 4
+
+    def test_grayscale_jpeg_is_downscaled(self):
+        import io
+        from PIL import Image
+
+        buf = io.BytesIO()
+        Image.new("L", (800, 600), 128).save(buf, "JPEG")
+        assert _decode_frame(buf.getvalue(), max_side=400).shape == (300, 400)
+
+    def test_non_jpeg_is_converted_to_grayscale(self):
+        import io
+        from PIL import Image
+
+        buf = io.BytesIO()
+        Image.new("RGBA", (100, 50), (255, 255, 255, 255)).save(buf, "PNG")
+        frame = _decode_frame(buf.getvalue(), max_side=40)
+        assert frame.shape == (20, 40)
+        assert frame.min() == 255
+
+    def test_analyze_face_sees_reduced_frame(self):
+        p_det, p_model = _patch_engine()
+        with p_det as mock_get_detector, p_model:
+            analyze_face(_make_jpeg(1920, 1080))
+        gray = mock_get_detector.return_value.detectMultiScale.call_args[0][0]
+        assert max(gray.shape) == _DECODE_MAX_SIDE
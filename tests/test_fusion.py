@@ -11,7 +11,11 @@ Config defaults used by fusion.py:
     red_threshold:   0.50   (fused >= 0.50 → RED)
 """
 
-from eq_models.fusion import compute_verdict
+import itertools
+
+import pytest
+
+from eq_models.fusion import compute_verdict, fused_score, settled_verdict
 from eq_models.models import FacialEmotionResult, SpeechEmotionResult, Verdict
 
 
@@ -148,6 +152,11 @@ class TestWeightAsymmetry:
         assert high_facial == Verdict.YELLOW
         assert high_speech == Verdict.GREEN
 
+    def test_fused_score_uses_configured_weights(self):
+        # fused = 0.5*0.6 + 0.5*0.4 = 0.50; 1.0*0.6 = 0.60
+        assert fused_score(_facial(angry=0.5), _speech(angry=0.5)) == pytest.approx(0.50)
+        assert fused_score(_facial(angry=1.0), _speech()) == pytest.approx(0.60)
+
 
 # ── AC5: Return type is a Verdict enum ──────────────────────────────
 
@@ -159,3 +168,46 @@ class TestVerdictEnum:
     def test_verdict_string_value(self):
         result = compute_verdict(_facial(), _speech())
         assert result.value == "GREEN"
+
+
+# ── Early exit: settled_verdict ─────────────────────────────────────
+
+class TestSettledVerdict:
+    def test_concerning_angry_face_settles_red(self):
+        # fused >= 0.6 * 0.5 = 0.30 → at least YELLOW, escalated → RED
+        assert settled_verdict(facial=_facial(angry=0.5, neutral=0.5, is_concerning=True)) == Verdict.RED
+
+    def test_very_angry_face_settles_red_without_escalation(self):
+        assert settled_verdict(facial=_facial(angry=0.9, neutral=0.1)) == Verdict.RED
+
+    def test_calm_face_leaves_verdict_open(self):
+        assert settled_verdict(facial=_facial()) is None
+
+    def test_concerning_angry_speech_settles_red(self):
+        assert settled_verdict(speech=_speech(angry=0.7, neutral=0.3, is_concerning=True)) == Verdict.RED
+
+    def test_mild_speech_leaves_verdict_open(self):
+        assert settled_verdict(speech=_speech(angry=0.3, neutral=0.7, is_concerning=False)) is None
+
+    def test_needs_exactly_one_modality(self):
+        with pytest.raises(ValueError):
+            settled_verdict()
+        with pytest.raises(ValueError):
+            settled_verdict(_facial(), _speech())
+
+    def test_settled_verdict_matches_every_outcome(self):
+        # Whenever one side settles, no result of the other side disagrees.
+        scores = [i / 10 for i in range(11)]
+        flags = (False, True)
+        for angry, concerning in itertools.product(scores, flags):
+            facial = _facial(angry=angry, neutral=1 - angry, is_concerning=concerning)
+            speech = _speech(angry=angry, neutral=1 - angry, is_concerning=concerning)
+            face_settled = settled_verdict(facial=facial)
+            speech_settled = settled_verdict(speech=speech)
+            for other, other_flag in itertools.product(scores, flags):
+                if face_settled is not None:
+                    other_speech = _speech(angry=other, neutral=1 - other, is_concerning=other_flag)
+                    assert compute_verdict(facial, other_speech) == face_settled
+                if speech_settled is not None:
+                    other_face = _facial(angry=other, neutral=1 - other, is_concerning=other_flag)
+                    assert compute_verdict(other_face, speech) == speech_settled
@@ -0,0 +1,81 @@
+"""Unit tests for frame-difference gating (FrameGate)."""
+
+import io
+from unittest.mock import MagicMock
+
+import numpy as np
+from PIL import Image
+
+from eq_models.gating import FrameGate, analyze_face_gated
+from eq_models.models import FacialEmotionResult
+
+
+def _jpeg(value: int = 128, noise_seed: int | None = None) -> bytes:
+    img = np.full((480, 640, 3), value, dtype=np.uint8)
+    if noise_seed is not None:
+        rng = np.random.default_rng(noise_seed)
+        img = np.clip(img + rng.integers(-2, 3, size=img.shape), 0, 255).astype(np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(img).save(buf, "JPEG", quality=90)
+    return buf.getvalue()
+
+
+def _result(dominant: str = "neutral") -> FacialEmotionResult:
+    return FacialEmotionResult(emotions={dominant: 1.0}, dominant=dominant, is_concerning=False)
+
+
+def _analyzer(*results):
+    return MagicMock(side_effect=list(results))
+
+
+class TestFrameGate:
+    def test_first_frame_is_analyzed(self):
+        gate = FrameGate(threshold=0.02, thumbnail_size=16, max_reuse=5)
+        fn = _analyzer(_result("happy"))
+        assert gate.analyze(_jpeg(), fn).dominant == "happy"
+        assert fn.call_count == 1
+        assert (gate.hits, gate.misses) == (0, 1)
+
+    def test_near_identical_frame_reuses_result(self):
+        gate = FrameGate(threshold=0.02, thumbnail_size=16, max_reuse=5)
+        fn = _analyzer(_result("happy"), _result("angry"))
+        gate.analyze(_jpeg(noise_seed=0), fn)
+        assert gate.analyze(_jpeg(noise_seed=1), fn).dominant == "happy"
+        assert fn.call_count == 1
+        assert gate.hit_rate == 0.5
+
+    def test_changed_frame_is_reanalyzed(self):
+        gate = FrameGate(threshold=0.02, thumbnail_size=16, max_reuse=5)
+        fn = _analyzer(_result("happy"), _result("angry"))
+        gate.analyze(_jpeg(value=100), fn)
+        assert gate.analyze(_jpeg(value=200), fn).dominant == "angry"
+        assert fn.call_count == 2
+
+    def test_max_reuse_forces_refresh(self):
+        gate = FrameGate(threshold=0.02, thumbnail_size=16, max_reuse=2)
+        fn = _analyzer(*[_result()] * 3)
+        for _ in range(4):
+            gate.analyze(_jpeg(), fn)
+        # analyze, reuse, reuse, analyze
+        assert fn.call_count == 2
+        assert gate.hits == 2
+
+    def test_undecodable_frame_passes_through(self):
+        gate = FrameGate()
+        fn = _analyzer(_result())
+        gate.analyze(b"not-an-image", fn)
+        fn.assert_called_once_with(b"not-an-image")
+
+    def test_hit_rate_without_frames(self):
+        assert FrameGate().hit_rate == 0.0
+
+
+class TestAnalyzeFaceGated:
+    def test_uses_tracker_on_miss_and_returns_state(self):
+        gate = FrameGate()
+        tracker = MagicMock()
+        tracker.analyze.return_value = _result("sad")
+        result, gate_out, tracker_out = analyze_face_gated(gate, tracker, _jpeg())
+        assert result.dominant == "sad"
+        assert gate_out is gate and tracker_out is tracker
+        tracker.analyze.assert_called_once()
@@ -5,17 +5,24 @@ the SenseVoice model weights.
 """
 
 import io
+import re
 from unittest.mock import MagicMock, patch
 
 import numpy as np
 import pytest
 import soundfile as sf
 
+from eq_models.backends import SENSEVOICE_EMOTION_FRAME
 from eq_models.models import SpeechEmotionResult
 from eq_models.speech import (
+    _EMOTION_TOKEN_IDS,
+    _emotion_distribution,
     _neutral_result,
     _parse_emotion_tags,
     analyze_speech,
+    analyze_speech_batch,
+    analyze_speech_samples,
+    warmup_speech,
 )
 
 
@@ -49,6 +56,16 @@ def _make_short_wav(duration: float = 0.5, sample_rate: int = 16000) -> bytes:
     return _make_wav(duration=duration, sample_rate=sample_rate)
 
 
+def _tone_in_silence(bursts: list[tuple[float, float]], duration: float = 4.0) -> np.ndarray:
+    """16 kHz buffer of silence with a 300 Hz tone over each (start, end) second range."""
+    data = np.zeros(int(16000 * duration), dtype=np.float32)
+    for start, end in bursts:
+        lo, hi = int(start * 16000), int(end * 16000)
+        t = np.arange(hi - lo) / 16000
+        data[lo:hi] = 0.5 * np.sin(2 * np.pi * 300.0 * t)
+    return data
+
+
 # ─── Tests: _parse_emotion_tags ───
 
 
@@ -76,6 +93,13 @@ class TestParseEmotionTags:
         emotions = _parse_emotion_tags("<|happy|>")
         assert emotions["happy"] == 1.0
 
+    def test_emotion_frame_matches_rich_tag_position(self):
+        # Raw SenseVoice output: <|lang|><|EMO|><|Event|><|itn|> then text.
+        text = "<|en|><|ANGRY|><|Speech|><|withitn|>Leave me alone."
+        tags = re.findall(r"<\|[^|]+\|>", text)
+        assert _parse_emotion_tags(tags[SENSEVOICE_EMOTION_FRAME])["angry"] == 1.0
+        assert _parse_emotion_tags(text)["angry"] == 1.0
+
 
 # ─── Tests: _neutral_result ───
 
@@ -202,3 +226,286 @@ class TestAnalyzeSpeechEdgeCases:
 
         result = analyze_speech(buf.getvalue())
         assert isinstance(result, SpeechEmotionResult)
+
+
+class TestInMemoryInference:
+    @patch("eq_models.speech._get_model")
+    def test_generate_receives_float32_buffer(self, mock_get_model):
+        mock_model = MagicMock()
+        mock_model.generate.return_value = [{"text": "<|NEUTRAL|>"}]
+        mock_get_model.return_value = mock_model
+
+        analyze_speech(_make_wav(duration=2.0))
+
+        kwargs = mock_model.generate.call_args.kwargs
+        audio = kwargs["input"]
+        assert isinstance(audio, np.ndarray)
+        assert audio.dtype == np.float32
+        assert audio.ndim == 1
+        assert len(audio) == 32000
+        assert kwargs["fs"] == 16000
+
+    @patch("eq_models.speech._get_model")
+    def test_resampled_buffer_is_at_target_rate(self, mock_get_model):
+        mock_model = MagicMock()
+        mock_model.generate.return_value = [{"text": "<|NEUTRAL|>"}]
+        mock_get_model.return_value = mock_model
+
+        analyze_speech(_make_wav(duration=2.0, sample_rate=48000))
+
+        audio = mock_model.generate.call_args.kwargs["input"]
+        assert len(audio) == pytest.approx(32000, abs=2)
+
+
+class TestWarmup:
+    @patch("eq_models.speech._get_model")
+    def test_warmup_loads_model_and_runs_clip(self, mock_get_model):
+        mock_model = MagicMock()
+        mock_get_model.return_value = mock_model
+
+        warmup_speech()
+
+        audio = mock_model.generate.call_args.kwargs["input"]
+        assert audio.dtype == np.float32
+        assert len(audio) == 16000
+
+    @patch("eq_models.speech._get_model")
+    def test_warmup_propagates_errors(self, mock_get_model):
+        mock_get_model.side_effect = RuntimeError("model load failed")
+        with pytest.raises(RuntimeError):
+            warmup_speech()
+
+
+class TestAnalyzeSpeechBatch:
+    @patch("eq_models.speech._get_model")
+    def test_one_generate_call_for_whole_batch(self, mock_get_model):
+        mock_model = MagicMock()
+        mock_model.generate.return_value = [
+            {"text": "<|ANGRY|> no"},
+            {"text": "<|HAPPY|> yes"},
+        ]
+        mock_get_model.return_value = mock_model
+
+        results = analyze_speech_batch([_make_wav(), _make_wav()])
+
+        mock_model.generate.assert_called_once()
+        kwargs = mock_model.generate.call_args.kwargs
+        assert len(kwargs["input"]) == 2
+        assert kwargs["batch_size"] == 2
+        assert [r.dominant for r in results] == ["angry", "happy"]
+
+    @patch("eq_models.speech._get_model")
+    def test_silent_and_corrupt_clips_skip_the_model(self, mock_get_model):
+        mock_model = MagicMock()
+        mock_model.generate.return_value = [{"text": "<|SAD|>"}]
+        mock_get_model.return_value = mock_model
+
+        results = analyze_speech_batch([_make_silence_wav(), b"not-wav", _make_wav()])
+
+        assert len(mock_model.generate.call_args.kwargs["input"]) == 1
+        assert results[0] == _neutral_result()
+        assert results[1] == _neutral_result()
+        assert results[2].dominant == "sad"
+
+    @patch("eq_models.speech._get_model")
+    def test_result_count_mismatch_returns_neutral(self, mock_get_model):
+        mock_model = MagicMock()
+        mock_model.generate.return_value = [{"text": "<|ANGRY|>"}]
+        mock_get_model.return_value = mock_model
+
+        results = analyze_speech_batch([_make_wav(), _make_wav()])
+        assert results == [_neutral_result(), _neutral_result()]
+
+    @patch("eq_models.speech._get_model")
+    def test_model_failure_returns_neutral(self, mock_get_model):
+        mock_get_model.side_effect = RuntimeError("model load failed")
+        assert analyze_speech_batch([_make_wav()]) == [_neutral_result()]
+
+    @patch("eq_models.speech._get_model")
+    def test_decoded_sample_items_join_batch(self, mock_get_model):
+        mock_model = MagicMock()
+        mock_model.generate.return_value = [{"text": "<|ANGRY|>"}, {"text": "<|SAD|>"}]
+        mock_get_model.return_value = mock_model
+
+        t = np.linspace(0, 2.0, 64000, endpoint=False)
+        pcm = (8000 * np.sin(2 * np.pi * 300 * t)).astype(np.int16)
+        results = analyze_speech_batch([_make_wav(), (pcm, 32000)])
+
+        assert [r.dominant for r in results] == ["angry", "sad"]
+        audio = mock_model.generate.call_args.kwargs["input"][1]
+        assert audio.dtype == np.float32
+        assert len(audio) == pytest.approx(32000, abs=2)
+
+
+class TestAnalyzeSpeechSamples:
+    @patch("eq_models.speech._get_model")
+    def test_pcm_samples_reach_model_at_target_rate(self, mock_get_model):
+        mock_model = MagicMock()
+        mock_model.generate.return_value = [{"text": "<|ANGRY|>"}]
+        mock_get_model.return_value = mock_model
+
+        t = np.linspace(0, 2.0, 96000, endpoint=False)
+        samples = 0.5 * np.sin(2 * np.pi * 300 * t)
+        result = analyze_speech_samples(samples, 48000)
+
+        assert result.dominant == "angry"
+        audio = mock_model.generate.call_args.kwargs["input"]
+        assert audio.dtype == np.float32
+        assert len(audio) == pytest.approx(32000, abs=2)
+
+    @patch("eq_models.speech._get_model")
+    def test_int16_samples_are_scaled(self, mock_get_model):
+        mock_model = MagicMock()
+        mock_model.generate.return_value = [{"text": "<|ANGRY|>"}]
+        mock_get_model.return_value = mock_model
+
+        t = np.linspace(0, 2.0, 32000, endpoint=False)
+        pcm = (16384 * np.sin(2 * np.pi * 300 * t)).astype(np.int16)
+        analyze_speech_samples(np.stack([pcm, pcm], axis=1), 16000)
+
+        audio = mock_model.generate.call_args.kwargs["input"]
+        assert audio.dtype == np.float32
+        assert np.abs(audio).max() == pytest.approx(0.5, abs=0.01)
+
+    def test_silent_samples_return_neutral(self):
+        assert analyze_speech_samples(np.zeros(32000), 16000) == _neutral_result()
+
+
+class TestVoiceActivity:
+    @patch("eq_models.speech._get_model")
+    def test_only_voiced_audio_reaches_model(self, mock_get_model):
+        mock_model = MagicMock()
+        mock_model.generate.return_value = [{"text": "<|ANGRY|>"}]
+        mock_get_model.return_value = mock_model
+
+        result = analyze_speech_samples(_tone_in_silence([(1.5, 2.0)]), 16000)
+
+        audio = mock_model.generate.call_args.kwargs["input"]
+        # 0.5 s of speech plus 100 ms of padding either side, to frame precision.
+        assert len(audio) / 16000 == pytest.approx(0.7, abs=0.06)
+        assert result.dominant == "angry"
+        assert result.inferred_seconds == pytest.approx(len(audio) / 16000)
+
+    @patch("eq_models.speech._get_model")
+    def test_separate_segments_are_concatenated(self, mock_get_model):
+        mock_model = MagicMock()
+        mock_model.generate.return_value = [{"text": "<|NEUTRAL|>"}]
+        mock_get_model.return_value = mock_model
+
+        analyze_speech_samples(_tone_in_silence([(0.5, 1.0), (3.0, 3.5)]), 16000)
+
+        audio = mock_model.generate.call_args.kwargs["input"]
+        assert len(audio) / 16000 == pytest.approx(1.4, abs=0.12)
+
+    @patch("eq_models.speech._get_model")
+    def test_short_pauses_are_bridged(self, mock_get_model):
+        mock_model = MagicMock()
+        mock_model.generate.return_value = [{"text": "<|NEUTRAL|>"}]
+        mock_get_model.return_value = mock_model
+
+        analyze_speech_samples(_tone_in_silence([(1.0, 1.5), (1.6, 2.0)]), 16000)
+
+        audio = mock_model.generate.call_args.kwargs["input"]
+        assert len(audio) / 16000 == pytest.approx(1.2, abs=0.06)
+
+    @patch("eq_models.speech._get_model")
+    def test_noise_without_speech_skips_model(self, mock_get_model):
+        noise = np.random.default_rng(0).uniform(-0.2, 0.2, 64000).astype(np.float32)
+        assert analyze_speech_samples(noise, 16000) == _neutral_result()
+        mock_get_model.assert_not_called()
+
+    @patch("eq_models.speech._get_model")
+    def test_blip_below_min_speech_skips_model(self, mock_get_model):
+        result = analyze_speech_samples(_tone_in_silence([(2.0, 2.1)]), 16000)
+        assert result == _neutral_result()
+        mock_get_model.assert_not_called()
+
+    @patch("eq_models.speech._VAD_ENABLED", False)
+    @patch("eq_models.speech._get_model")
+    def test_disabled_vad_sends_whole_clip(self, mock_get_model):
+        mock_model = MagicMock()
+        mock_model.generate.return_value = [{"text": "<|NEUTRAL|>"}]
+        mock_get_model.return_value = mock_model
+
+        result = analyze_speech_samples(_tone_in_silence([(1.5, 2.0)]), 16000)
+
+        assert len(mock_model.generate.call_args.kwargs["input"]) == 64000
+        assert result.inferred_seconds == pytest.approx(4.0)
+
+    @patch("eq_models.speech._get_model")
+    def test_batch_reports_inferred_seconds_per_clip(self, mock_get_model):
+        mock_model = MagicMock()
+        mock_model.generate.return_value = [{"text": "<|NEUTRAL|>"}, {"text": "<|NEUTRAL|>"}]
+        mock_get_model.return_value = mock_model
+
+        buf = io.BytesIO()
+        sf.write(buf, _tone_in_silence([(1.5, 2.0)]), 16000, format="WAV", subtype="PCM_16")
+        results = analyze_speech_batch([_make_wav(duration=2.0), buf.getvalue()])
+
+        assert results[0].inferred_seconds == pytest.approx(2.0)
+        assert results[1].inferred_seconds == pytest.approx(0.7, abs=0.06)
+
+
+# ─── Tests: emotion-only inference mode ───
+
+
+def _emotion_logits_row(**scores: float) -> np.ndarray:
+    """A vocabulary-sized logits row with the given emotion-token logits."""
+    row = np.full(25055, -5.0, dtype=np.float32)
+    for label, token in zip(["angry", "happy", "sad", "neutral"], _EMOTION_TOKEN_IDS):
+        row[token] = scores.get(label, 0.0)
+    return row
+
+
+class TestEmotionDistribution:
+    def test_softmax_over_emotion_tokens(self):
+        emotions = _emotion_distribution(_emotion_logits_row(angry=2.0, neutral=1.0))
+        assert list(emotions) == ["angry", "happy", "sad", "neutral"]
+        assert sum(emotions.values()) == pytest.approx(1.0)
+        assert emotions["angry"] > emotions["neutral"] > emotions["happy"] == emotions["sad"]
+
+    def test_other_vocabulary_logits_ignored(self):
+        row = _emotion_logits_row()
+        row[0] = 100.0
+        assert _emotion_distribution(row)["angry"] == pytest.approx(0.25)
+
+
+@patch("eq_models.speech._INFERENCE_MODE", "emotion")
+class TestEmotionOnlyMode:
+    @patch("eq_models.speech._emotion_logits")
+    @patch("eq_models.speech._get_model")
+    def test_probabilities_without_transcription(self, mock_get_model, mock_logits):
+        mock_logits.return_value = np.stack([_emotion_logits_row(angry=3.0, sad=1.0)])
+
+        result = analyze_speech(_make_wav())
+
+        mock_get_model.return_value.generate.assert_not_called()
+        assert result.dominant == "angry"
+        assert 0.0 < result.emotions["sad"] < result.emotions["angry"] < 1.0
+        assert result.is_concerning is True
+        assert result.inferred_seconds > 0
+
+    @patch("eq_models.speech._emotion_logits")
+    def test_batch_runs_one_encoder_pass(self, mock_logits):
+        mock_logits.return_value = np.stack(
+            [_emotion_logits_row(happy=4.0), _emotion_logits_row(neutral=4.0)]
+        )
+
+        results = analyze_speech_batch([_make_wav(), _make_silence_wav(), _make_wav()])
+
+        mock_logits.assert_called_once()
+        assert len(mock_logits.call_args.args[0]) == 2
+        assert [r.dominant for r in results] == ["happy", "neutral", "neutral"]
+        assert results[1] == _neutral_result()
+
+    @patch("eq_models.speech._emotion_logits", side_effect=RuntimeError("encoder failed"))
+    def test_encoder_failure_returns_neutral(self, mock_logits):
+        assert analyze_speech(_make_wav()) == _neutral_result()
+        assert analyze_speech_batch([_make_wav()]) == [_neutral_result()]
+
+    @patch("eq_models.speech._emotion_logits")
+    @patch("eq_models.speech._get_model")
+    def test_warmup_uses_encoder_path(self, mock_get_model, mock_logits):
+        warmup_speech()
+        mock_logits.assert_called_once()
+        mock_get_model.return_value.generate.assert_not_called()
@@ -0,0 +1,139 @@
+"""Unit tests for incremental sliding-window speech (SpeechStream).
+
+The SenseVoice frontend and fbank are replaced with a small per-frame fake
+so the framing and caching logic can be checked without torch/FunASR.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from eq_models.models import SpeechEmotionResult
+from eq_models.speech import _neutral_result
+from eq_models.streaming import SpeechStream, SpeechWindow, analyze_speech_window
+
+_FRONTEND = SimpleNamespace(fs=16000, frame_length=25, frame_shift=10, n_mels=2, window="hamming")
+
+
+def _fake_fbank(frontend, audio: np.ndarray) -> np.ndarray:
+    """One row per 25 ms frame (10 ms shift): [frame mean, frame start value]."""
+    n = 1 + (len(audio) - 400) // 160
+    return np.array(
+        [[audio[i * 160 : i * 160 + 400].mean(), audio[i * 160]] for i in range(n)],
+        dtype=np.float32,
+    )
+
+
+def _signal(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * 16000), dtype=np.float32) / 16000
+    return (0.3 * np.sin(2 * np.pi * 3.0 * t) + t / 100).astype(np.float32)
+
+
+def _patched_frontend():
+    return (
+        patch("eq_models.streaming._get_frontend", return_value=_FRONTEND),
+        patch("eq_models.streaming._fbank", side_effect=_fake_fbank),
+    )
+
+
+class TestSpeechStreamBuffering:
+    def test_due_after_one_hop(self):
+        stream = SpeechStream(window_seconds=4.0, hop_seconds=1.0)
+        stream.push(_signal(0.5))
+        assert stream.due is False
+        stream.push(_signal(0.5))
+        assert stream.due is True
+        stream.take_window()
+        assert stream.due is False
+
+    def test_window_holds_last_window_seconds(self):
+        stream = SpeechStream(window_seconds=1.0, hop_seconds=0.5)
+        signal = _signal(3.0)
+        for chunk in np.array_split(signal, 7):
+            stream.push(chunk)
+        np.testing.assert_array_equal(stream.take_window().audio, signal[-16000:])
+
+    def test_no_features_before_model_is_loaded(self):
+        with patch("eq_models.streaming._get_frontend", return_value=None):
+            stream = SpeechStream()
+            stream.push(_signal(1.0))
+            assert stream.take_window().features is None
+
+
+class TestIncrementalFeatures:
+    def test_chunked_features_match_whole_window(self):
+        signal = _signal(2.0)
+        p_frontend, p_fbank = _patched_frontend()
+        with p_frontend, p_fbank:
+            stream = SpeechStream(window_seconds=2.0, hop_seconds=0.5)
+            for chunk in np.array_split(signal, 13):
+                stream.push(chunk)
+            window = stream.take_window()
+        np.testing.assert_allclose(window.features, _fake_fbank(_FRONTEND, signal), rtol=1e-6)
+
+    def test_overlapping_windows_only_featurize_new_audio(self):
+        p_frontend, p_fbank = _patched_frontend()
+        with p_frontend, p_fbank:
+            stream = SpeechStream(window_seconds=4.0, hop_seconds=1.0)
+            for _ in range(8):
+                stream.push(_signal(1.0))
+                stream.take_window()
+        # 8 s of audio at a 10 ms shift is ~800 frames, not 8 x 400.
+        assert stream.frames_computed == pytest.approx(800, abs=3)
+
+    def test_feature_window_is_bounded(self):
+        p_frontend, p_fbank = _patched_frontend()
+        with p_frontend, p_fbank:
+            stream = SpeechStream(window_seconds=1.0, hop_seconds=0.5)
+            stream.push(_signal(5.0))
+            features = stream.take_window().features
+        assert len(features) == 1 + (16000 - 400) // 160
+
+
+class TestAnalyzeSpeechWindow:
+    def test_uses_features_when_cached(self):
+        result = SpeechEmotionResult(emotions={"angry": 1.0}, dominant="angry", is_concerning=True)
+        window = SpeechWindow(audio=_signal(2.0), features=np.zeros((10, 2), dtype=np.float32))
+        with patch("eq_models.streaming._analyze_features", return_value=result) as mock_feats:
+            assert analyze_speech_window(window) == result
+        mock_feats.assert_called_once()
+
+    def test_features_are_trimmed_to_voiced_frames(self):
+        signal = np.zeros(32000, dtype=np.float32)
+        t = np.arange(8000) / 16000
+        signal[16000:24000] = 0.5 * np.sin(2 * np.pi * 300.0 * t)
+        p_frontend, p_fbank = _patched_frontend()
+        with p_frontend, p_fbank, patch(
+            "eq_models.streaming._analyze_features", return_value=_neutral_result()
+        ) as mock_feats:
+            stream = SpeechStream(window_seconds=2.0, hop_seconds=0.5)
+            for chunk in np.array_split(signal, 9):
+                stream.push(chunk)
+            window = stream.take_window()
+            analyze_speech_window(window)
+
+        features, inferred = mock_feats.call_args.args
+        # 0.5 s of speech plus 100 ms padding either side at a 10 ms shift.
+        assert len(features) == pytest.approx(68, abs=6)
+        # Every frame touching the tone survives the trim.
+        assert (features != 0).any(axis=1).sum() == (window.features != 0).any(axis=1).sum()
+        assert inferred == pytest.approx(0.7, abs=0.06)
+
+    def test_silent_window_skips_model(self):
+        window = SpeechWindow(audio=np.zeros(32000, dtype=np.float32), features=np.zeros((10, 2)))
+        with patch("eq_models.streaming._analyze_features") as mock_feats:
+            assert analyze_speech_window(window) == _neutral_result()
+        mock_feats.assert_not_called()
+
+    def test_falls_back_to_audio_path(self):
+        window = SpeechWindow(audio=_signal(2.0), features=None)
+        with patch("eq_models.streaming._analyze_buffer", return_value=_neutral_result()) as mock_buf:
+            analyze_speech_window(window)
+        mock_buf.assert_called_once()
+
+    def test_failure_returns_neutral(self):
+        window = SpeechWindow(audio=_signal(2.0), features=np.zeros((10, 2)))
+        with patch("eq_models.streaming._analyze_features", side_effect=RuntimeError("boom")):
+            assert analyze_speech_window(window) == _neutral_result()
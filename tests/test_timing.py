@@ -0,0 +1,48 @@
+"""Unit tests for the per-stage timing hooks."""
+
+import numpy as np
+import pytest
+
+from eq_models.audio import decode_audio
+from eq_models.timing import set_stage_observer, stage
+
+
+@pytest.fixture
+def recorded():
+    """Install a recording observer for the duration of a test."""
+    calls: list[tuple[str, float]] = []
+    set_stage_observer(lambda name, seconds: calls.append((name, seconds)))
+    yield calls
+    set_stage_observer(None)
+
+
+class TestStage:
+    def test_reports_name_and_duration(self, recorded):
+        with stage("emotion_cnn"):
+            pass
+        assert len(recorded) == 1
+        name, seconds = recorded[0]
+        assert name == "emotion_cnn"
+        assert seconds >= 0.0
+
+    def test_failed_stage_not_reported(self, recorded):
+        with pytest.raises(RuntimeError):
+            with stage("emotion_cnn"):
+                raise RuntimeError("boom")
+        assert recorded == []
+
+    def test_no_observer_is_a_no_op(self):
+        set_stage_observer(None)
+        with stage("emotion_cnn"):
+            value = 1
+        assert value == 1
+
+    def test_decode_audio_reports_decode_and_resample(self, recorded):
+        import io
+
+        import soundfile as sf
+
+        buf = io.BytesIO()
+        sf.write(buf, np.zeros(4800, dtype=np.float32), 48000, format="WAV", subtype="PCM_16")
+        decode_audio(buf.getvalue(), 16000)
+        assert [name for name, _ in recorded] == ["audio_decode", "resample"]
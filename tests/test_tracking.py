@@ -0,0 +1,113 @@
+"""Unit tests for per-session face tracking (FaceTracker).
+
+Face detection and the emotion CNN are mocked; the template-matching
+tracker itself runs on small synthetic frames.
+"""
+
+import io
+from unittest.mock import patch
+
+import numpy as np
+from PIL import Image
+
+from eq_models.facial import _neutral_result
+from eq_models.tracking import FaceTracker, analyze_face_tracked
+
+_BOX = {"x": 60, "y": 50, "w": 64, "h": 64}
+
+
+def _frame(dx: int = 0, dy: int = 0, seed: int = 0) -> bytes:
+    """A flat gray frame with a textured 'face' patch at _BOX shifted by (dx, dy)."""
+    rng = np.random.default_rng(seed)
+    img = np.full((240, 320, 3), 128, dtype=np.uint8)
+    patch_ = rng.integers(0, 255, size=(64, 64, 1), dtype=np.uint8).repeat(3, axis=2)
+    y, x = _BOX["y"] + dy, _BOX["x"] + dx
+    img[y : y + 64, x : x + 64] = patch_
+    buf = io.BytesIO()
+    Image.fromarray(img).save(buf, "PNG")  # lossless keeps matching deterministic
+    return buf.getvalue()
+
+
+def _patches(area=_BOX):
+    box = None if area is None else (area["x"], area["y"], area["w"], area["h"])
+    probs = np.array([[0.8, 0.0, 0.0, 0.0, 0.0, 0.0, 0.2]])
+    return (
+        patch("eq_models.tracking._detect_face_box", return_value=box),
+        patch("eq_models.tracking._classify_faces", return_value=probs),
+    )
+
+
+class TestFaceTracker:
+    def test_first_frame_runs_detection(self):
+        p_df, p_cls = _patches()
+        with p_df, p_cls:
+            tracker = FaceTracker(redetect_every=10, min_score=0.6, search_margin=0.25)
+            result = tracker.analyze(_frame())
+        assert result.dominant == "angry"
+        assert tracker.detections == 1
+        assert tracker.box == (60, 50, 64, 64)
+
+    def test_small_motion_is_tracked_without_detection(self):
+        p_df, p_cls = _patches()
+        with p_df, p_cls as mock_cls:
+            tracker = FaceTracker(redetect_every=10, min_score=0.6, search_margin=0.25)
+            tracker.analyze(_frame())
+            tracker.analyze(_frame(dx=4, dy=-3))
+            tracker.analyze(_frame(dx=7, dy=-5))
+        assert tracker.detections == 1
+        assert tracker.tracked_frames == 2
+        assert tracker.box == (67, 45, 64, 64)
+        assert mock_cls.call_args[0][0].shape == (1, 48, 48)
+
+    def test_redetects_every_n_frames(self):
+        p_df, p_cls = _patches()
+        with p_df, p_cls:
+            tracker = FaceTracker(redetect_every=2, min_score=0.6, search_margin=0.25)
+            for _ in range(5):
+                tracker.analyze(_frame())
+        # detect, track, track, detect, track
+        assert tracker.detections == 2
+        assert tracker.tracked_frames == 3
+
+    def test_low_match_score_triggers_detection(self):
+        p_df, p_cls = _patches()
+        with p_df, p_cls:
+            tracker = FaceTracker(redetect_every=10, min_score=0.6, search_margin=0.25)
+            tracker.analyze(_frame(seed=0))
+            tracker.analyze(_frame(seed=1))  # different face texture
+        assert tracker.detections == 2
+
+    def test_no_face_resets_track(self):
+        p_df, p_cls = _patches(area=None)
+        with p_df, p_cls as mock_cls:
+            tracker = FaceTracker()
+            result = tracker.analyze(_frame())
+        assert tracker.box is None
+        assert result == _neutral_result()
+        mock_cls.assert_not_called()
+
+    def test_corrupted_frame_returns_neutral(self):
+        tracker = FaceTracker()
+        assert tracker.analyze(b"not-an-image") == _neutral_result()
+        assert tracker.box is None
+
+
+class TestAnalyzeFaceTracked:
+    def test_returns_result_and_updated_tracker(self):
+        p_df, p_cls = _patches()
+        with p_df, p_cls:
+            tracker = FaceTracker()
+            result, updated = analyze_face_tracked(tracker, _frame())
+        assert result.dominant == "angry"
+        assert updated.detections == 1
+
+    def test_tracker_is_picklable(self):
+        import pickle
+
+        p_df, p_cls = _patches()
+        with p_df, p_cls:
+            tracker = FaceTracker()
+            tracker.analyze(_frame())
+        restored = pickle.loads(pickle.dumps(tracker))
+        assert restored.box == tracker.box
+        np.testing.assert_array_equal(restored.template, tracker.template)